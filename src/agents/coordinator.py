@@ -1,21 +1,55 @@
 # src/agents/coordinator.py
 from openai import AsyncOpenAI
 from src.utils.agent_prompt import AgentPrompt
-from src.utils.nl_extractor import ApplicationExtractor
+from src.utils.model_registry import registry
+from src.utils.recommendation_renderer import RecommendationRenderer
+from src.utils.scheduler import SchedulerBusy
+from src.utils.profiler import profiler
+from src.utils.job_queue import decode_result
+from src.utils.result_store import EMAIL_PENDING, idempotency_key
 from src.models.validation_models import LoanApplicationValidator
-from agents import Agent, Runner, trace
+from agents import Agent, Runner, custom_span, trace
 from pydantic import ValidationError
 from typing import Dict, Any
+import asyncio
 import json
 import re
+import time
+import uuid
+
+ORCHESTRATION_MODES = ("agents", "state_machine")
 
 class CoordinatorAgent:
-    def __init__(self, repayment_predictor, recommendation, emailer, model="gpt-4o-mini"):
+    def __init__(self, repayment_predictor, recommendation, emailer, model="gpt-4o-mini", extractor=None,
+                 decision_store=None, audit_log=None, rules_engine=None, decision_cache=None,
+                 extraction_pool=None, scheduler=None, runner=None, shadow=None, orchestration="agents",
+                 single_flight=None, tracing=None, job_queue=None, result_store=None,
+                 input_governor=None, hybrid_extractor=None):
         self.agent_prompt = AgentPrompt()
-        self.extractor = ApplicationExtractor()
+        self.renderer = RecommendationRenderer()
+        self.extractor = extractor or registry.get_extractor()
+        self.decision_store = decision_store
+        self.audit_log = audit_log
+        self.rules_engine = rules_engine
+        self.decision_cache = decision_cache
+        self.extraction_pool = extraction_pool
+        self.scheduler = scheduler
+        self.runner = runner or Runner
+        self.shadow = shadow
+        self.single_flight = single_flight
+        self.tracing = tracing
+        self.job_queue = job_queue
+        self.result_store = result_store
+        self.input_governor = input_governor
+        self.hybrid_extractor = hybrid_extractor
+        self.processing_message = "Thanks! We're assessing your application now. Your decision will appear here shortly."
+        self.busy_message = "We're handling a lot of applications right now. Please send your last message again in a moment - nothing you've shared has been lost."
         self.repayment_predictor = repayment_predictor 
         self.recommendation = recommendation
         self.emailer = emailer
+        if orchestration not in ORCHESTRATION_MODES:
+            raise ValueError(f"Unknown orchestration mode '{orchestration}', expected one of {ORCHESTRATION_MODES}")
+        self.orchestration = orchestration
         self.instructions = """
             You are a Nigerian loan application coordinator officer. Your job is to collect and validate information from users who want to apply for a loan. Note all amounts are in Naira.
 
@@ -35,58 +69,115 @@ class CoordinatorAgent:
             4. After collecting all required information, summarize the complete application and ask the user to confirm before proceeding.
 
             5. If the user wants to modify any information, allow them to do so before final confirmation.
-
+        """
+        if orchestration == "agents":
+            self.instructions += """
             6. After confirmation use the loan_repayment_probability_tool to get the repayment probability score and risk level.
 
             7. Pass this information to the loan_recommendation_tool to get a recommendation.
 
             8. When you have the complete analysis and recommendation, hand off to the Email Manager to send the results to the user's email.
-
+        """
+        else:
+            self.instructions += """
+            Do not assess, approve or reject the application and do not send emails yourself; once the user confirms, the system runs the assessment and emails the decision.
+        """
+        self.instructions += """
             Always be friendly, professional, and helpful throughout the process.
         """
-        self.agent = Agent(
-            name="Loan Application Coordinator",
-            model=model,
-            instructions=self.instructions,
-            tools=[
-                repayment_predictor.agent.as_tool(
-                    tool_name="loan_repayment_probability_tool",
-                    tool_description="Get loan repayment probability score and risk level"
-                ),
-                recommendation.agent.as_tool(
-                    tool_name="loan_recommendation_tool",
-                    tool_description="Get loan recommendation based on application data and repayment probability"
-                )
-            ],
-            handoffs=[emailer.agent]
-        )
+        if orchestration == "agents":
+            self.agent = Agent(
+                name="Loan Application Coordinator",
+                model=model,
+                instructions=self.instructions,
+                tools=[
+                    repayment_predictor.agent.as_tool(
+                        tool_name="loan_repayment_probability_tool",
+                        tool_description="Get loan repayment probability score and risk level"
+                    ),
+                    recommendation.agent.as_tool(
+                        tool_name="loan_recommendation_tool",
+                        tool_description="Get loan recommendation based on application data and repayment probability"
+                    )
+                ],
+                handoffs=[emailer.agent]
+            )
+        else:
+            # The LLM only converses; code drives the stage transitions and calls each
+            # downstream agent exactly once per application.
+            self.agent = Agent(
+                name="Loan Application Coordinator",
+                model=model,
+                instructions=self.instructions
+            )
 
     async def process(self, message, session_state):
         if session_state is None:
             session_state = self.initialize_session_state()
-        
-        if session_state.get("email_stage", False):
-            return await self.handle_email_stage(message, session_state)
-        
-        if session_state.get("processing_stage", False):
-            return await self.handle_processing_stage(message, session_state)
-        
-        if session_state.get("confirmation_stage", False):
-            return await self.handle_confirmation_stage(message, session_state)
-        
-        return await self.handle_collection_stage(message, session_state)
 
-    def initialize_session_state(self):
+        stage = self.current_stage(session_state)
+        # One trace per turn; an unsampled turn runs under a disabled trace so every span is a no-op.
+        sampled = self.tracing.sample() if self.tracing else True
+        started = time.perf_counter()
+        error = None
+        try:
+            with trace(f"Loan Application: {stage}", disabled=not sampled), profiler.turn(stage):
+                if session_state.get("email_stage", False):
+                    return await self.handle_email_stage(message, session_state)
+
+                if session_state.get("processing_stage", False):
+                    return await self.handle_processing_stage(message, session_state)
+
+                if session_state.get("confirmation_stage", False):
+                    return await self.handle_confirmation_stage(message, session_state)
+
+                return await self.handle_collection_stage(message, session_state)
+        except SchedulerBusy:
+            # Stage flags are left as they were, so resending the message retries the same step.
+            error = "SchedulerBusy"
+            return self.busy_message, session_state
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            if self.tracing:
+                self.tracing.record(stage, sampled, (time.perf_counter() - started) * 1000, error)
+
+    def current_stage(self, session_state):
+        for stage in ("email", "processing", "confirmation"):
+            if session_state.get(f"{stage}_stage", False):
+                return stage
+        return "collection"
+
+    async def run_agent(self, stage, agent, agent_input):
+        if self.single_flight and stage == "processing":
+            # Double submits and duplicate tabs share one predictor/recommender call.
+            return await self.single_flight.run(agent, agent_input, lambda: self.schedule_agent(stage, agent, agent_input))
+        return await self.schedule_agent(stage, agent, agent_input)
+
+    async def schedule_agent(self, stage, agent, agent_input):
+        if self.scheduler:
+            async with self.scheduler.slot(stage):
+                return await self.runner.run(agent, agent_input)
+        return await self.runner.run(agent, agent_input)
+
+    def initialize_session_state(self, client_id=None):
         return {
+            # Pass a browser-persisted id so a reloaded page maps to the same idempotency key.
+            "client_id": client_id or uuid.uuid4().hex,
+            "idempotency_key": None,
             "application_data": {},
             "fields_collected": set(),
             "required_fields": {"age", "gender", "marital_status", "location", "amount", "tenure"},
             "confirmation_stage": False,
+            "modifying": False,
             "processing_stage": False,
             "email_stage": False,
-            "extractor": self.extractor,
             "prediction_result": None,
             "recommendation_result": None,
+            "recommendation_explanation": None,
+            "processing_job": None,
+            "field_sources": {},
             "user_email": None
         }
 
@@ -105,7 +196,7 @@ class CoordinatorAgent:
                 summary += f"- {field.replace('_', ' ').title()}\n"
         return summary
 
-    def create_email_body(self, application_data, prediction_result, recommendation_result):
+    def create_email_body(self, application_data, prediction_result, recommendation_result, explanation=None):
         return f"""
         # Loan Application Decision
 
@@ -122,10 +213,10 @@ class CoordinatorAgent:
         - **Loan Tenure**: {application_data.get('tenure', 'N/A')} days
 
         ## Risk Assessment
-        {prediction_result}
+        {self.renderer.render_prediction(prediction_result)}
 
         ## Our Decision
-        {recommendation_result}
+        {self.renderer.render_email(recommendation_result, application_data, explanation)}
 
         If you have any questions about this decision, please don't hesitate to contact us.
 
@@ -139,13 +230,22 @@ class CoordinatorAgent:
         
         if emails:
             session_state["user_email"] = emails[0]
+            key = session_state.get("idempotency_key")
+            if self.result_store and key and not await asyncio.to_thread(self.result_store.claim_email, key, emails[0]):
+                sent = await asyncio.to_thread(self.result_store.get, key)
+                session_state = self.initialize_session_state()
+                if sent["email_status"] == EMAIL_PENDING:
+                    return f"Your loan application summary is already being sent to {sent['email_recipient']}.", session_state
+                return f"Your loan application summary has already been sent to {sent['email_recipient']}.", session_state
+
             email_body = self.create_email_body(
                 session_state["application_data"],
                 session_state.get("prediction_result", "No prediction available"),
-                session_state.get("recommendation_result", "No recommendation available")
+                session_state.get("recommendation_result", "No recommendation available"),
+                session_state.get("recommendation_explanation")
             )
             
-            with trace("Email Processing"):
+            with custom_span("Email Processing"):
                 email_prompt = f"""
                 Please send a loan application decision email with the following details:
                 
@@ -156,7 +256,14 @@ class CoordinatorAgent:
                 
                 Please format this professionally and send it to the recipient.
                 """
-                run_result = await Runner.run(self.emailer.agent, email_prompt)
+                try:
+                    run_result = await self.run_agent("email", self.emailer.agent, email_prompt)
+                except BaseException:
+                    if self.result_store and key:
+                        await asyncio.to_thread(self.result_store.finish_email, key, None)
+                    raise
+                if self.result_store and key:
+                    await asyncio.to_thread(self.result_store.finish_email, key, str(run_result.final_output))
                 response = f"Thank you! Your loan application summary has been sent to {session_state['user_email']}. You will receive our decision within 2-3 business days.\n\nEmail Status: {run_result.final_output}"
 
             session_state = self.initialize_session_state()
@@ -165,17 +272,103 @@ class CoordinatorAgent:
             return "Please provide a valid email address.", session_state
 
     async def handle_processing_stage(self, message, session_state):
+        if session_state.get("processing_job"):
+            return await self.poll_processing(session_state) or (self.processing_message, session_state)
         try:
             validated = LoanApplicationValidator(**session_state["application_data"])
+            session_state["idempotency_key"] = idempotency_key(session_state["client_id"], validated)
+
+            stored = None
+            if self.result_store:
+                # SQLite calls can block for up to the busy timeout; keep them off the event loop.
+                stored = await asyncio.to_thread(self.result_store.get_result, session_state["idempotency_key"])
+            if stored:
+                # Repeated confirm or retry of an application already assessed: no new model calls.
+                self.apply_result(session_state, stored)
+                return await self.complete_processing(session_state)
+
+            outcome = self.rules_engine.evaluate(validated) if self.rules_engine else None
+            if outcome:
+                session_state["prediction_result"] = None
+                session_state["recommendation_result"] = outcome.recommendation
+                session_state["recommendation_explanation"] = outcome.message
+                await self.record_decision(validated, session_state, model=f"prescreen:{outcome.rule_id}")
+                return await self.complete_processing(session_state)
+
+            if self.job_queue:
+                return await self.enqueue_processing(session_state)
+
+            await self.assess(validated, session_state)
+            return await self.complete_processing(session_state)
 
-            with trace("Repayment Prediction"):
-                run_result = await Runner.run(
-                self.repayment_predictor.agent,  # Use the stored agent object
-                self.agent_prompt.userDataPrompt(validated)
-                )
-                session_state["prediction_result"] = run_result.final_output
+        except ValidationError as e:
+            session_state["processing_stage"] = False
+            session_state["confirmation_stage"] = False
+            return f"Validation Error: {str(e)}\n\nPlease provide the correct information.", session_state
 
-            with trace("Loan Recommendation"):
+    async def assess(self, validated, session_state):
+        if self.orchestration == "state_machine" and session_state["prediction_result"] is not None:
+            # A retried processing turn (e.g. after SchedulerBusy) reuses the prediction already paid for.
+            return await self.recommend(validated, session_state, prediction_ms=0.0)
+
+        with custom_span("Repayment Prediction"):
+            prediction_prompt = self.agent_prompt.userDataPrompt(validated)
+            started = time.perf_counter()
+            run_result = await self.run_agent(
+            "processing",
+            self.repayment_predictor.agent,  # Use the stored agent object
+            prediction_prompt
+            )
+            session_state["prediction_result"] = run_result.final_output
+            prediction_ms = (time.perf_counter() - started) * 1000
+
+        if self.shadow:
+            self.shadow.submit(
+                prediction_prompt,
+                str(self.repayment_predictor.agent.model),
+                session_state["prediction_result"],
+                prediction_ms
+            )
+
+        await self.recommend(validated, session_state, prediction_ms)
+
+    async def enqueue_processing(self, session_state):
+        # SQLite calls can block for up to the busy timeout; keep them off the event loop.
+        session_state["processing_job"] = await asyncio.to_thread(
+            self.job_queue.enqueue,
+            {"application_data": session_state["application_data"]},
+            job_id=session_state["idempotency_key"]
+        )
+        return self.processing_message, session_state
+
+    async def poll_processing(self, session_state):
+        """Returns the turn response once the queued job has finished, otherwise None."""
+        job = await asyncio.to_thread(self.job_queue.get, session_state["processing_job"])
+        if job is None or job["status"] == "failed":
+            session_state["processing_job"] = None
+            session_state["processing_stage"] = False
+            session_state["confirmation_stage"] = True
+            return "Sorry, we couldn't complete the assessment of your application. Please confirm again to retry.", session_state
+        if job["status"] != "done":
+            return None
+        self.apply_result(session_state, job["result"])
+        session_state["processing_job"] = None
+        return await self.complete_processing(session_state)
+
+    def apply_result(self, session_state, result):
+        prediction, recommendation, explanation = decode_result(result)
+        session_state["prediction_result"] = prediction
+        session_state["recommendation_result"] = recommendation
+        session_state["recommendation_explanation"] = explanation
+
+    async def recommend(self, validated, session_state, prediction_ms):
+        risk_level = getattr(session_state["prediction_result"], "riskLevel", None)
+        cached = self.decision_cache.lookup(validated, risk_level) if self.decision_cache and risk_level else None
+        if cached:
+            session_state["recommendation_result"] = cached
+            recommendation_ms = 0.0
+        else:
+            with custom_span("Loan Recommendation"):
                 app_data_str = json.dumps(session_state["application_data"])
                 recommendation_input = f"""
                 Loan Application Data: {app_data_str}
@@ -183,56 +376,132 @@ class CoordinatorAgent:
 
                 Please provide your recommendation for this loan application.
                 """
-                run_result = await Runner.run(
+                started = time.perf_counter()
+                run_result = await self.run_agent(
+                "processing",
                 self.recommendation.agent,  # Use the stored agent object
                 recommendation_input
                 )
                 session_state["recommendation_result"] = run_result.final_output
+                recommendation_ms = (time.perf_counter() - started) * 1000
+            if self.decision_cache and risk_level:
+                self.decision_cache.store(validated, risk_level, session_state["recommendation_result"])
+
+        await self.record_decision(
+            validated,
+            session_state,
+            model=str(self.repayment_predictor.agent.model),
+            prediction_ms=prediction_ms,
+            recommendation_ms=recommendation_ms
+        )
 
-            session_state["processing_stage"] = False
-            session_state["email_stage"] = True
+    async def record_decision(self, validated, session_state, model, prediction_ms=0.0, recommendation_ms=0.0):
+        if self.decision_store:
+            try:
+                # File appends under the store's cross-process lock; keep them off the event loop.
+                await asyncio.to_thread(
+                    self.decision_store.record,
+                    validated,
+                    session_state["prediction_result"],
+                    session_state["recommendation_result"],
+                    model=model,
+                    prediction_ms=prediction_ms,
+                    recommendation_ms=recommendation_ms
+                )
+            except OSError as e:
+                print(f'Error recording decision: {str(e)}')
+
+        if self.audit_log:
+            self.audit_log.record(
+                validated,
+                session_state["prediction_result"],
+                session_state["recommendation_result"],
+                model=model,
+                explanation=session_state.get("recommendation_explanation")
+            )
 
-            response = f"""
+    async def complete_processing(self, session_state):
+        session_state["processing_stage"] = False
+        session_state["email_stage"] = True
+        if self.result_store and session_state.get("idempotency_key"):
+            await asyncio.to_thread(
+                self.result_store.put_result,
+                session_state["idempotency_key"],
+                session_state["prediction_result"],
+                session_state["recommendation_result"],
+                session_state.get("recommendation_explanation")
+            )
+
+        response = f"""
             Loan Application Processing Complete
 
             Repayment Analysis:
-            {session_state['prediction_result']}
+            {self.renderer.render_prediction(session_state['prediction_result'])}
 
             Recommendation:
-            {session_state['recommendation_result']}
+            {self.renderer.render_chat(session_state['recommendation_result'], session_state['application_data'], session_state.get('recommendation_explanation'))}
 
             Please provide your email address so we can send you the complete application summary and decision.
             """
-            return response, session_state
-
-        except ValidationError as e:
-            session_state["processing_stage"] = False
-            session_state["confirmation_stage"] = False
-            return f"Validation Error: {str(e)}\n\nPlease provide the correct information.", session_state
+        return response, session_state
 
     async def handle_confirmation_stage(self, message, session_state):
         if any(confirm in message.lower() for confirm in ["confirm", "yes", "correct", "submit", "proceed"]):
             session_state["confirmation_stage"] = False
             session_state["processing_stage"] = True
+            if self.hybrid_extractor:
+                self.hybrid_extractor.record_confirmed(session_state.get("field_sources", {}), session_state["application_data"])
+                session_state["field_sources"] = {}
             return await self.handle_processing_stage("process", session_state)
 
         elif any(modify in message.lower() for modify in ["modify", "change", "edit", "no", "incorrect"]):
             session_state["confirmation_stage"] = False
+            session_state["modifying"] = True
             return "What information would you like to modify?", session_state
 
+    async def extract_fields(self, message, missing_fields, application_data):
+        chunks = self.input_governor.chunks(message) if self.input_governor else [message]
+        remaining = set(missing_fields)
+        extracted_data = {}
+        used = 0
+        for chunk in chunks:
+            if not remaining:
+                break
+            used += 1
+            if self.extraction_pool:
+                found = await self.extraction_pool.extract(chunk, remaining, application_data)
+            else:
+                found = self.extractor.extract_all_fields(chunk, remaining, application_data)
+            extracted_data.update(found)
+            remaining -= found.keys()
+        if self.input_governor:
+            self.input_governor.record_extraction(used, len(chunks))
+        return extracted_data
+
     async def handle_collection_stage(self, message, session_state):
         missing_fields = session_state["required_fields"] - session_state["fields_collected"]
-        extracted_data = session_state["extractor"].extract_all_fields(
-        message,
-        missing_fields,
-        session_state["application_data"]
-        )
+        if session_state.get("modifying"):
+            # After "modify", fields already collected can be corrected too.
+            missing_fields = set(session_state["required_fields"])
+        extracted_data = await self.extract_fields(message, missing_fields, session_state["application_data"])
+        if self.input_governor:
+            message = self.input_governor.forward(message)
+        if self.hybrid_extractor:
+            # Low-confidence and missed fields are resolved now rather than over more conversational turns.
+            extracted_data, sources = await self.hybrid_extractor.refine(
+                message, missing_fields, extracted_data,
+                lambda agent, prompt: self.run_agent("collection", agent, prompt)
+            )
+            field_sources = session_state.setdefault("field_sources", {})
+            for field, source in sources.items():
+                # Keep the first extraction, so a correction before confirming counts against it.
+                field_sources.setdefault(field, source)
 
         for field, (value, confidence) in extracted_data.items():
             session_state["application_data"][field] = value
             session_state["fields_collected"].add(field)
 
-        with trace("Loan Coordinator"):
+        with custom_span("Loan Coordinator"):
             app_summary = self.format_application_data(
             session_state["application_data"],
             session_state["fields_collected"],
@@ -247,11 +516,12 @@ class CoordinatorAgent:
         else:
             enhanced_message = f"{message}\n\n[SYSTEM INFO: Current application state]\n{app_summary}"
 
-        run_result = await Runner.run(self.agent, enhanced_message)
+        run_result = await self.run_agent("collection", self.agent, enhanced_message)
         agent_response = run_result.final_output
 
         if session_state["fields_collected"] == session_state["required_fields"] and not session_state["confirmation_stage"]:
             session_state["confirmation_stage"] = True
+            session_state["modifying"] = False
             confirmation = "\n\n### Complete Application Summary\n\n"
 
             for field, value in session_state["application_data"].items():
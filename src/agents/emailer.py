@@ -1,6 +1,6 @@
 # src/agents/emailer.py
 from agents import Agent, function_tool, OpenAIChatCompletionsModel
-from openai import AsyncOpenAI
+from src.utils.model_registry import registry
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Content
 import os
@@ -25,8 +25,8 @@ def send_html_email(subject: str, html_body: str, recipient_email: str) -> Dict[
 
 class EmailerAgent:
     def __init__(self, google_api_key, groq_api_key, model="gpt-4o-mini"):
-        self.gemini_client = AsyncOpenAI(base_url="https://generativelanguage.googleapis.com/v1beta/openai/", api_key=google_api_key)
-        self.groq_client = AsyncOpenAI(base_url="https://api.groq.com/openai/v1", api_key=groq_api_key)
+        self.gemini_client = registry.get_openai_client(base_url="https://generativelanguage.googleapis.com/v1beta/openai/", api_key=google_api_key)
+        self.groq_client = registry.get_openai_client(base_url="https://api.groq.com/openai/v1", api_key=groq_api_key)
         
         self.subject_instructions = """
         You are an expert at writing compelling email subjects for loan applications.
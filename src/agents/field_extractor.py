@@ -0,0 +1,19 @@
+from agents import Agent, ModelSettings
+from src.models.validation_models import FieldExtractionSchema
+
+class FieldExtractorAgent:
+    def __init__(self, model="gpt-4o-mini", max_output_tokens=80):
+        self.instructions = """
+        You extract loan application details from one message written by a Nigerian loan applicant.
+        Fill in only the fields you are asked for, and only with values the applicant actually stated.
+        Use null for anything that is not stated or that you are unsure of; never guess.
+        Amounts are in Naira. Convert the tenure to days (1 month = 30 days).
+        """
+        self.agent = Agent(
+            name="Application Field Extractor",
+            model=model,
+            instructions=self.instructions,
+            output_type=FieldExtractionSchema,
+            model_settings=ModelSettings(max_tokens=max_output_tokens),
+            tools=[]
+        )
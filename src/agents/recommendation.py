@@ -1,15 +1,26 @@
-from agents import Agent
+from agents import Agent, ModelSettings
+from src.models.validation_models import RecommendationSchema, ReasonCode, MAX_REASON_CODES
 
 class RecommendationAgent:
-    def __init__(self, model="gpt-4o-mini"):
-        self.instructions = """
-        You are a loan recommendation specialist. Based on the loan application data and repayment probability analysis, provide a clear recommendation on whether to approve, reject, 
-        or conditionally approve the loan application. Include specific reasons for your decision. 
+    def __init__(self, model="gpt-4o-mini", max_output_tokens=120):
+        reason_codes = ", ".join(code.value for code in ReasonCode)
+        self.instructions = f"""
+        You are a loan recommendation specialist. Based on the loan application data and repayment probability analysis, decide whether to approve, reject, 
+        or conditionally approve the loan application.
         Note, loan tenures are in days.
+
+        Respond only with the structured decision:
+        - decision: approve, reject or conditional
+        - approvedAmount / approvedTenure: the amount and tenure you would grant, or null when rejecting
+        - reasonCodes: up to {MAX_REASON_CODES} codes from: {reason_codes}
+        Do not write any explanation text.
         """
+        self.max_output_tokens = max_output_tokens
         self.agent = Agent(
             name="Loan Application Recommendation Agent",
             model=model,
             instructions=self.instructions,
+            output_type=RecommendationSchema,
+            model_settings=ModelSettings(max_tokens=max_output_tokens),
             tools=[]
-        )
\ No newline at end of file
+        )
@@ -1,23 +1,188 @@
+import asyncio
+import atexit
 import gradio as gr
 from dotenv import load_dotenv
+from agents import set_default_openai_client, set_trace_processors
 import os
+import hmac
+import inspect
+import uuid
+from contextlib import asynccontextmanager
 from src.agents.coordinator import CoordinatorAgent
 from src.agents.repayment_predictor import RepaymentPredictorAgent
 from src.agents.recommendation import RecommendationAgent
 from src.agents.emailer import EmailerAgent
+from src.agents.field_extractor import FieldExtractorAgent
+from src.utils.model_registry import registry
+from src.utils.decision_store import DecisionStore
+from src.utils.audit_log import AuditLog
+from src.utils.rules_engine import RulesEngine
+from src.utils.decision_cache import DecisionCache
+from src.utils.extraction_pool import ExtractionPool
+from src.utils.scheduler import StageScheduler
+from src.utils.shadow_eval import ShadowEvaluator
+from src.utils.profiler import profiler
+from src.utils.session_manager import SessionManager
+from src.utils.single_flight import SingleFlight
+from src.utils.tracing import JsonlTraceExporter, TraceSampler
+from src.utils.job_queue import JobQueue, ProcessingWorker
+from src.utils.result_store import ResultStore
+from src.utils.input_governor import InputGovernor
+from src.utils.hybrid_extractor import HybridExtractor
 
-def main():
-    load_dotenv(override=True)
+# Internal stats endpoints stay out of the API docs: gradio 5 (as locked) takes show_api=False,
+# gradio 6 replaced it with api_visibility.
+HIDDEN_API = (
+    {"api_visibility": "undocumented"} if "api_visibility" in inspect.signature(gr.api).parameters
+    else {"show_api": False}
+)
 
+def build_coordinator():
+    """Builds the CoordinatorAgent and its collaborators from environment variables."""
     openai_api_key = os.getenv('OPENAI_API_KEY')
     fine_tune_openai = os.getenv('FINE_TUNED_MODEL')
     google_api_key = os.getenv('GOOGLE_API_KEY')
     groq_api_key = os.getenv('GROQ_API_KEY')
+    decision_store_dir = os.getenv('DECISION_STORE_DIR')
+    audit_log_dir = os.getenv('AUDIT_LOG_DIR')
+    # Off unless configured; src/utils/prescreen_rules.json holds example rules, all disabled.
+    prescreen_rules_file = os.getenv('PRESCREEN_RULES_FILE')
+    decision_cache_size = int(os.getenv('DECISION_CACHE_SIZE', '0'))
+    decision_cache_max_distance = float(os.getenv('DECISION_CACHE_MAX_DISTANCE', '0.25'))
+    decision_cache_decisions = os.getenv('DECISION_CACHE_DECISIONS', 'approve,reject').split(',')
+    extraction_workers = int(os.getenv('EXTRACTION_WORKERS', '2'))
+    extraction_queue_limit = int(os.getenv('EXTRACTION_QUEUE_LIMIT', '32'))
+    extraction_use_processes = os.getenv('EXTRACTION_USE_PROCESSES', 'false').lower() == 'true'
+    scheduler_max_concurrency = int(os.getenv('SCHEDULER_MAX_CONCURRENCY', '0'))
+    scheduler_stage_limits = {
+        stage: int(limit)
+        for stage, limit in (
+            item.split('=') for item in os.getenv('SCHEDULER_STAGE_LIMITS', '').split(',') if item
+        )
+    }
+    scheduler_max_queue_wait = float(os.getenv('SCHEDULER_MAX_QUEUE_WAIT', '10'))
+    recommendation_max_tokens = int(os.getenv('RECOMMENDATION_MAX_TOKENS', '120'))
+    shadow_models = [model for model in os.getenv('SHADOW_MODELS', '').split(',') if model]
+    shadow_sample_rate = float(os.getenv('SHADOW_SAMPLE_RATE', '0.1'))
+    shadow_log_file = os.getenv('SHADOW_LOG_FILE', 'shadow_eval.jsonl')
+    orchestration = os.getenv('ORCHESTRATION', 'state_machine')
+    single_flight = os.getenv('SINGLE_FLIGHT', 'true').lower() == 'true'
+    trace_dir = os.getenv('TRACE_DIR')
+    trace_sample_rate = float(os.getenv('TRACE_SAMPLE_RATE', '0.1'))
+    trace_slow_ms = float(os.getenv('TRACE_SLOW_MS', '10000'))
+    job_queue_path = os.getenv('JOB_QUEUE_PATH')
+    result_store_path = os.getenv('RESULT_STORE_PATH')
+    input_max_chars = int(os.getenv('INPUT_MAX_CHARS', '4000'))
+    input_chunk_chars = int(os.getenv('INPUT_CHUNK_CHARS', '1000'))
+    input_forward_chars = int(os.getenv('INPUT_FORWARD_CHARS', '1000'))
+    hybrid_extraction_threshold = os.getenv('HYBRID_EXTRACTION_THRESHOLD')
+    hybrid_extraction_model = os.getenv('HYBRID_EXTRACTION_MODEL', 'gpt-4o-mini')
+    http_max_connections = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+    http_max_keepalive = int(os.getenv('HTTP_MAX_KEEPALIVE', '20'))
+    http_keepalive_expiry = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+    http2 = os.getenv('HTTP2', 'true').lower() == 'true'
+    # e.g. RATE_LIMITS="openai=500:200000,gemini=15:1000000" (requests:tokens per minute)
+    rate_limits = {
+        provider: tuple(float(limit) for limit in limits.split(':'))
+        for provider, limits in (
+            item.split('=') for item in os.getenv('RATE_LIMITS', '').split(',') if item
+        )
+    }
+
+    registry.configure_http_clients(
+        max_connections=http_max_connections,
+        max_keepalive_connections=http_max_keepalive,
+        keepalive_expiry=http_keepalive_expiry,
+        http2=http2,
+        rate_limits=rate_limits
+    )
+    # Coordinator, predictor and recommender use the SDK default client; share the pooled one.
+    set_default_openai_client(registry.get_openai_client(api_key=openai_api_key))
+    registry.preload()
+
+    trace_exporter = None
+    if trace_dir:
+        # Replaces the SDK's uploader: traces stay on local disk.
+        trace_exporter = JsonlTraceExporter(trace_dir)
+        set_trace_processors([trace_exporter])
 
     repayment_predictor = RepaymentPredictorAgent(fine_tune_openai)
-    recommendation = RecommendationAgent()
+    recommendation = RecommendationAgent(max_output_tokens=recommendation_max_tokens)
     emailer = EmailerAgent(google_api_key, groq_api_key)
-    coordinator = CoordinatorAgent(repayment_predictor, recommendation, emailer)
+    decision_store = DecisionStore(decision_store_dir) if decision_store_dir else None
+    audit_log = AuditLog(audit_log_dir) if audit_log_dir else None
+    if audit_log:
+        # Flush and fsync whatever the writer thread still has queued on shutdown.
+        atexit.register(audit_log.close)
+    coordinator = CoordinatorAgent(
+        repayment_predictor, recommendation, emailer,
+        orchestration=orchestration,
+        single_flight=SingleFlight() if single_flight else None,
+        tracing=TraceSampler(trace_sample_rate, trace_slow_ms, trace_exporter) if trace_dir else None,
+        job_queue=JobQueue(job_queue_path) if job_queue_path else None,
+        result_store=ResultStore(result_store_path) if result_store_path else None,
+        input_governor=InputGovernor(
+            max_chars=input_max_chars,
+            chunk_chars=input_chunk_chars,
+            forward_chars=input_forward_chars
+        ) if input_max_chars > 0 else None,
+        hybrid_extractor=HybridExtractor(
+            registry.get_extractor(),
+            FieldExtractorAgent(hybrid_extraction_model).agent,
+            threshold=float(hybrid_extraction_threshold)
+        ) if hybrid_extraction_threshold else None,
+        decision_store=decision_store,
+        audit_log=audit_log,
+        rules_engine=RulesEngine(prescreen_rules_file) if prescreen_rules_file else None,
+        decision_cache=DecisionCache(
+            capacity=decision_cache_size,
+            max_distance=decision_cache_max_distance,
+            reusable_decisions=decision_cache_decisions
+        ) if decision_cache_size > 0 else None,
+        extraction_pool=ExtractionPool(
+            max_workers=extraction_workers,
+            max_queue=extraction_queue_limit,
+            use_processes=extraction_use_processes
+        ) if extraction_workers > 0 else None,
+        scheduler=StageScheduler(
+            max_concurrency=scheduler_max_concurrency,
+            stage_limits=scheduler_stage_limits,
+            max_queue_wait=scheduler_max_queue_wait
+        ) if scheduler_max_concurrency > 0 else None,
+        shadow=ShadowEvaluator(
+            shadow_models,
+            shadow_log_file,
+            sample_rate=shadow_sample_rate
+        ) if shadow_models else None
+    )
+    return coordinator
+
+
+def main():
+    load_dotenv(override=True)
+
+    profile_turns = int(os.getenv('PROFILE_TURNS', '0'))
+    profile_dir = os.getenv('PROFILE_DIR', 'profiles')
+    profile_admin_token = os.getenv('PROFILE_ADMIN_TOKEN')
+    http_warm_connections = int(os.getenv('HTTP_WARM_CONNECTIONS', '2'))
+    session_idle_ttl = float(os.getenv('SESSION_IDLE_TTL', '1800'))
+    session_max_history = int(os.getenv('SESSION_MAX_HISTORY', '50'))
+    session_memory_limit_mb = float(os.getenv('SESSION_MEMORY_LIMIT_MB', '256'))
+    job_poll_interval = float(os.getenv('JOB_POLL_INTERVAL', '1'))
+    job_local_workers = int(os.getenv('JOB_LOCAL_WORKERS', '0'))
+    job_retention = float(os.getenv('JOB_RETENTION', '86400'))
+
+    coordinator = build_coordinator()
+    profiler.output_dir = profile_dir
+    if profile_turns > 0:
+        profiler.arm(profile_turns)
+
+    sessions = SessionManager(
+        coordinator.initialize_session_state,
+        idle_ttl=session_idle_ttl,
+        max_history=session_max_history,
+        max_bytes=int(session_memory_limit_mb * 1024 * 1024)
+    )
 
     def update_status(session_state):
         if session_state is None:
@@ -35,19 +200,88 @@ def main():
                 session_state["required_fields"]
             )
 
-    async def chat(message, history, session_state):
+    async def chat(message, history, session_id, client_id):
+        session_id, session_state, lost = sessions.checkout(session_id)
+        if client_id:
+            session_state["client_id"] = client_id
         response, new_session_state = await coordinator.process(message, session_state)
-        history = history or []
-        history.append((message, response))
+        if lost:
+            response = f"Your previous application expired after a period of inactivity, so we've started a new one.\n\n{response}"
+        sessions.save(session_id, new_session_state)
+        if coordinator.input_governor:
+            # Keep the retained history bounded too, not just what reaches the models.
+            message = coordinator.input_governor.forward(message)
+        history = sessions.trim_history((history or []) + [(message, response)])
         status = update_status(new_session_state)
-        return "", history, new_session_state, status
+        return "", history, session_id, status
+
+    def ensure_client_id(client_id):
+        return client_id or uuid.uuid4().hex
+
+    async def poll_processing(history, session_id):
+        session_state = sessions.peek(session_id)
+        if not session_state or not session_state.get("processing_job"):
+            return gr.skip(), gr.skip()
+        polled = await coordinator.poll_processing(session_state)
+        if polled is None:
+            return gr.skip(), gr.skip()
+        response, new_session_state = polled
+        sessions.save(session_id, new_session_state)
+        history = sessions.trim_history((history or []) + [(None, response)])
+        return history, update_status(new_session_state)
+
+    local_worker = ProcessingWorker(
+        coordinator, coordinator.job_queue, concurrency=job_local_workers, retention=job_retention
+    ) if coordinator.job_queue and job_local_workers > 0 else None
 
-    def reset_app():
-        new_state = coordinator.initialize_session_state()
-        return "", new_state, update_status(new_state)
+    @asynccontextmanager
+    async def lifespan(app):
+        # Started with the server, on its event loop so it shares the pooled connections,
+        # and not tied to any visitor's session.
+        worker_task = asyncio.create_task(local_worker.run_forever()) if local_worker else None
+        try:
+            yield
+        finally:
+            if worker_task:
+                local_worker.stop()
+                worker_task.cancel()
+
+    def arm_profiler(turns: int, token: str):
+        if not profile_admin_token or not hmac.compare_digest(str(token), profile_admin_token):
+            return "Unauthorized"
+        profiler.arm(int(turns))
+        return f"Profiling the next {int(turns)} turns into {profiler.output_dir}. Last profiles: {profiler.last_files}"
+
+    def reset_app(session_id):
+        sessions.discard(session_id)
+        return "", None, update_status(None)
+
+    def session_stats():
+        return sessions.stats()
+
+    def http_pool_stats():
+        return registry.clients.pool_stats()
+
+    def single_flight_stats():
+        return coordinator.single_flight.stats() if coordinator.single_flight else {}
+
+    def prescreen_stats():
+        return coordinator.rules_engine.stats() if coordinator.rules_engine else {}
+
+    def extraction_stats():
+        return coordinator.hybrid_extractor.stats() if coordinator.hybrid_extractor else {}
+
+    def extraction_pool_stats():
+        return coordinator.extraction_pool.stats() if coordinator.extraction_pool else {}
+
+    async def warm_up_connections():
+        await registry.clients.warm_up(http_warm_connections)
 
     with gr.Blocks() as demo:
-        session_state = gr.State(coordinator.initialize_session_state())
+        # Only the session id lives in Gradio state; SessionManager owns the session data.
+        session_state = gr.State(None, time_to_live=session_idle_ttl, delete_callback=sessions.discard)
+        # Survives page reloads (browser localStorage), unlike the session; idempotency keys are derived from it.
+        client_id = gr.BrowserState(None, storage_key="loan_officer_client_id")
         gr.Markdown("# Loan Agentic Officer (trained on Nigeria Data)")
 
         with gr.Row():
@@ -68,13 +302,35 @@ def main():
             clear_btn = gr.Button("Start New Application")
 
         # Button and enter key trigger chat + update status
-        submit_btn.click(chat, [msg, chatbot, session_state], [msg, chatbot, session_state, app_status])
-        msg.submit(chat, [msg, chatbot, session_state], [msg, chatbot, session_state, app_status])
+        submit_btn.click(chat, [msg, chatbot, session_state, client_id], [msg, chatbot, session_state, app_status])
+        msg.submit(chat, [msg, chatbot, session_state, client_id], [msg, chatbot, session_state, app_status])
 
         # Clear/reset everything
-        clear_btn.click(reset_app, None, [chatbot, session_state, app_status], queue=False)
+        clear_btn.click(reset_app, [session_state], [chatbot, session_state, app_status], queue=False)
+
+        gr.api(session_stats, api_name="session_stats", queue=False, **HIDDEN_API)
+        gr.api(http_pool_stats, api_name="http_pool_stats", queue=False, **HIDDEN_API)
+        gr.api(single_flight_stats, api_name="single_flight_stats", queue=False, **HIDDEN_API)
+        gr.api(extraction_stats, api_name="extraction_stats", queue=False, **HIDDEN_API)
+        gr.api(extraction_pool_stats, api_name="extraction_pool_stats", queue=False, **HIDDEN_API)
+        gr.api(prescreen_stats, api_name="prescreen_stats", queue=False, **HIDDEN_API)
+
+        demo.load(ensure_client_id, [client_id], [client_id], queue=False)
+
+        # Runs on Gradio's event loop, which the pooled connections are bound to; only the first load warms up.
+        if http_warm_connections > 0:
+            demo.load(warm_up_connections, None, None, queue=False)
+
+        if coordinator.job_queue:
+            # Processing runs on a worker; pick up finished jobs without waiting for the next message.
+            poll_timer = gr.Timer(job_poll_interval)
+            poll_timer.tick(poll_processing, [chatbot, session_state], [chatbot, app_status], queue=False)
+            gr.api(coordinator.job_queue.stats, api_name="job_queue_stats", queue=False, **HIDDEN_API)
+
+        if profile_admin_token:
+            gr.api(arm_profiler, api_name="profile", queue=False, **HIDDEN_API)
 
-        demo.launch()
+        demo.launch(app_kwargs={"lifespan": lifespan})
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,251 @@
+import re
+import numpy as np
+import annotated_types
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Type
+from src.models.validation_models import LoanApplicationValidator, MAX_LOAN_AMOUNT, MAX_LOAN_AMOUNT_MESSAGE
+
+
+class BulkRule(NamedTuple):
+    field: str
+    type: str
+    msg: str
+
+
+# Vectorized equivalents of the model's @field_validator methods, keyed by
+# validator name. A validator missing here makes BulkLoanValidator refuse to
+# build, so the columnar path cannot silently drift from the pydantic model.
+VECTORIZED_FIELD_VALIDATORS: Dict[str, Tuple[str, str, Callable[[np.ndarray], np.ndarray]]] = {
+    "check_max_amount": ("value_error", f"Value error, {MAX_LOAN_AMOUNT_MESSAGE}", lambda v: v <= MAX_LOAN_AMOUNT),
+}
+
+_BOUND_CHECKS = {
+    annotated_types.Gt: ("gt", "greater_than", "Input should be greater than {}", np.greater),
+    annotated_types.Ge: ("ge", "greater_than_equal", "Input should be greater than or equal to {}", np.greater_equal),
+    annotated_types.Lt: ("lt", "less_than", "Input should be less than {}", np.less),
+    annotated_types.Le: ("le", "less_than_equal", "Input should be less than or equal to {}", np.less_equal),
+}
+
+
+# pydantic's lax mode accepts numeric strings: integers may carry "_" separators
+# and a zero fraction, floats anything Python's float() reads from ASCII text.
+_INT_STRING = re.compile(r"[+-]?\d+(?:_\d+)*(?:\.0+)?")
+
+
+def _parse_int(text: str) -> Optional[float]:
+    if not text.isascii() or not _INT_STRING.fullmatch(text):
+        return None
+    return float(int(text.split(".")[0].replace("_", "")))
+
+
+def _parse_float(text: str) -> Optional[float]:
+    if not text.isascii():
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _format_bound(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class BulkValidationResult:
+    def __init__(self, valid: np.ndarray, codes: np.ndarray, rules: List[BulkRule]):
+        self.valid = valid
+        self.codes = codes
+        self.rules = rules
+
+    def __len__(self):
+        return len(self.valid)
+
+    def errors(self, row: int) -> List[Dict[str, Any]]:
+        code = int(self.codes[row])
+        return [
+            {"loc": (rule.field,), "type": rule.type, "msg": rule.msg}
+            for bit, rule in enumerate(self.rules)
+            if code & (1 << bit)
+        ]
+
+    def error_counts(self) -> Dict[Tuple[str, str], int]:
+        counts = {}
+        for bit, rule in enumerate(self.rules):
+            hits = int(np.count_nonzero(self.codes & (1 << bit)))
+            if hits:
+                counts[(rule.field, rule.type)] = hits
+        return counts
+
+
+class BulkLoanValidator:
+    """Columnar counterpart of a pydantic model for validating many rows at once.
+
+    Rules are read from the model's field constraints when the validator is
+    built, so changing a bound on LoanApplicationValidator changes both paths.
+    Each row gets a bitmask of failed rules; ``errors(row)`` decodes it into the
+    same loc/type/msg triples that pydantic would report.
+    """
+
+    def __init__(self, model: Type[BaseModel] = LoanApplicationValidator):
+        self.model = model
+        self.rules: List[BulkRule] = []
+        self._plans: Dict[str, List[Tuple[str, Any, int]]] = {}
+        validators = model.__pydantic_decorators__.field_validators
+        field_validators: Dict[str, List[str]] = {}
+        for name, decorator in validators.items():
+            if name not in VECTORIZED_FIELD_VALIDATORS:
+                raise TypeError(f"No vectorized equivalent for field validator '{name}'")
+            for field in decorator.info.fields:
+                field_validators.setdefault(field, []).append(name)
+
+        for field, info in model.model_fields.items():
+            plan = []
+            plan.append(("missing", None, self._add_rule(field, "missing", "Field required")))
+            if info.annotation is int:
+                plan.append(("type", None, self._add_rule(field, "int_type", "Input should be a valid integer")))
+                plan.append(("parsing", _parse_int, self._add_rule(
+                    field, "int_parsing", "Input should be a valid integer, unable to parse string as an integer")))
+                plan.append(("finite", None, self._add_rule(field, "finite_number", "Input should be a finite number")))
+                plan.append(("integral", None, self._add_rule(
+                    field, "int_from_float", "Input should be a valid integer, got a number with a fractional part")))
+            elif info.annotation is float:
+                plan.append(("type", None, self._add_rule(field, "float_type", "Input should be a valid number")))
+                plan.append(("parsing", _parse_float, self._add_rule(
+                    field, "float_parsing", "Input should be a valid number, unable to parse string as a number")))
+            elif info.annotation is str:
+                plan.append(("type", None, self._add_rule(field, "string_type", "Input should be a valid string")))
+            else:
+                raise TypeError(f"Unsupported field type for '{field}': {info.annotation}")
+
+            for constraint in info.metadata:
+                check = _BOUND_CHECKS.get(type(constraint))
+                if check:
+                    attr, error_type, template, op = check
+                    bound = getattr(constraint, attr)
+                    bit = self._add_rule(field, error_type, template.format(_format_bound(bound)))
+                    plan.append(("bound", (op, bound), bit))
+                elif isinstance(constraint, annotated_types.MinLen):
+                    bit = self._add_rule(field, "string_too_short", f"String should have at least {constraint.min_length} character{'s' if constraint.min_length != 1 else ''}")
+                    plan.append(("min_length", constraint.min_length, bit))
+                elif isinstance(constraint, annotated_types.MaxLen):
+                    bit = self._add_rule(field, "string_too_long", f"String should have at most {constraint.max_length} character{'s' if constraint.max_length != 1 else ''}")
+                    plan.append(("max_length", constraint.max_length, bit))
+                elif getattr(constraint, "pattern", None):
+                    bit = self._add_rule(field, "string_pattern_mismatch", f"String should match pattern '{constraint.pattern}'")
+                    plan.append(("pattern", re.compile(constraint.pattern), bit))
+                else:
+                    raise TypeError(f"Unsupported constraint on '{field}': {constraint!r}")
+
+            for name in field_validators.get(field, []):
+                error_type, message, check = VECTORIZED_FIELD_VALIDATORS[name]
+                plan.append(("validator", check, self._add_rule(field, error_type, message)))
+            self._plans[field] = plan
+
+        if len(self.rules) > 64:
+            raise ValueError("Too many rules for a 64-bit error mask")
+
+    def _add_rule(self, field: str, error_type: str, message: str) -> int:
+        self.rules.append(BulkRule(field, error_type, message))
+        return len(self.rules) - 1
+
+    def validate(self, columns: Mapping[str, Sequence[Any]], length: Optional[int] = None) -> BulkValidationResult:
+        if length is None:
+            length = len(next(iter(columns.values()))) if columns else 0
+        codes = np.zeros(length, dtype=np.uint64)
+        for field, plan in self._plans.items():
+            column = columns.get(field)
+            if column is None:
+                codes |= np.uint64(1 << plan[0][2])
+                continue
+            column = np.asarray(column)
+            if len(column) != length:
+                raise ValueError(f"Column '{field}' has {len(column)} rows, expected {length}")
+            if self.model.model_fields[field].annotation is str:
+                self._validate_strings(column, plan[1:], codes)
+            else:
+                self._validate_numbers(column, plan[1:], codes)
+        return BulkValidationResult(codes == 0, codes, self.rules)
+
+    def _validate_numbers(self, column: np.ndarray, plan, codes: np.ndarray):
+        unparsed = np.zeros(len(column), dtype=bool)
+        if column.dtype.kind in "iufb":
+            values = column.astype(np.float64, copy=False)
+            ok = np.ones(len(column), dtype=bool)
+        else:
+            parse = next(arg for step, arg, _ in plan if step == "parsing")
+            values = np.full(len(column), np.nan)
+            ok = np.zeros(len(column), dtype=bool)
+            parsed: Dict[str, Optional[float]] = {}
+            for i, item in enumerate(column):
+                if isinstance(item, (bytes, np.bytes_)):
+                    item = item.decode("utf-8", errors="replace")
+                if isinstance(item, str):
+                    # Lax mode: numeric strings (CSV, historical rows) are coerced, once per distinct value.
+                    if item not in parsed:
+                        parsed[item] = parse(item.strip())
+                    value = parsed[item]
+                    if value is None:
+                        unparsed[i] = True
+                        continue
+                    item = value
+                if isinstance(item, (bool, np.bool_, int, float, np.integer, np.floating)):
+                    values[i] = item
+                    ok[i] = True
+        for step, arg, bit in plan:
+            flag = np.uint64(1 << bit)
+            if step == "type":
+                failed = ~ok & ~unparsed
+            elif step == "parsing":
+                failed = unparsed
+            elif step == "finite":
+                failed = ok & ~np.isfinite(values)
+                ok &= ~failed
+            elif step == "integral":
+                failed = ok & (np.floor(values) != values)
+                ok &= ~failed
+            elif step == "bound":
+                op, bound = arg
+                with np.errstate(invalid="ignore"):
+                    failed = ok & ~op(values, bound)
+            elif step == "validator":
+                # Field validators only run once the field's constraints passed.
+                constrained = (codes & self._field_mask(plan)) == 0
+                with np.errstate(invalid="ignore"):
+                    failed = ok & constrained & ~arg(values)
+            else:
+                continue
+            codes[failed] |= flag
+
+    def _validate_strings(self, column: np.ndarray, plan, codes: np.ndarray):
+        if column.dtype.kind == "U":
+            ok = np.ones(len(column), dtype=bool)
+            strings = column
+        else:
+            ok = np.array([isinstance(item, str) for item in column], dtype=bool)
+            strings = np.where(ok, column, "").astype(str)
+        lengths = None
+        for step, arg, bit in plan:
+            flag = np.uint64(1 << bit)
+            if step == "type":
+                failed = ~ok
+            elif step in ("min_length", "max_length"):
+                if lengths is None:
+                    lengths = np.char.str_len(strings)
+                failed = ok & ((lengths < arg) if step == "min_length" else (lengths > arg))
+            elif step == "pattern":
+                # Regexes run once per distinct value, not once per row.
+                uniques, inverse = np.unique(strings, return_inverse=True)
+                matched = np.array([arg.search(value) is not None for value in uniques], dtype=bool)
+                failed = ok & ~matched[inverse.reshape(-1)]
+            else:
+                continue
+            codes[failed] |= flag
+
+    def _field_mask(self, plan) -> np.uint64:
+        mask = 0
+        for step, _, bit in plan:
+            if step != "validator":
+                mask |= 1 << bit
+        return np.uint64(mask)
@@ -1,5 +1,9 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Dict, Any
+from typing import Dict, Any, List, Literal, Optional
+from enum import Enum
+
+MAX_LOAN_AMOUNT = 1000000
+MAX_LOAN_AMOUNT_MESSAGE = f"Loan amount cannot exceed {MAX_LOAN_AMOUNT:,}"
 
 class LoanApplicationValidator(BaseModel):
     age: int = Field(..., description="Age of the applicant", gt=18, lt=100)
@@ -11,12 +15,54 @@ class LoanApplicationValidator(BaseModel):
 
     @field_validator('amount')
     def check_max_amount(cls, v):
-        if v > 1000000:
-            raise ValueError('Loan amount cannot exceed 1,000,000')
+        if v > MAX_LOAN_AMOUNT:
+            raise ValueError(MAX_LOAN_AMOUNT_MESSAGE)
         return v
     
 
 
+class FieldExtractionSchema(BaseModel):
+    age: Optional[int] = Field(None, description="Age of the applicant in years")
+    gender: Optional[Literal["male", "female", "other"]] = None
+    maritalStatus: Optional[Literal["single", "married", "divorced", "widowed"]] = None
+    location: Optional[str] = Field(None, description="Nigerian state where the applicant lives")
+    amount: Optional[float] = Field(None, description="Loan amount in Naira")
+    tenure: Optional[int] = Field(None, description="Loan tenure in days")
+
+
 class RepaymentPredictorSchema(BaseModel):
     repaymentProbabilityScore: int
     riskLevel: str
+
+
+class LoanDecision(str, Enum):
+    APPROVE = "approve"
+    REJECT = "reject"
+    CONDITIONAL = "conditional"
+
+
+class ReasonCode(str, Enum):
+    HIGH_REPAYMENT_PROBABILITY = "high_repayment_probability"
+    MODERATE_REPAYMENT_PROBABILITY = "moderate_repayment_probability"
+    LOW_REPAYMENT_PROBABILITY = "low_repayment_probability"
+    AMOUNT_TOO_HIGH = "amount_too_high"
+    TENURE_TOO_LONG = "tenure_too_long"
+    TENURE_TOO_SHORT = "tenure_too_short"
+    AGE_RISK = "age_risk"
+    STABLE_PROFILE = "stable_profile"
+    REDUCED_AMOUNT = "reduced_amount"
+    REDUCED_TENURE = "reduced_tenure"
+
+
+MAX_REASON_CODES = 4
+
+
+class RecommendationSchema(BaseModel):
+    decision: LoanDecision
+    approvedAmount: Optional[float] = None
+    approvedTenure: Optional[int] = None
+    reasonCodes: List[ReasonCode] = Field(default_factory=list)
+
+    @field_validator('reasonCodes')
+    def limit_reason_codes(cls, v):
+        return v[:MAX_REASON_CODES]
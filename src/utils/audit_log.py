@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+GENESIS_HASH = "0" * 64
+FILE_PATTERN = "audit-{:06d}.jsonl"
+
+
+def _canonical(data: Dict[str, Any]) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _to_jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return value
+
+
+def _audit_files(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, "audit-*.jsonl")))
+
+
+class AuditLog:
+    """Append-only, hash-chained audit trail written by a background thread.
+
+    ``record`` only enqueues; the writer drains the queue in batches, writes one
+    JSON line per record and fsyncs at most every ``fsync_interval`` seconds.
+    Every line carries the previous line's hash and a CRC32 of its own content,
+    and files roll over once they reach ``max_bytes``. If the queue is full or
+    the writer thread has died, the record is dropped and counted in
+    ``dropped`` rather than blocking the caller's event loop.
+    """
+
+    def __init__(self, directory: str, fsync_interval: float = 1.0, max_batch: int = 256,
+                 max_bytes: int = 64 * 1024 * 1024, max_queue: int = 10000):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.max_batch = max_batch
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._seq, self._prev_hash, self._file_index = self._resume()
+        self._file = open(os.path.join(directory, FILE_PATTERN.format(self._file_index)), "a", encoding="utf-8")
+        self._closed = False
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, application, prediction, recommendation, **extra):
+        payload = {
+            "application": _to_jsonable(application),
+            "prediction": _to_jsonable(prediction),
+            "recommendation": _to_jsonable(recommendation),
+        }
+        payload.update({key: _to_jsonable(value) for key, value in extra.items()})
+        if not self._thread.is_alive():
+            self._drop("writer thread is not running")
+            return
+        try:
+            self._queue.put_nowait({"ts": time.time(), "payload": payload})
+        except queue.Full:
+            self._drop("queue is full")
+
+    def _drop(self, reason: str):
+        self.dropped += 1
+        if self.dropped == 1 or self.dropped % 1000 == 0:
+            print(f"Error writing audit log: {reason}, {self.dropped} records dropped")
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _resume(self) -> Tuple[int, str, int]:
+        files = _audit_files(self.directory)
+        if not files:
+            return 0, GENESIS_HASH, 1
+        last_file = files[-1]
+        index = int(os.path.basename(last_file)[len("audit-"):-len(".jsonl")])
+        self._truncate_torn_tail(last_file)
+        seq, prev_hash = 0, GENESIS_HASH
+        for path in reversed(files):
+            last_line = None
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        last_line = line
+            if last_line:
+                entry = json.loads(last_line)
+                seq, prev_hash = entry["seq"], entry["hash"]
+                break
+        return seq, prev_hash, index
+
+    @staticmethod
+    def _truncate_torn_tail(path: str):
+        """Cuts a partial last line left by a crash between fsyncs, so the chain resumes from the last complete record."""
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = 0
+            for line in data.splitlines(keepends=True):
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    if line.strip():
+                        json.loads(line)
+                except ValueError:
+                    break
+                end += len(line)
+            if end < len(data):
+                print(f"Error reading audit log: dropping {len(data) - end} bytes of incomplete record at the end of {path}")
+                f.truncate(end)
+
+    def _run(self):
+        last_fsync = time.monotonic()
+        stopping = False
+        while not stopping:
+            timeout = max(0.0, self.fsync_interval - (time.monotonic() - last_fsync))
+            batch = []
+            try:
+                item = self._queue.get(timeout=timeout)
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+                while len(batch) < self.max_batch and not stopping:
+                    item = self._queue.get_nowait()
+                    if item is None:
+                        stopping = True
+                    else:
+                        batch.append(item)
+            except queue.Empty:
+                pass
+            if batch:
+                self._write_batch(batch)
+            if stopping or time.monotonic() - last_fsync >= self.fsync_interval:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                last_fsync = time.monotonic()
+        self._file.close()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        lines = []
+        for item in batch:
+            self._seq += 1
+            entry = {"seq": self._seq, "ts": item["ts"], "prev": self._prev_hash, "payload": item["payload"]}
+            entry["hash"] = hashlib.sha256(_canonical(entry).encode("utf-8")).hexdigest()
+            entry["crc"] = zlib.crc32(_canonical(entry).encode("utf-8"))
+            self._prev_hash = entry["hash"]
+            lines.append(_canonical(entry) + "\n")
+        data = "".join(lines)
+        if self._file.tell() > 0 and self._file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    def _rotate(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file_index += 1
+        self._file = open(os.path.join(self.directory, FILE_PATTERN.format(self._file_index)), "a", encoding="utf-8")
+
+
+def read_audit_log(directory: str) -> Iterator[Dict[str, Any]]:
+    for path in _audit_files(directory):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def verify_audit_log(directory: str) -> Tuple[bool, int, Optional[str]]:
+    prev_hash = GENESIS_HASH
+    expected_seq = None
+    count = 0
+    for entry in read_audit_log(directory):
+        crc = entry.pop("crc", None)
+        if crc != zlib.crc32(_canonical(entry).encode("utf-8")):
+            return False, count, f"checksum mismatch at seq {entry.get('seq')}"
+        digest = entry.pop("hash")
+        if entry["prev"] != prev_hash:
+            return False, count, f"broken chain at seq {entry['seq']}"
+        if digest != hashlib.sha256(_canonical(entry).encode("utf-8")).hexdigest():
+            return False, count, f"hash mismatch at seq {entry['seq']}"
+        if expected_seq is not None and entry["seq"] != expected_seq:
+            return False, count, f"sequence gap before seq {entry['seq']}"
+        expected_seq = entry["seq"] + 1
+        prev_hash = digest
+        count += 1
+    return True, count, None
+
+
+async def replay(directory: str, predictor, limit: Optional[int] = None) -> Dict[str, Any]:
+    from agents import Runner
+    from src.models.validation_models import LoanApplicationValidator
+    from src.utils.agent_prompt import AgentPrompt
+
+    agent_prompt = AgentPrompt()
+    comparisons = []
+    for entry in read_audit_log(directory):
+        if limit is not None and len(comparisons) >= limit:
+            break
+        archived = entry["payload"].get("prediction") or {}
+        validated = LoanApplicationValidator(**entry["payload"]["application"])
+        run_result = await Runner.run(predictor.agent, agent_prompt.userDataPrompt(validated))
+        replayed = _to_jsonable(run_result.final_output)
+        comparisons.append({
+            "seq": entry["seq"],
+            "archived_score": archived.get("repaymentProbabilityScore"),
+            "replayed_score": replayed.get("repaymentProbabilityScore"),
+            "archived_risk": archived.get("riskLevel"),
+            "replayed_risk": replayed.get("riskLevel"),
+        })
+    score_diffs = [
+        abs(c["archived_score"] - c["replayed_score"])
+        for c in comparisons
+        if c["archived_score"] is not None and c["replayed_score"] is not None
+    ]
+    return {
+        "replayed": len(comparisons),
+        "risk_agreement": sum(c["archived_risk"] == c["replayed_risk"] for c in comparisons) / len(comparisons) if comparisons else None,
+        "mean_abs_score_diff": sum(score_diffs) / len(score_diffs) if score_diffs else None,
+        "comparisons": comparisons,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify or replay the decision audit log")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    verify_parser = subcommands.add_parser("verify")
+    verify_parser.add_argument("directory")
+    replay_parser = subcommands.add_parser("replay")
+    replay_parser.add_argument("directory")
+    replay_parser.add_argument("--model", default=None, help="Predictor model (defaults to FINE_TUNED_MODEL)")
+    replay_parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        ok, count, error = verify_audit_log(args.directory)
+        print(f"{count} records verified" if ok else f"Verification failed after {count} records: {error}")
+        raise SystemExit(0 if ok else 1)
+
+    from dotenv import load_dotenv
+    from src.agents.repayment_predictor import RepaymentPredictorAgent
+    load_dotenv(override=True)
+    predictor = RepaymentPredictorAgent(args.model or os.getenv('FINE_TUNED_MODEL'))
+    report = asyncio.run(replay(args.directory, predictor, args.limit))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
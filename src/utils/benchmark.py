@@ -0,0 +1,341 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils.load_test import FakeRunner, LatencyModel, build_script
+from src.utils.session_manager import SessionManager
+
+BENCHMARKS = ("extraction", "sessions", "pipeline", "startup")
+HIGHER_IS_BETTER = {"throughput_per_s"}
+REQUIRED_FIELDS = {"age", "gender", "marital_status", "location", "amount", "tenure"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    commit_sha TEXT NOT NULL,
+    dirty INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    environment TEXT NOT NULL,
+    results TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs (commit_sha, created_at);
+"""
+
+
+def git_commit() -> Tuple[str, bool]:
+    """Returns (HEAD sha, whether tracked files have uncommitted changes)."""
+    try:
+        sha = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                capture_output=True, text=True, check=True).stdout
+        return sha, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def resolve_commit(ref: str) -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", ref], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ref
+
+
+def environment() -> Dict[str, Any]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine()}
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF) -> float:
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def summarize(latencies: List[float], duration: float) -> Dict[str, float]:
+    samples = np.array(latencies) * 1000
+    return {
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "p99_ms": float(np.percentile(samples, 99)),
+        "throughput_per_s": len(latencies) / duration if duration else 0.0,
+    }
+
+
+class BenchmarkRunner:
+    """Runs the offline benchmarks ``repeats`` times each and keeps every repeat's metrics.
+
+    Benchmarks always run in the order of BENCHMARKS, so the process-wide peak
+    RSS recorded after each one is comparable between runs of the CLI (each run
+    is a fresh process; the peak never goes down within one).
+    """
+
+    def __init__(self, nlp=None, spacy_model: str = "en_core_web_sm", repeats: int = 5,
+                 applications: int = 50, sessions: int = 500, seed: int = 0):
+        self.nlp = nlp
+        self.spacy_model = spacy_model
+        self.repeats = repeats
+        self.applications = applications
+        self.sessions = sessions
+        self.seed = seed
+        self._extractor = None
+
+    @property
+    def extractor(self):
+        if self._extractor is None:
+            import spacy
+            from src.utils.nl_extractor import ApplicationExtractor
+            self._extractor = ApplicationExtractor(nlp=self.nlp or spacy.load(self.spacy_model))
+        return self._extractor
+
+    def scripts(self) -> List[List[Tuple[str, str]]]:
+        rng = random.Random(self.seed)
+        return [build_script(rng) for _ in range(self.applications)]
+
+    def bench_extraction(self) -> Dict[str, float]:
+        messages = [message for script in self.scripts() for stage, message in script if stage == "collection"]
+        latencies = []
+        started = time.perf_counter()
+        for message in messages:
+            turn_started = time.perf_counter()
+            self.extractor.extract_all_fields(message, REQUIRED_FIELDS, {})
+            latencies.append(time.perf_counter() - turn_started)
+        return summarize(latencies, time.perf_counter() - started)
+
+    def bench_sessions(self) -> Dict[str, float]:
+        manager = SessionManager(lambda: {"application_data": {}, "fields_collected": set()}, max_history=20)
+        scripts = self.scripts()
+        ids = [None] * self.sessions
+        histories = [[] for _ in range(self.sessions)]
+        latencies = []
+        started = time.perf_counter()
+        for step in range(max(len(script) for script in scripts)):
+            for i in range(self.sessions):
+                script = scripts[i % len(scripts)]
+                if step >= len(script):
+                    continue
+                turn_started = time.perf_counter()
+                ids[i], state, _ = manager.checkout(ids[i])
+                state["application_data"][f"turn_{step}"] = script[step][1]
+                histories[i] = manager.trim_history(histories[i] + [(script[step][1], "ok")])
+                manager.save(ids[i], state)
+                latencies.append(time.perf_counter() - turn_started)
+        return summarize(latencies, time.perf_counter() - started)
+
+    def bench_pipeline(self) -> Dict[str, float]:
+        from agents import set_tracing_disabled
+        from src.agents.coordinator import CoordinatorAgent
+        from src.agents.repayment_predictor import RepaymentPredictorAgent
+        from src.agents.recommendation import RecommendationAgent
+        from src.agents.emailer import EmailerAgent
+
+        set_tracing_disabled(True)
+        # Model calls return almost at once, so the numbers are the app's own overhead.
+        coordinator = CoordinatorAgent(
+            RepaymentPredictorAgent("fake-model"),
+            RecommendationAgent(),
+            EmailerAgent("fake-google-key", "fake-groq-key"),
+            extractor=self.extractor,
+            runner=FakeRunner(LatencyModel(default_median_ms=0.01, sigma=0.0)),
+            orchestration="state_machine"
+        )
+
+        async def run(scripts):
+            latencies = []
+            for script in scripts:
+                session = None
+                for _, message in script:
+                    turn_started = time.perf_counter()
+                    _, session = await coordinator.process(message, session)
+                    latencies.append(time.perf_counter() - turn_started)
+            return latencies
+
+        started = time.perf_counter()
+        latencies = asyncio.run(run(self.scripts()))
+        return summarize(latencies, time.perf_counter() - started)
+
+    def bench_startup(self) -> Dict[str, float]:
+        # Placeholder keys let the clients be constructed offline; no request is sent.
+        env = {"OPENAI_API_KEY": "benchmark", "GOOGLE_API_KEY": "benchmark", "GROQ_API_KEY": "benchmark", **os.environ}
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "from src.main import build_coordinator; build_coordinator()"],
+                       check=True, env=env)
+        return {"startup_s": time.perf_counter() - started, "peak_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN)}
+
+    def run(self, names=BENCHMARKS) -> Dict[str, Dict[str, List[float]]]:
+        results = {}
+        for name in BENCHMARKS:
+            if name not in names:
+                continue
+            samples: Dict[str, List[float]] = {}
+            for _ in range(self.repeats):
+                metrics = getattr(self, f"bench_{name}")()
+                metrics.setdefault("peak_rss_mb", peak_rss_mb())
+                for metric, value in metrics.items():
+                    samples.setdefault(metric, []).append(value)
+            results[name] = samples
+        return results
+
+
+class BenchmarkStore:
+    """Benchmark runs in SQLite, keyed by git commit."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.executescript(SCHEMA)
+
+    def add(self, commit_sha: str, dirty: bool, results: Dict[str, Any], env: Optional[Dict[str, Any]] = None) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (commit_sha, dirty, created_at, environment, results) VALUES (?, ?, ?, ?, ?)",
+                (commit_sha, int(dirty), time.time(), json.dumps(env or {}), json.dumps(results)),
+            )
+        return cursor.lastrowid
+
+    def _row(self, row) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        run_id, commit_sha, dirty, created_at, env, results = row
+        return {"id": run_id, "commit": commit_sha, "dirty": bool(dirty), "created_at": created_at,
+                "environment": json.loads(env), "results": json.loads(results)}
+
+    def latest(self, commit_sha: Optional[str] = None, exclude: Optional[str] = None,
+               before: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Most recent run for ``commit_sha`` (a prefix is enough), or of any commit other than ``exclude``."""
+        conditions, params = [], []
+        if commit_sha:
+            conditions.append("commit_sha LIKE ?")
+            params.append(f"{commit_sha}%")
+        if exclude:
+            conditions.append("commit_sha != ?")
+            params.append(exclude)
+        if before is not None:
+            conditions.append("id < ?")
+            params.append(before)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, commit_sha, dirty, created_at, environment, results FROM runs"
+                f"{where} ORDER BY created_at DESC, id DESC LIMIT 1", params
+            ).fetchone()
+        return self._row(row)
+
+    def history(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, commit_sha, dirty, created_at, environment, results FROM runs "
+                "ORDER BY created_at DESC, id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def relative_spread(samples: List[float]) -> float:
+    """Median absolute deviation relative to the median, a noise estimate robust to outliers."""
+    median = float(np.median(samples))
+    if not median:
+        return 0.0
+    return float(np.median(np.abs(np.array(samples) - median))) / abs(median)
+
+
+def compare(baseline: Dict[str, Dict[str, List[float]]], current: Dict[str, Dict[str, List[float]]],
+            threshold: float = 0.1, noise_factor: float = 3.0) -> List[Dict[str, Any]]:
+    """Compares the median of every metric; a change only counts once it exceeds both
+    ``threshold`` and ``noise_factor`` times the noisier run's relative spread."""
+    rows = []
+    for benchmark, metrics in current.items():
+        for metric, samples in metrics.items():
+            base_samples = baseline.get(benchmark, {}).get(metric)
+            if not base_samples:
+                continue
+            base, value = float(np.median(base_samples)), float(np.median(samples))
+            change = (value - base) / abs(base) if base else 0.0
+            allowed = max(threshold, noise_factor * max(relative_spread(base_samples), relative_spread(samples)))
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            status = "regression" if worse > allowed else "improvement" if worse < -allowed else "ok"
+            rows.append({"benchmark": benchmark, "metric": metric, "baseline": base, "current": value,
+                         "change": change, "allowed": allowed, "status": status})
+    return rows
+
+
+def format_diff(rows: List[Dict[str, Any]], baseline_commit: str, current_commit: str) -> str:
+    lines = [
+        f"Baseline {baseline_commit[:12]} -> current {current_commit[:12]}",
+        "",
+        f"{'benchmark':<12}{'metric':<18}{'baseline':>12}{'current':>12}{'change':>9}{'allowed':>9}  status",
+    ]
+    for row in rows:
+        flag = row["status"].upper() if row["status"] == "regression" else row["status"]
+        lines.append(f"{row['benchmark']:<12}{row['metric']:<18}{row['baseline']:>12.3f}{row['current']:>12.3f}"
+                     f"{row['change']:>+9.1%}{row['allowed']:>9.1%}  {flag}")
+    regressions = [row for row in rows if row["status"] == "regression"]
+    lines += ["", f"{len(regressions)} regression(s) in {len({row['benchmark'] for row in regressions})} benchmark(s)"]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline benchmarks, store them by git commit and diff against a baseline")
+    parser.add_argument("command", choices=["run", "compare", "history"])
+    parser.add_argument("--store", default="benchmarks.sqlite3")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--applications", type=int, default=50, help="Scripted applications per repeat")
+    parser.add_argument("--sessions", type=int, default=500, help="Concurrent sessions in the session benchmark")
+    parser.add_argument("--spacy-model", default="en_core_web_sm")
+    parser.add_argument("--baseline", default=None, help="Commit to compare against (default: latest other commit)")
+    parser.add_argument("--current", default=None, help="Commit to compare (compare only; default: HEAD)")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Minimum relative change to flag")
+    parser.add_argument("--noise-factor", type=float, default=3.0)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    store = BenchmarkStore(args.store)
+    if args.command == "history":
+        for run in store.history():
+            dirty = " (dirty)" if run["dirty"] else ""
+            print(f"{run['id']:>5}  {run['commit'][:12]}{dirty}  "
+                  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(run['created_at']))}  {', '.join(run['results'])}")
+        return
+
+    commit_sha, dirty = git_commit()
+    if args.command == "run":
+        runner = BenchmarkRunner(spacy_model=args.spacy_model, repeats=args.repeats,
+                                 applications=args.applications, sessions=args.sessions)
+        results = runner.run(args.benchmarks.split(","))
+        run_id = store.add(commit_sha, dirty, results, environment())
+        current = {"id": run_id, "commit": commit_sha, "results": results}
+    else:
+        current = store.latest(resolve_commit(args.current) if args.current else commit_sha)
+        if current is None:
+            sys.exit(f"No stored run for {args.current or commit_sha}")
+
+    if args.baseline:
+        baseline_commit = resolve_commit(args.baseline)
+        # Re-running the baseline commit compares against its previous run, not against itself.
+        same_commit = current["commit"].startswith(baseline_commit)
+        baseline = store.latest(baseline_commit, before=current["id"] if same_commit else None)
+    else:
+        baseline = store.latest(exclude=current["commit"])
+    if baseline is None:
+        print("No baseline run to compare against")
+        return
+    rows = compare(baseline["results"], current["results"], args.threshold, args.noise_factor)
+    print(format_diff(rows, baseline["commit"], current["commit"]))
+    if args.fail_on_regression and any(row["status"] == "regression" for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import math
+import threading
+import time
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.models.validation_models import LoanDecision, RecommendationSchema
+
+# One unit of distance per feature: 5 years of age, ~10% of amount, 15 days of tenure.
+AGE_SCALE = 5.0
+LOG_AMOUNT_SCALE = 0.1
+TENURE_SCALE = 15.0
+
+
+class DecisionCache:
+    """Reuses recommendations for near-identical applications.
+
+    Applications are bucketed by their categorical fields and predicted risk
+    level, and the numeric fields are kept as scaled vectors in a fixed-size
+    NumPy table. A lookup reuses the closest entry in the same bucket if it is
+    within ``max_distance`` and its decision is one of ``reusable_decisions``.
+    When the table is full the least recently used slot is overwritten.
+    """
+
+    def __init__(self, capacity: int = 10000, max_distance: float = 0.25,
+                 reusable_decisions: Iterable[str] = ("approve", "reject"), ttl: float = 3600.0):
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self.reusable_decisions = frozenset(LoanDecision(d) for d in reusable_decisions)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((capacity, 3), dtype=np.float64)
+        self._buckets = np.full(capacity, -1, dtype=np.int64)
+        self._stored_at = np.zeros(capacity, dtype=np.float64)
+        self._last_used = np.zeros(capacity, dtype=np.float64)
+        self._values: List[Optional[RecommendationSchema]] = [None] * capacity
+        self._bucket_ids: Dict[Tuple[str, ...], int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _vector(self, application) -> np.ndarray:
+        return np.array([
+            application.age / AGE_SCALE,
+            math.log(max(application.amount, 1.0)) / LOG_AMOUNT_SCALE,
+            application.tenure / TENURE_SCALE,
+        ])
+
+    def _bucket_key(self, application, risk_level: str) -> Tuple[str, ...]:
+        return (
+            application.gender,
+            application.marital_status,
+            application.location.strip().lower(),
+            str(risk_level).lower(),
+        )
+
+    def lookup(self, application, risk_level: str) -> Optional[RecommendationSchema]:
+        with self._lock:
+            bucket = self._bucket_ids.get(self._bucket_key(application, risk_level))
+            now = time.time()
+            if bucket is not None:
+                candidates = np.flatnonzero((self._buckets == bucket) & (now - self._stored_at <= self.ttl))
+                if len(candidates):
+                    distances = np.linalg.norm(self._vectors[candidates] - self._vector(application), axis=1)
+                    best = int(np.argmin(distances))
+                    if distances[best] <= self.max_distance:
+                        slot = int(candidates[best])
+                        self._last_used[slot] = now
+                        self.hits += 1
+                        return self._adapt(self._values[slot], application)
+            self.misses += 1
+            return None
+
+    def store(self, application, risk_level: str, recommendation: Any):
+        if not isinstance(recommendation, RecommendationSchema) or recommendation.decision not in self.reusable_decisions:
+            return
+        with self._lock:
+            key = self._bucket_key(application, risk_level)
+            bucket = self._bucket_ids.setdefault(key, len(self._bucket_ids))
+            empty = np.flatnonzero(self._buckets == -1)
+            if len(empty):
+                slot = int(empty[0])
+            else:
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+            now = time.time()
+            self._vectors[slot] = self._vector(application)
+            self._buckets[slot] = bucket
+            self._stored_at[slot] = now
+            self._last_used[slot] = now
+            self._values[slot] = recommendation
+
+    def _adapt(self, recommendation: RecommendationSchema, application) -> RecommendationSchema:
+        if recommendation.decision == LoanDecision.APPROVE:
+            # A cached approval approves what this applicant asked for, not the neighbour's terms.
+            return recommendation.model_copy(update={"approvedAmount": application.amount, "approvedTenure": application.tenure})
+        return recommendation.model_copy()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": int(np.count_nonzero(self._buckets != -1)),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
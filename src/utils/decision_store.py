@@ -0,0 +1,291 @@
+import fcntl
+import json
+import os
+import threading
+import time
+import numpy as np
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+GENDERS = ("unknown", "male", "female", "other")
+MARITAL_STATUSES = ("unknown", "single", "married", "divorced", "widowed")
+RISK_LEVELS = ("unknown", "high", "medium", "acceptable")
+DECISIONS = ("unknown", "approve", "reject", "conditional")
+
+COLUMNS = {
+    "timestamp": np.float64,
+    "age": np.uint8,
+    "gender": np.uint8,
+    "marital_status": np.uint8,
+    "location": np.uint16,
+    "amount": np.float64,
+    "tenure": np.uint16,
+    "score": np.int8,
+    "risk_level": np.uint8,
+    "decision": np.uint8,
+    "model": np.uint16,
+    "prediction_ms": np.float32,
+    "recommendation_ms": np.float32,
+}
+
+ENUM_COLUMNS = {
+    "gender": GENDERS,
+    "marital_status": MARITAL_STATUSES,
+    "risk_level": RISK_LEVELS,
+    "decision": DECISIONS,
+}
+
+DICTIONARY_COLUMNS = ("location", "model")
+
+AMOUNT_BANDS = (0, 50000, 100000, 250000, 500000, 1000001)
+TENURE_BANDS = (0, 30, 60, 90, 120, 181)
+SCORE_BINS = (0, 41, 71, 100)
+
+
+def classify_decision(recommendation: Any) -> str:
+    decision = getattr(recommendation, "decision", None)
+    if decision is not None:
+        return str(getattr(decision, "value", decision))
+    text = str(recommendation or "").lower()
+    if "conditional" in text:
+        return "conditional"
+    if any(word in text for word in ("reject", "decline", "not approve", "deny")):
+        return "reject"
+    if "approve" in text:
+        return "approve"
+    return "unknown"
+
+
+def _band_labels(edges: Sequence[float]) -> List[str]:
+    labels = []
+    for low, high in zip(edges[:-1], edges[1:]):
+        labels.append(f"{low:,}-{high - 1:,}")
+    return labels
+
+
+class DecisionStore:
+    """Append-only columnar store of processed applications, one file per column.
+
+    Rows are partitioned by UTC day (``root/YYYY-MM-DD/<column>.bin``) and each
+    column is a raw little-endian array, so a partition is read back with
+    ``np.memmap`` and aggregated chunk by chunk without loading it into memory.
+    Strings with open vocabularies (state, model id) are dictionary-encoded in
+    ``root/dictionary.json``.
+
+    Several processes (the web app and job-queue workers) may write to the same
+    root: every append holds an exclusive lock on ``root/.writer.lock``,
+    re-reads the dictionary if another process changed it, and writes all
+    columns of the row before releasing, so codes and column lengths agree.
+    """
+
+    def __init__(self, root: str, chunk_rows: int = 1 << 20):
+        self.root = root
+        self.chunk_rows = chunk_rows
+        self._lock = threading.Lock()
+        self._handles: Dict[str, Any] = {}
+        self._handles_day: Optional[str] = None
+        os.makedirs(root, exist_ok=True)
+        self._dictionary_path = os.path.join(root, "dictionary.json")
+        self._dictionary_version = None
+        self._dictionary: Dict[str, List[str]] = {column: [] for column in DICTIONARY_COLUMNS}
+        self._codes: Dict[str, Dict[str, int]] = {column: {} for column in DICTIONARY_COLUMNS}
+        self._lock_file = open(os.path.join(root, ".writer.lock"), "a")
+        self._load_dictionary()
+
+    def _load_dictionary(self):
+        """Re-reads dictionary.json if it was replaced since it was last read."""
+        try:
+            stat = os.stat(self._dictionary_path)
+        except FileNotFoundError:
+            return
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if version == self._dictionary_version:
+            return
+        with open(self._dictionary_path) as f:
+            self._dictionary = {column: [] for column in DICTIONARY_COLUMNS}
+            self._dictionary.update(json.load(f))
+        self._codes = {
+            column: {value: code for code, value in enumerate(values)}
+            for column, values in self._dictionary.items()
+        }
+        self._dictionary_version = version
+
+    @contextmanager
+    def _writer(self):
+        with self._lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                self._load_dictionary()
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def record(self, application, prediction, recommendation, model: Optional[str] = None,
+               prediction_ms: float = 0.0, recommendation_ms: float = 0.0, timestamp: Optional[float] = None):
+        score = getattr(prediction, "repaymentProbabilityScore", None)
+        risk_level = str(getattr(prediction, "riskLevel", "unknown")).lower()
+        row = {
+            "timestamp": time.time() if timestamp is None else timestamp,
+            "age": application.age,
+            "gender": application.gender,
+            "marital_status": application.marital_status,
+            "location": application.location.strip().lower(),
+            "amount": application.amount,
+            "tenure": application.tenure,
+            "score": -1 if score is None else score,
+            "risk_level": risk_level,
+            "decision": classify_decision(recommendation),
+            "model": model or "unknown",
+            "prediction_ms": prediction_ms,
+            "recommendation_ms": recommendation_ms,
+        }
+        self.append(row)
+
+    def append(self, row: Dict[str, Any]):
+        with self._writer():
+            encoded = {column: self._encode(column, row[column]) for column in COLUMNS}
+            day = datetime.fromtimestamp(encoded["timestamp"], tz=timezone.utc).strftime("%Y-%m-%d")
+            handles = self._partition_handles(day)
+            for column, dtype in COLUMNS.items():
+                handles[column].write(np.asarray([encoded[column]], dtype=dtype).tobytes())
+            for handle in handles.values():
+                handle.flush()
+
+    def close(self):
+        with self._lock:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles = {}
+            self._handles_day = None
+            self._lock_file.close()
+
+    def _encode(self, column: str, value: Any):
+        if column in ENUM_COLUMNS:
+            values = ENUM_COLUMNS[column]
+            value = str(value).lower()
+            return values.index(value) if value in values else 0
+        if column in DICTIONARY_COLUMNS:
+            codes = self._codes[column]
+            if value not in codes:
+                codes[value] = len(self._dictionary[column])
+                self._dictionary[column].append(value)
+                self._save_dictionary()
+            return codes[value]
+        return value
+
+    def _save_dictionary(self):
+        tmp_path = self._dictionary_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._dictionary, f)
+        os.replace(tmp_path, self._dictionary_path)
+        stat = os.stat(self._dictionary_path)
+        self._dictionary_version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _partition_handles(self, day: str) -> Dict[str, Any]:
+        if self._handles_day != day:
+            for handle in self._handles.values():
+                handle.close()
+            directory = os.path.join(self.root, day)
+            os.makedirs(directory, exist_ok=True)
+            self._handles = {column: open(os.path.join(directory, f"{column}.bin"), "ab") for column in COLUMNS}
+            self._handles_day = day
+        # Drop a partial row left by a writer that died mid-append, so new rows stay aligned.
+        rows = min(os.fstat(handle.fileno()).st_size // np.dtype(COLUMNS[column]).itemsize
+                   for column, handle in self._handles.items())
+        for column, handle in self._handles.items():
+            if os.fstat(handle.fileno()).st_size != rows * np.dtype(COLUMNS[column]).itemsize:
+                handle.truncate(rows * np.dtype(COLUMNS[column]).itemsize)
+        return self._handles
+
+    def partitions(self, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        days = sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name))
+        )
+        return [day for day in days if (start is None or day >= start) and (end is None or day <= end)]
+
+    def _open_partition(self, day: str, columns: Sequence[str]) -> Dict[str, np.ndarray]:
+        directory = os.path.join(self.root, day)
+        # A crash between column writes can leave one column a row ahead, so
+        # only rows present in every column of the partition are visible.
+        rows = min(
+            os.path.getsize(os.path.join(directory, f"{column}.bin")) // np.dtype(dtype).itemsize
+            if os.path.exists(os.path.join(directory, f"{column}.bin")) else 0
+            for column, dtype in COLUMNS.items()
+        )
+        if rows == 0:
+            return {}
+        return {
+            column: np.memmap(os.path.join(directory, f"{column}.bin"), dtype=COLUMNS[column], mode="r", shape=(rows,))
+            for column in columns
+        }
+
+    def scan(self, columns: Sequence[str], start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Dict[str, np.ndarray]]:
+        for day in self.partitions(start, end):
+            arrays = self._open_partition(day, columns)
+            if not arrays:
+                continue
+            rows = len(next(iter(arrays.values())))
+            for offset in range(0, rows, self.chunk_rows):
+                yield {column: np.asarray(array[offset:offset + self.chunk_rows]) for column, array in arrays.items()}
+
+    def count(self, start: Optional[str] = None, end: Optional[str] = None) -> int:
+        return sum(len(chunk["timestamp"]) for chunk in self.scan(["timestamp"], start, end))
+
+    def _group(self, by: str, chunk: Dict[str, np.ndarray]) -> Tuple[np.ndarray, List[str]]:
+        if by == "state":
+            with self._lock:
+                # Another process may have added states since this one last wrote.
+                self._load_dictionary()
+            labels = [value.title() for value in self._dictionary["location"]]
+            return chunk["location"].astype(np.int64), labels
+        if by == "amount_band":
+            return np.digitize(chunk["amount"], AMOUNT_BANDS[1:-1]), _band_labels(AMOUNT_BANDS)
+        if by == "tenure_band":
+            return np.digitize(chunk["tenure"], TENURE_BANDS[1:-1]), _band_labels(TENURE_BANDS)
+        raise ValueError(f"Unknown grouping '{by}', expected state, amount_band or tenure_band")
+
+    def _group_columns(self, by: str) -> List[str]:
+        return {"state": ["location"], "amount_band": ["amount"], "tenure_band": ["tenure"]}[by]
+
+    def approval_rate(self, by: str = "state", start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        approve = DECISIONS.index("approve")
+        conditional = DECISIONS.index("conditional")
+        totals = approved = conditionals = np.zeros(0, dtype=np.int64)
+        labels: List[str] = []
+        for chunk in self.scan(self._group_columns(by) + ["decision"], start, end):
+            groups, labels = self._group(by, chunk)
+            size = max(len(labels), len(totals))
+            totals = np.bincount(groups, minlength=size) + np.pad(totals, (0, size - len(totals)))
+            approved = np.bincount(groups, weights=chunk["decision"] == approve, minlength=size).astype(np.int64) + np.pad(approved, (0, size - len(approved)))
+            conditionals = np.bincount(groups, weights=chunk["decision"] == conditional, minlength=size).astype(np.int64) + np.pad(conditionals, (0, size - len(conditionals)))
+        report = {}
+        for index, total in enumerate(totals):
+            if total:
+                report[labels[index]] = {
+                    "count": int(total),
+                    "approved": int(approved[index]),
+                    "conditional": int(conditionals[index]),
+                    "approval_rate": float(approved[index]) / float(total),
+                }
+        return report
+
+    def score_distribution(self, by: str = "state", bins: Sequence[int] = SCORE_BINS,
+                           start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        bin_labels = _band_labels(bins)
+        counts = np.zeros((0, len(bin_labels)), dtype=np.int64)
+        labels: List[str] = []
+        for chunk in self.scan(self._group_columns(by) + ["score"], start, end):
+            groups, labels = self._group(by, chunk)
+            scored = chunk["score"] >= 0
+            score_bins = np.clip(np.digitize(chunk["score"][scored], bins[1:-1]), 0, len(bin_labels) - 1)
+            size = max(len(labels), len(counts))
+            flat = groups[scored] * len(bin_labels) + score_bins
+            chunk_counts = np.bincount(flat, minlength=size * len(bin_labels)).reshape(size, len(bin_labels))
+            counts = chunk_counts + np.pad(counts, ((0, size - len(counts)), (0, 0)))
+        return {
+            labels[index]: dict(zip(bin_labels, (int(c) for c in row)))
+            for index, row in enumerate(counts)
+            if row.sum()
+        }
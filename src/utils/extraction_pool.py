@@ -0,0 +1,91 @@
+import asyncio
+import contextvars
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Set, Tuple
+from src.utils.model_registry import registry
+
+
+def _init_worker():
+    registry.preload(freeze=False)
+
+
+def _extract_in_worker(text: str, fields: Set[str], current_data: Dict[str, Any]):
+    started = time.time()
+    result = registry.get_extractor().extract_all_fields(text, fields, current_data)
+    return result, started, time.time()
+
+
+class ExtractionPool:
+    """Runs ApplicationExtractor off the event loop on a bounded worker pool.
+
+    At most ``max_workers + max_queue`` extractions are admitted at once; further
+    callers wait before submitting, which pushes back on the chat handlers
+    instead of growing an unbounded executor queue. Queue wait (admission plus
+    executor queueing) and run time are kept for the last ``window`` calls.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 32, use_processes: bool = False,
+                 extractor=None, window: int = 1000):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        if use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+        else:
+            self._extractor = extractor or registry.get_extractor()
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extraction")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._queue_waits = deque(maxlen=window)
+        self._run_times = deque(maxlen=window)
+        self.in_flight = 0
+        self.completed = 0
+
+    def _extract_in_thread(self, text: str, fields: Set[str], current_data: Dict[str, Any]):
+        started = time.time()
+        result = self._extractor.extract_all_fields(text, fields, current_data)
+        return result, started, time.time()
+
+    async def extract(self, text: str, fields: Set[str], current_data: Dict[str, Any] = None) -> Dict[str, Tuple[Any, float]]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        submitted = time.time()
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                args = (text, set(fields), dict(current_data or {}))
+                if self.use_processes:
+                    call = (_extract_in_worker, *args)
+                else:
+                    # Carry the caller's context (profiler labels) into the pool thread.
+                    call = (contextvars.copy_context().run, self._extract_in_thread, *args)
+                result, started, finished = await loop.run_in_executor(self._executor, *call)
+            finally:
+                self.in_flight -= 1
+        self._queue_waits.append(started - submitted)
+        self._run_times.append(finished - started)
+        self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        def percentiles(samples):
+            if not samples:
+                return {"p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+            values = np.array(samples) * 1000
+            return {
+                "p50_ms": float(np.percentile(values, 50)),
+                "p95_ms": float(np.percentile(values, 95)),
+                "max_ms": float(values.max()),
+            }
+        return {
+            "completed": self.completed,
+            "in_flight": self.in_flight,
+            "queue_wait": percentiles(self._queue_waits),
+            "run_time": percentiles(self._run_times),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,145 @@
+import asyncio
+import importlib.util
+import threading
+import httpx
+from collections import Counter
+from urllib.parse import urlsplit
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from typing import Any, Dict, Iterable, Optional, Tuple
+from src.utils.rate_limiter import ProviderLimiter, RateLimitedTransport
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+PROVIDER_ORIGINS = {
+    "openai": "https://api.openai.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+    "groq": "https://api.groq.com",
+}
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _origin(base_url: Optional[str]) -> str:
+    parts = urlsplit(base_url or OPENAI_BASE_URL)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class ClientFactory:
+    """One keep-alive connection pool per provider, shared by every model client.
+
+    All AsyncOpenAI clients for the same origin (OpenAI, Gemini, Groq...) share
+    a single httpx client, whatever their API key, so TLS sessions and
+    connections are reused across agents. HTTP/2 is used when requested and the
+    optional ``h2`` package is installed. Providers listed in ``rate_limits``
+    as ``{name: (requests_per_minute, tokens_per_minute)}`` get one
+    ProviderLimiter shared by all of their clients.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0, http2: bool = True, timeout: float = 60.0,
+                 connect_timeout: float = 10.0, rate_limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.options = dict(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            timeout=timeout,
+            connect_timeout=connect_timeout,
+            rate_limits=rate_limits,
+        )
+        self.rate_limits = {PROVIDER_ORIGINS.get(name, _origin(name)): limits for name, limits in (rate_limits or {}).items()}
+        self.limiters: Dict[str, ProviderLimiter] = {}
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._lock = threading.RLock()
+        self._http_clients: Dict[str, Tuple[httpx.AsyncClient, httpx.AsyncHTTPTransport]] = {}
+        self._openai_clients: Dict[Tuple[Optional[str], Optional[str]], AsyncOpenAI] = {}
+        self.requests: Counter = Counter()
+        self._warmed = False
+
+    def fresh(self) -> "ClientFactory":
+        return ClientFactory(**self.options)
+
+    def get_http_client(self, base_url: Optional[str] = None) -> httpx.AsyncClient:
+        origin = _origin(base_url)
+        with self._lock:
+            entry = self._http_clients.get(origin)
+            if entry is None:
+                transport = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+                outer = transport
+                if origin in self.rate_limits:
+                    requests_per_minute, tokens_per_minute = self.rate_limits[origin]
+                    self.limiters[origin] = ProviderLimiter(requests_per_minute, tokens_per_minute)
+                    outer = RateLimitedTransport(transport, self.limiters[origin])
+
+                async def count_request(request, origin=origin):
+                    self.requests[origin] += 1
+
+                client = DefaultAsyncHttpxClient(
+                    transport=outer,
+                    timeout=self.timeout,
+                    event_hooks={"request": [count_request]},
+                )
+                entry = (client, transport)
+                self._http_clients[origin] = entry
+            return entry[0]
+
+    def get_openai_client(self, base_url: Optional[str] = None, api_key: Optional[str] = None) -> AsyncOpenAI:
+        key = (base_url, api_key)
+        with self._lock:
+            client = self._openai_clients.get(key)
+            if client is None:
+                client = AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=self.get_http_client(base_url))
+                self._openai_clients[key] = client
+            return client
+
+    async def warm_up(self, connections: int = 2, origins: Optional[Iterable[str]] = None):
+        """Opens ``connections`` connections per origin so the first model call skips the handshakes.
+
+        Connections are bound to the running event loop, so call this from the
+        loop that serves requests. Only the first call does any work.
+        """
+        with self._lock:
+            if self._warmed:
+                return
+            self._warmed = True
+            targets = [(origin, self._http_clients[origin][0]) for origin in (origins or list(self._http_clients))
+                       if origin in self._http_clients]
+
+        async def touch(origin, client):
+            try:
+                await client.head(origin, timeout=5.0)
+            except httpx.HTTPError as e:
+                print(f'Error warming up {origin}: {str(e)}')
+
+        await asyncio.gather(*(touch(origin, client) for origin, client in targets for _ in range(connections)))
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        with self._lock:
+            entries = list(self._http_clients.items())
+        for origin, (_, transport) in entries:
+            # httpx exposes no pool metrics, so read httpcore's pool directly.
+            connections = list(transport._pool.connections)
+            idle = sum(1 for connection in connections if connection.is_idle())
+            stats[origin] = {
+                "connections": len(connections),
+                "in_use": len(connections) - idle,
+                "idle": idle,
+                "requests": self.requests[origin],
+                "http2": self.http2,
+            }
+            if origin in self.limiters:
+                stats[origin]["rate_limit"] = self.limiters[origin].stats()
+        return stats
+
+    async def aclose(self):
+        with self._lock:
+            clients = [client for client, _ in self._http_clients.values()]
+            self._http_clients = {}
+            self._openai_clients = {}
+        for client in clients:
+            await client.aclose()
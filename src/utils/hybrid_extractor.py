@@ -0,0 +1,128 @@
+import re
+from collections import Counter, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Set, Tuple
+from pydantic import ValidationError
+from src.models.validation_models import FieldExtractionSchema, LoanApplicationValidator
+
+SCHEMA_FIELDS = {
+    "age": "age",
+    "gender": "gender",
+    "marital_status": "maritalStatus",
+    "location": "location",
+    "amount": "amount",
+    "tenure": "tenure",
+}
+FALLBACK_CONFIDENCE = 0.9
+
+
+class HybridExtractor:
+    """Confidence-tiered extraction: local results first, one structured model call for the rest.
+
+    Fields the local extractor finds with at least ``threshold`` confidence are
+    kept as they are. Fields it found with lower confidence, or missed although
+    the message mentions them, are batched into a single call to the field
+    extractor agent that asks for just those fields. Where the model returns
+    nothing usable the low-confidence local value is kept.
+
+    Each field's source is remembered per session, so once the applicant
+    confirms, ``record_confirmed`` can score local and model values per field.
+    """
+
+    def __init__(self, extractor, agent, threshold: float = 0.75):
+        self.extractor = extractor
+        self.agent = agent
+        self.threshold = threshold
+        self.counts: Counter = Counter()
+        self.outcomes: Dict[str, Dict[str, Counter]] = defaultdict(lambda: defaultdict(Counter))
+
+    def mentions(self, field: str, text: str) -> bool:
+        words = set(re.findall(r"[a-z]+", text.lower()))
+        return any(keyword in words for keyword in self.extractor.field_keywords[field])
+
+    def prompt(self, text: str, fields: Set[str]) -> str:
+        wanted = ", ".join(SCHEMA_FIELDS[field] for field in sorted(fields))
+        return f"Fields to extract: {wanted}\n\nApplicant message:\n{text}"
+
+    def validate(self, field: str, value: Any):
+        if field == "location":
+            resolved = self.extractor.location_resolver.resolve_phrase(str(value))
+            if not resolved:
+                return None
+            value = resolved[0]
+        # The application's own constraints (e.g. tenure up to 180 days), not the local extractor's heuristics.
+        try:
+            validated = LoanApplicationValidator.__pydantic_validator__.validate_assignment(
+                LoanApplicationValidator.model_construct(), field, value
+            )
+        except ValidationError:
+            return None
+        return getattr(validated, field)
+
+    async def refine(self, text: str, fields: Set[str], local: Dict[str, Tuple[Any, float]],
+                     run: Callable[[Any, str], Awaitable[Any]]) -> Tuple[Dict[str, Tuple[Any, float]], Dict[str, Tuple[str, Any]]]:
+        """Returns (results, sources); ``run(agent, prompt)`` makes the fallback call."""
+        self.counts["turns"] += 1
+        results = {}
+        sources = {}
+        fallback = set()
+        for field in fields:
+            if field not in SCHEMA_FIELDS:
+                continue
+            found = local.get(field)
+            if found and found[1] >= self.threshold:
+                results[field] = found
+                sources[field] = ("local", found[0])
+            elif found or self.mentions(field, text):
+                fallback.add(field)
+        self.counts["local_fields"] += len(results)
+        self.counts["fallback_fields"] += len(fallback)
+
+        output = None
+        if fallback:
+            self.counts["fallback_calls"] += 1
+            try:
+                run_result = await run(self.agent, self.prompt(text, fallback))
+                output = run_result.final_output
+            except Exception as e:
+                print(f'Error in fallback extraction: {str(e)}')
+                self.counts["fallback_errors"] += 1
+
+        for field in fallback:
+            value = None
+            if isinstance(output, FieldExtractionSchema):
+                raw = getattr(output, SCHEMA_FIELDS[field])
+                value = self.validate(field, raw) if raw is not None else None
+            if value is not None:
+                self.counts["fallback_resolved"] += 1
+                results[field] = (value, FALLBACK_CONFIDENCE)
+                sources[field] = ("model", value)
+            elif field in local:
+                results[field] = local[field]
+                sources[field] = ("local_low", local[field][0])
+        return results, sources
+
+    def record_confirmed(self, sources: Dict[str, Tuple[str, Any]], application_data: Dict[str, Any]):
+        """Scores each field's first extracted value against what the applicant confirmed, after any corrections."""
+        for field, (source, value) in sources.items():
+            outcome = self.outcomes[field][source]
+            outcome["confirmed"] += 1
+            if application_data.get(field) == value:
+                outcome["correct"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        extracted = self.counts["local_fields"] + self.counts["fallback_fields"]
+        return {
+            **self.counts,
+            "fallback_rate": self.counts["fallback_fields"] / extracted if extracted else 0.0,
+            "accuracy": {
+                field: {
+                    source: {
+                        "confirmed": outcome["confirmed"],
+                        "correct": outcome["correct"],
+                        "accuracy": outcome["correct"] / outcome["confirmed"],
+                    }
+                    for source, outcome in by_source.items()
+                }
+                for field, by_source in self.outcomes.items()
+            },
+        }
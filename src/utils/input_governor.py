@@ -0,0 +1,57 @@
+from collections import Counter
+from typing import Any, Dict, List
+
+SENTENCE_BREAKS = ("\n", ". ", "! ", "? ", "; ")
+
+
+class InputGovernor:
+    """Bounds the cost of a chat turn whatever the size of the user's message.
+
+    Only the first ``max_chars`` characters are ever extracted from, in chunks
+    of at most ``chunk_chars`` cut at sentence or word boundaries, so the
+    caller can stop as soon as every missing field is found. Text forwarded
+    to the model is cut to ``forward_chars`` (head and tail, with a marker).
+    """
+
+    def __init__(self, max_chars: int = 4000, chunk_chars: int = 1000, forward_chars: int = 1000):
+        self.max_chars = max_chars
+        self.chunk_chars = chunk_chars
+        self.forward_chars = forward_chars
+        self.counts: Counter = Counter()
+
+    def chunks(self, text: str) -> List[str]:
+        self.counts["turns"] += 1
+        if len(text) > self.max_chars:
+            self.counts["capped"] += 1
+            text = text[:self.max_chars]
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(start + self.chunk_chars, len(text))
+            if end < len(text):
+                window = text[start:end]
+                cut = max(window.rfind(mark) + len(mark) for mark in SENTENCE_BREAKS)
+                if cut <= len(window) // 2:
+                    cut = window.rfind(" ") + 1
+                if cut > len(window) // 2:
+                    end = start + cut
+            chunks.append(text[start:end])
+            start = end
+        return chunks
+
+    def forward(self, text: str) -> str:
+        if len(text) <= self.forward_chars:
+            return text
+        self.counts["truncated"] += 1
+        head = self.forward_chars * 2 // 3
+        tail = self.forward_chars - head
+        omitted = len(text) - head - tail
+        return f"{text[:head]}\n[... {omitted} characters omitted ...]\n{text[-tail:]}"
+
+    def record_extraction(self, chunks_used: int, chunks_total: int):
+        self.counts["chunks"] += chunks_used
+        if chunks_used < chunks_total:
+            self.counts["early_exits"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.counts)
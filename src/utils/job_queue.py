@@ -0,0 +1,227 @@
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+from src.models.validation_models import LoanApplicationValidator, RecommendationSchema, RepaymentPredictorSchema
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+def _to_jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return value
+
+
+class JobQueue:
+    """Durable SQLite job queue shared by the web process and processing workers.
+
+    A worker claims the oldest queued job and holds a lease on it; a job whose
+    lease has expired (its worker died) is claimed again. Failed and abandoned
+    jobs are retried until ``max_attempts`` is reached, so a job that keeps
+    killing its worker ends up failed instead of looping.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 120.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def enqueue(self, payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            # Re-enqueueing a live job is a no-op; a failed one starts over with fresh attempts.
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, payload, created_at, updated_at) VALUES (?, 'queued', ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET status = 'queued', payload = excluded.payload, attempts = 0, "
+                "error = NULL, lease_until = NULL, updated_at = excluded.updated_at WHERE status = 'failed'",
+                (job_id, json.dumps(payload, default=str), now, now),
+            )
+        return job_id
+
+    def claim(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'lease expired on final attempt', lease_until = NULL, "
+                "updated_at = ? WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = self._conn.execute(
+                """
+                UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, updated_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs
+                    WHERE status = 'queued' OR (status = 'running' AND lease_until < ? AND attempts < ?)
+                    ORDER BY created_at LIMIT 1
+                )
+                RETURNING id, payload
+                """,
+                (now + self.lease_seconds, now, now, self.max_attempts),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                (json.dumps(result, default=str), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+                "error = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                (self.max_attempts, error, time.time(), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, result, error, attempts FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, result, error, attempts = row
+        return {"status": status, "result": json.loads(result) if result else None, "error": error, "attempts": attempts}
+
+    def purge(self, older_than: float):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?", (time.time() - older_than,)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def decode_result(result: Dict[str, Any]) -> Tuple[Any, Any, Optional[str]]:
+    prediction, recommendation = result.get("prediction"), result.get("recommendation")
+    if isinstance(prediction, dict):
+        prediction = RepaymentPredictorSchema(**prediction)
+    if isinstance(recommendation, dict):
+        recommendation = RecommendationSchema(**recommendation)
+    return prediction, recommendation, result.get("explanation")
+
+
+class ProcessingWorker:
+    """Consumes processing jobs and runs the predictor and recommender through a CoordinatorAgent."""
+
+    def __init__(self, coordinator, job_queue: JobQueue, concurrency: int = 4, poll_interval: float = 0.5,
+                 retention: float = 86400.0, purge_interval: float = 600.0):
+        self.coordinator = coordinator
+        self.job_queue = job_queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._purged_at = 0.0
+        self.processed = 0
+        self.failed = 0
+        self._stopped = False
+
+    async def run_job(self, job_id: str, payload: Dict[str, Any]):
+        try:
+            session_state = self.coordinator.initialize_session_state()
+            session_state["application_data"] = payload["application_data"]
+            validated = LoanApplicationValidator(**payload["application_data"])
+            await self.coordinator.assess(validated, session_state)
+            result = {
+                "prediction": _to_jsonable(session_state["prediction_result"]),
+                "recommendation": _to_jsonable(session_state["recommendation_result"]),
+                "explanation": session_state.get("recommendation_explanation"),
+            }
+            await asyncio.to_thread(self.job_queue.complete, job_id, result)
+            self.processed += 1
+        except Exception as e:
+            print(f'Error processing job {job_id}: {str(e)}')
+            self.failed += 1
+            await asyncio.to_thread(self.job_queue.fail, job_id, f"{type(e).__name__}: {str(e)}")
+
+    async def run(self, max_jobs: Optional[int] = None):
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        claimed = 0
+        while not self._stopped and (max_jobs is None or claimed < max_jobs):
+            await slots.acquire()
+            job = await asyncio.to_thread(self.job_queue.claim)
+            if job is None:
+                slots.release()
+                if time.monotonic() - self._purged_at >= self.purge_interval:
+                    # Finished jobs are only needed until their session has polled them.
+                    self._purged_at = time.monotonic()
+                    await asyncio.to_thread(self.job_queue.purge, self.retention)
+                await asyncio.sleep(self.poll_interval)
+                continue
+            claimed += 1
+            task = asyncio.create_task(self.run_job(*job))
+            tasks.add(task)
+            task.add_done_callback(lambda done: (tasks.discard(done), slots.release()))
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run_forever(self):
+        """Keeps the worker running for the life of the process, restarting it after an error."""
+        while not self._stopped:
+            try:
+                await self.run()
+            except Exception as e:
+                print(f'Error in processing worker, restarting: {str(e)}')
+                await asyncio.sleep(self.poll_interval)
+
+    def stop(self):
+        self._stopped = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run processing-stage workers against the job queue")
+    parser.add_argument("--queue", default=os.getenv('JOB_QUEUE_PATH', 'jobs.sqlite3'))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv('JOB_WORKER_CONCURRENCY', '4')))
+    parser.add_argument("--retention", type=float, default=float(os.getenv('JOB_RETENTION', '86400')),
+                        help="Seconds to keep finished jobs before purging them")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from src.main import build_coordinator
+    load_dotenv(override=True)
+    job_queue = JobQueue(args.queue)
+    worker = ProcessingWorker(build_coordinator(), job_queue, concurrency=args.concurrency, retention=args.retention)
+    print(f"Processing jobs from {args.queue} with concurrency {args.concurrency}")
+    asyncio.run(worker.run_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import time
+import numpy as np
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from src.models.validation_models import RecommendationSchema, RepaymentPredictorSchema
+
+STAGES = ("collection", "confirmation", "processing", "email")
+
+STATES = ["Lagos", "Kano", "Rivers", "Oyo", "Abuja", "Enugu", "Kaduna", "Delta", "Ogun", "Anambra"]
+GENDERS = ["male", "female"]
+MARITAL_STATUSES = ["single", "married", "divorced", "widowed"]
+GREETINGS = ["Hi, I'd like a loan", "Hello", "Good day, I want to apply for a loan", "I need some money"]
+AGE_TEMPLATES = ["I'm {age} years old", "I am {age}", "age {age}"]
+PROFILE_TEMPLATES = ["{gender}, {marital}", "I am a {marital} {gender}", "gender {gender} and I'm {marital}"]
+LOCATION_TEMPLATES = ["I live in {state}", "I'm from {state}", "located in {state}"]
+AMOUNT_TEMPLATES = ["I need a loan of {amount}", "I want to borrow ₦{amount_k}k", "amount {amount} naira"]
+TENURE_TEMPLATES = ["for {tenure} days", "tenure of {tenure} days", "I can repay over {months} months"]
+
+
+class LatencyModel:
+    """Log-normal latency per agent, parameterised by median (ms) and sigma."""
+
+    def __init__(self, default_median_ms: float = 800.0, sigma: float = 0.4,
+                 overrides: Optional[Dict[str, float]] = None, error_rate: float = 0.0):
+        self.default_median_ms = default_median_ms
+        self.sigma = sigma
+        self.overrides = overrides or {}
+        self.error_rate = error_rate
+
+    def sample(self, agent_name: str) -> float:
+        median = self.overrides.get(agent_name, self.default_median_ms)
+        return random.lognormvariate(np.log(median), self.sigma) / 1000
+
+
+class FakeRunner:
+    """Stand-in for agents.Runner that sleeps like a model and returns typed output."""
+
+    def __init__(self, latency_model: LatencyModel):
+        self.latency_model = latency_model
+        self.calls = defaultdict(int)
+
+    async def run(self, agent, agent_input):
+        self.calls[agent.name] += 1
+        await asyncio.sleep(self.latency_model.sample(agent.name))
+        if random.random() < self.latency_model.error_rate:
+            raise RuntimeError(f"Simulated model error from {agent.name}")
+        output_type = getattr(agent, "output_type", None)
+        if output_type is RepaymentPredictorSchema:
+            score = random.randint(20, 95)
+            risk = "high" if score <= 40 else "medium" if score <= 70 else "acceptable"
+            output = RepaymentPredictorSchema(repaymentProbabilityScore=score, riskLevel=risk)
+        elif output_type is RecommendationSchema:
+            output = RecommendationSchema(decision=random.choice(["approve", "reject", "conditional"]),
+                                          reasonCodes=["moderate_repayment_probability"])
+        else:
+            output = "Thanks, noted. Could you share the remaining details of your application?"
+        return SimpleNamespace(final_output=output)
+
+
+def build_script(rng: random.Random) -> List[Tuple[str, str]]:
+    values = {
+        "age": rng.randint(21, 65),
+        "gender": rng.choice(GENDERS),
+        "marital": rng.choice(MARITAL_STATUSES),
+        "state": rng.choice(STATES),
+        "amount_k": rng.randint(10, 900),
+    }
+    values["amount"] = f"{values['amount_k'] * 1000:,}"
+    values["months"] = rng.randint(1, 3)
+    values["tenure"] = rng.choice([14, 30, 45, 60, 90, 120])
+    parts = [
+        rng.choice(AGE_TEMPLATES),
+        rng.choice(PROFILE_TEMPLATES),
+        rng.choice(LOCATION_TEMPLATES),
+        rng.choice(AMOUNT_TEMPLATES),
+        rng.choice(TENURE_TEMPLATES),
+    ]
+    rng.shuffle(parts)
+    # Spread the details over one to four messages, like real applicants do.
+    cuts = sorted(rng.sample(range(1, len(parts)), rng.randint(0, 3)))
+    messages = [", ".join(parts[a:b]) for a, b in zip([0] + cuts, cuts + [len(parts)])]
+    script = [("collection", rng.choice(GREETINGS))]
+    script += [("collection", message.format(**values)) for message in messages]
+    if rng.random() < 0.1:
+        script += [("confirmation", "I want to change something"), ("collection", f"I'm {values['age'] + 1} years old")]
+    script.append(("processing", "yes, proceed"))
+    script.append(("email", f"applicant{rng.randint(1, 10**6)}@example.com"))
+    return script
+
+
+def current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is KiB on Linux; it is a peak, not current, value.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class LoadTest:
+    def __init__(self, send, users: int, think_time: float = 2.0, ramp_up: float = 5.0,
+                 iterations: int = 1, seed: Optional[int] = None, memory_interval: float = 1.0):
+        self.send = send
+        self.users = users
+        self.think_time = think_time
+        self.ramp_up = ramp_up
+        self.iterations = iterations
+        self.rng = random.Random(seed)
+        self.memory_interval = memory_interval
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.memory: List[Tuple[float, int]] = []
+        self.completed_applications = 0
+
+    async def applicant(self, user_id: int):
+        rng = random.Random(self.rng.random())
+        await asyncio.sleep(self.ramp_up * user_id / max(1, self.users))
+        for _ in range(self.iterations):
+            session = None
+            for stage, message in build_script(rng):
+                started = time.perf_counter()
+                try:
+                    session = await self.send(message, session)
+                except Exception:
+                    self.errors[stage] += 1
+                    break
+                finally:
+                    self.latencies[stage].append(time.perf_counter() - started)
+                await asyncio.sleep(rng.expovariate(1 / self.think_time) if self.think_time > 0 else 0)
+            else:
+                self.completed_applications += 1
+
+    async def sample_memory(self, started: float):
+        while True:
+            self.memory.append((time.perf_counter() - started, current_rss_bytes()))
+            await asyncio.sleep(self.memory_interval)
+
+    async def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        sampler = asyncio.create_task(self.sample_memory(started))
+        await asyncio.gather(*(self.applicant(i) for i in range(self.users)))
+        sampler.cancel()
+        self.memory.append((time.perf_counter() - started, current_rss_bytes()))
+        return self.report(time.perf_counter() - started)
+
+    def report(self, duration: float) -> Dict[str, Any]:
+        stages = {}
+        for stage in STAGES:
+            samples = np.array(self.latencies.get(stage, [])) * 1000
+            if not len(samples):
+                continue
+            stages[stage] = {
+                "turns": int(len(samples)),
+                "errors": self.errors[stage],
+                "error_rate": self.errors[stage] / len(samples),
+                "p50_ms": float(np.percentile(samples, 50)),
+                "p95_ms": float(np.percentile(samples, 95)),
+                "p99_ms": float(np.percentile(samples, 99)),
+            }
+        turns = sum(len(v) for v in self.latencies.values())
+        return {
+            "users": self.users,
+            "duration_s": duration,
+            "turns": turns,
+            "throughput_turns_per_s": turns / duration if duration else 0.0,
+            "completed_applications": self.completed_applications,
+            "applications_per_min": 60 * self.completed_applications / duration if duration else 0.0,
+            "error_rate": sum(self.errors.values()) / turns if turns else 0.0,
+            "stages": stages,
+            "rss_mb": [(round(t, 1), round(rss / 2**20, 1)) for t, rss in self.memory],
+        }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Users: {report['users']}  Duration: {report['duration_s']:.1f}s  Turns: {report['turns']}",
+        f"Throughput: {report['throughput_turns_per_s']:.2f} turns/s, {report['applications_per_min']:.1f} applications/min "
+        f"({report['completed_applications']} completed)",
+        f"Error rate: {report['error_rate']:.2%}",
+        "",
+        f"{'stage':<14}{'turns':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for stage, row in report["stages"].items():
+        lines.append(f"{stage:<14}{row['turns']:>8}{row['errors']:>8}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+    rss = [mb for _, mb in report["rss_mb"]]
+    if rss:
+        lines += ["", f"RSS MB: start {rss[0]}  peak {max(rss)}  end {rss[-1]}"]
+    return "\n".join(lines)
+
+
+def build_local_sender(args):
+    import spacy
+    from agents import set_tracing_disabled
+    from src.agents.coordinator import CoordinatorAgent
+    from src.agents.repayment_predictor import RepaymentPredictorAgent
+    from src.agents.recommendation import RecommendationAgent
+    from src.agents.emailer import EmailerAgent
+    from src.utils.nl_extractor import ApplicationExtractor
+
+    set_tracing_disabled(True)
+    overrides = {
+        "Repayment Probability Agent": args.predictor_median_ms,
+        "Loan Application Recommendation Agent": args.recommendation_median_ms,
+        "Email Manager": args.email_median_ms,
+    }
+    runner = FakeRunner(LatencyModel(args.llm_median_ms, args.llm_sigma, overrides, args.llm_error_rate))
+    coordinator = CoordinatorAgent(
+        RepaymentPredictorAgent("fake-model"),
+        RecommendationAgent(),
+        EmailerAgent("fake-google-key", "fake-groq-key"),
+        extractor=ApplicationExtractor(nlp=spacy.load(args.spacy_model)),
+        runner=runner,
+        orchestration=args.orchestration
+    )
+
+    async def send(message, session):
+        _, session = await coordinator.process(message, session)
+        return session
+    return send
+
+
+def build_http_sender(url: str):
+    from gradio_client import Client
+
+    async def send(message, session):
+        # Each simulated applicant keeps its own client, i.e. its own Gradio session.
+        if session is None:
+            session = {"client": await asyncio.to_thread(Client, url, verbose=False), "history": []}
+        _, session["history"], _ = await asyncio.to_thread(
+            session["client"].predict, message, session["history"], api_name="/chat"
+        )
+        return session
+    return send
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent loan applicants and report per-stage latency")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=1, help="Applications per simulated user")
+    parser.add_argument("--think-time", type=float, default=2.0, help="Mean seconds between messages")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds over which users start")
+    parser.add_argument("--url", default=None, help="Drive a running Gradio app instead of CoordinatorAgent")
+    parser.add_argument("--llm-median-ms", type=float, default=800.0)
+    parser.add_argument("--llm-sigma", type=float, default=0.4)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--predictor-median-ms", type=float, default=600.0)
+    parser.add_argument("--recommendation-median-ms", type=float, default=1200.0)
+    parser.add_argument("--email-median-ms", type=float, default=2500.0)
+    parser.add_argument("--spacy-model", default="en_core_web_sm")
+    parser.add_argument("--orchestration", default="state_machine", choices=["agents", "state_machine"])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", default=None, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    send = build_http_sender(args.url) if args.url else build_local_sender(args)
+    load_test = LoadTest(send, args.users, args.think_time, args.ramp_up, args.iterations, args.seed)
+    report = asyncio.run(load_test.run())
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
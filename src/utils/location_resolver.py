@@ -0,0 +1,145 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+NIGERIAN_STATES = (
+    "Abia", "Adamawa", "Akwa Ibom", "Anambra", "Bauchi", "Bayelsa", "Benue", "Borno",
+    "Cross River", "Delta", "Ebonyi", "Edo", "Ekiti", "Enugu", "Gombe", "Imo", "Jigawa",
+    "Kaduna", "Kano", "Katsina", "Kebbi", "Kogi", "Kwara", "Lagos", "Nasarawa", "Niger",
+    "Ogun", "Ondo", "Osun", "Oyo", "Plateau", "Rivers", "Sokoto", "Taraba", "Yobe",
+    "Zamfara", "FCT",
+)
+
+MAJOR_CITIES = {
+    "Abia": ["aba", "umuahia"],
+    "Adamawa": ["yola", "mubi"],
+    "Akwa Ibom": ["uyo", "eket", "ikot ekpene"],
+    "Anambra": ["awka", "onitsha", "nnewi"],
+    "Bauchi": ["azare"],
+    "Bayelsa": ["yenagoa"],
+    "Benue": ["makurdi", "gboko", "otukpo"],
+    "Borno": ["maiduguri"],
+    "Cross River": ["calabar", "ogoja"],
+    "Delta": ["asaba", "warri", "sapele", "ughelli"],
+    "Ebonyi": ["abakaliki"],
+    "Edo": ["benin city", "benin", "auchi", "ekpoma"],
+    "Ekiti": ["ado ekiti"],
+    "Enugu": ["nsukka"],
+    "Gombe": [],
+    "Imo": ["owerri", "orlu", "okigwe"],
+    "Jigawa": ["dutse", "hadejia"],
+    "Kaduna": ["zaria", "kafanchan"],
+    "Kano": [],
+    "Katsina": ["funtua", "daura"],
+    "Kebbi": ["birnin kebbi", "argungu"],
+    "Kogi": ["lokoja", "okene"],
+    "Kwara": ["ilorin", "offa"],
+    "Lagos": ["ikeja", "lekki", "ikorodu", "epe", "badagry", "surulere", "yaba", "victoria island", "ajah", "festac"],
+    "Nasarawa": ["lafia", "keffi"],
+    "Niger": ["minna", "bida", "suleja"],
+    "Ogun": ["abeokuta", "ota", "sagamu", "ijebu ode"],
+    "Ondo": ["akure", "owo", "ondo city"],
+    "Osun": ["osogbo", "ile ife", "ilesa", "ede"],
+    "Oyo": ["ibadan", "ogbomosho", "oyo town", "iseyin"],
+    "Plateau": ["jos"],
+    "Rivers": ["port harcourt", "bonny", "obio akpor"],
+    "Sokoto": [],
+    "Taraba": ["jalingo", "wukari"],
+    "Yobe": ["damaturu", "potiskum"],
+    "Zamfara": ["gusau"],
+    "FCT": ["abuja", "garki", "wuse", "maitama", "gwagwalada", "kubwa", "lugbe"],
+}
+
+ALIASES = {
+    "abj": "FCT",
+    "federal capital territory": "FCT",
+    "ph": "Rivers",
+    "phc": "Rivers",
+    "portharcourt": "Rivers",
+    "lasgidi": "Lagos",
+    "eko": "Lagos",
+    "akwaibom": "Akwa Ibom",
+    "crossriver": "Cross River",
+    "nassarawa": "Nasarawa",
+}
+
+# The country and its demonyms are never a state, but are one letter off "Niger".
+NON_LOCATIONS = frozenset({"nigeria", "nigerian", "nigerians", "naija"})
+
+
+def normalize_location(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LocationResolver:
+    """Maps free-text places (misspelt states, cities, aliases) to a Nigerian state.
+
+    Every known name is indexed once by its character trigrams; a lookup only
+    scores the names that share at least one trigram with the input, using the
+    Dice coefficient as the similarity.
+    """
+
+    def __init__(self, min_score: float = 0.6, min_fuzzy_length: int = 4):
+        self.min_score = min_score
+        self.min_fuzzy_length = min_fuzzy_length
+        self.states = frozenset(NIGERIAN_STATES)
+        self._names: Dict[str, str] = {}
+        for state in NIGERIAN_STATES:
+            self._names[normalize_location(state)] = state
+            for city in MAJOR_CITIES.get(state, []):
+                self._names.setdefault(normalize_location(city), state)
+        for alias, state in ALIASES.items():
+            self._names.setdefault(normalize_location(alias), state)
+
+        self._entries: List[Tuple[str, str, int]] = []
+        self._index: Dict[str, List[int]] = defaultdict(list)
+        for name, state in self._names.items():
+            grams = _trigrams(name)
+            entry_id = len(self._entries)
+            self._entries.append((name, state, len(grams)))
+            for gram in grams:
+                self._index[gram].append(entry_id)
+
+    def lookup(self, text: str) -> Optional[str]:
+        return self._names.get(normalize_location(text))
+
+    def resolve(self, text: str) -> Optional[Tuple[str, float]]:
+        name = " ".join(word for word in normalize_location(text).split() if word not in NON_LOCATIONS)
+        if not name:
+            return None
+        exact = self._names.get(name)
+        if exact:
+            return exact, 1.0
+        if len(name.replace(" ", "")) < self.min_fuzzy_length:
+            return None
+        grams = _trigrams(name)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for entry_id in self._index.get(gram, ()):
+                shared[entry_id] += 1
+        best_state, best_score = None, 0.0
+        for entry_id, overlap in shared.items():
+            _, state, size = self._entries[entry_id]
+            score = 2.0 * overlap / (len(grams) + size)
+            if score > best_score:
+                best_state, best_score = state, score
+        if best_score >= self.min_score:
+            return best_state, best_score
+        return None
+
+    def resolve_phrase(self, text: str, max_words: int = 3) -> Optional[Tuple[str, float]]:
+        words = [word for word in normalize_location(text).split() if word not in NON_LOCATIONS]
+        best = None
+        for size in range(min(max_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                match = self.resolve(" ".join(words[start:start + size]))
+                if match and (best is None or match[1] > best[1]):
+                    best = match
+                    if match[1] == 1.0:
+                        return best
+        return best
@@ -0,0 +1,73 @@
+import gc
+import os
+import subprocess
+import threading
+import spacy
+from openai import AsyncOpenAI
+from typing import Optional
+from src.utils.http_clients import ClientFactory
+
+
+class ModelRegistry:
+    """Process-wide holder for heavyweight objects shared by every agent.
+
+    The spaCy pipeline and the ApplicationExtractor are read-only once built, so
+    a single instance serves all coordinators and sessions. Calling preload()
+    in the parent before workers fork lets the children share those pages
+    copy-on-write. HTTP clients come from a shared ClientFactory; they are not
+    fork-safe and are dropped in the child.
+    """
+
+    def __init__(self, spacy_model: str = "en_core_web_sm"):
+        self.spacy_model = spacy_model
+        self._lock = threading.RLock()
+        self._nlp = None
+        self._extractor = None
+        self.clients = ClientFactory()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+
+    def get_nlp(self):
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None:
+                    self._nlp = self._load_spacy()
+        return self._nlp
+
+    def get_extractor(self):
+        if self._extractor is None:
+            with self._lock:
+                if self._extractor is None:
+                    from src.utils.nl_extractor import ApplicationExtractor
+                    self._extractor = ApplicationExtractor(nlp=self.get_nlp())
+        return self._extractor
+
+    def configure_http_clients(self, **options):
+        # Only affects clients created afterwards, so call it before building agents.
+        with self._lock:
+            self.clients = ClientFactory(**options)
+
+    def get_openai_client(self, base_url: Optional[str] = None, api_key: Optional[str] = None) -> AsyncOpenAI:
+        return self.clients.get_openai_client(base_url=base_url, api_key=api_key)
+
+    def preload(self, freeze: bool = True):
+        self.get_extractor()
+        if freeze and hasattr(gc, "freeze"):
+            # Move everything loaded so far into the permanent generation so the
+            # child's collector does not touch (and un-share) those pages.
+            gc.collect()
+            gc.freeze()
+
+    def _load_spacy(self):
+        try:
+            return spacy.load(self.spacy_model)
+        except OSError:
+            subprocess.call(["python", "-m", "spacy", "download", self.spacy_model])
+            return spacy.load(self.spacy_model)
+
+    def _after_fork_in_child(self):
+        self._lock = threading.RLock()
+        self.clients = self.clients.fresh()
+
+
+registry = ModelRegistry()
@@ -1,22 +1,22 @@
 import re
-import spacy
-from word2number import w2n
 from typing import Dict, Any, Set, Optional, Tuple
-import subprocess
+from src.utils.model_registry import registry
+from src.utils.location_resolver import LocationResolver
+from src.utils.numeric_mentions import NumericMentionParser
+from src.utils.profiler import profiler
+
+NUMERIC_FIELDS = ("age", "amount", "tenure")
 
 class ApplicationExtractor:
-    def __init__(self):
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            subprocess.call(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, nlp=None):
+        if nlp is None:
+            nlp = registry.get_nlp()
+        self.nlp = nlp
+        self.location_resolver = LocationResolver()
+        self.numeric_parser = NumericMentionParser()
 
+        # Age, amount and tenure come from NumericMentionParser in a single pass.
         self.patterns = {
-            "age": [
-                r"\b(?:I am|I'm|my age is|aged?)\s*(\d{1,2})\b",
-                r"\b(\d{1,2})\s*(?:years old|year old|years|year)\b"
-            ],
             "gender": [
                 r"\b(?:I am|I'm|my gender is|gender:?)\s*(male|female|other)\b",
                 r"\b(male|female|other)\b"
@@ -26,25 +26,16 @@ class ApplicationExtractor:
                 r"\b(single|married|divorced|widowed)\b"
             ],
             "location": [
-                r"\b(?:I live in|I am from|I'm from|I reside in|located in|city:?)\s*([A-Za-z\s]+(?:City)?)\b",
-                r"\bin\s+([A-Za-z\s]+(?:City)?)\b"
-            ],
-            "amount": [
-                r"\$\s*([\d,]+(?:\.\d+)?)",
-                r"(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:dollars|USD|\$)",
-                r"(?:loan|borrow|amount)(?:\s+of)?\s*\$?\s*([\d,]+(?:\.\d+)?)",
-                r"(?:loan|borrow|amount)(?:\s+of)?\s*([\d,]+(?:\.\d+)?)\s*(?:dollars|USD|\$)"
-            ],
-            "tenure": [
-                r"(\d+)\s*(?:day|days)",
-                r"(\d+)\s*(?:month|months)",
-                r"(\d+)\s*(?:year|years)",
-                r"(?:term|tenure|period)(?:\s+of)?\s*(\d+)\s*(?:day|days)",
-                r"(?:term|tenure|period)(?:\s+of)?\s*(\d+)\s*(?:month|months)",
-                r"(?:term|tenure|period)(?:\s+of)?\s*(\d+)\s*(?:year|years)"
+                r"\b(?:I live in|I am from|I'm from|I reside in|located in|city:?)\s*([A-Za-z\s-]+(?:City)?)\b",
+                r"\bin\s+([A-Za-z\s-]+(?:City)?)\b"
             ]
         }
 
+        self.compiled_patterns = {
+            field: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for field, patterns in self.patterns.items()
+        }
+
         self.entity_map = {
             "AGE": "age",
             "CARDINAL": ["age", "amount", "tenure"],
@@ -68,20 +59,16 @@ class ApplicationExtractor:
             "age": lambda x: isinstance(x, (int, float)) and 18 < x < 100,
             "gender": lambda x: x.lower() in ["male", "female", "other"],
             "marital_status": lambda x: x.lower() in ["single", "married", "divorced", "widowed"],
-            "location": lambda x: x.lower() in ["abia", "adamawa", "akwa ibom", "anambra", "bauchi", "bayelsa", "benue", 
-                "borno", "cross river", "delta", "ebonyi", "edo", "ekiti", "enugu", 
-                "gombe", "imo", "jigawa", "kaduna", "kano", "katsina", "kebbi", "kogi", 
-                "kwara", "lagos", "nasarawa", "niger", "ogun", "ondo", "osun", "oyo", 
-                "plateau", "rivers", "sokoto", "taraba", "yobe", "zamfara", "fct", "abuja"],
+            "location": lambda x: x in self.location_resolver.states,
             "amount": lambda x: isinstance(x, (int, float)) and 0 < x <= 1000000,
-            "tenure": lambda x: isinstance(x, (int, float)) and 0 < x <= 120
+            "tenure": lambda x: isinstance(x, (int, float)) and 6 < x <= 180
         }
 
         self.normalizers = {
             "age": lambda x: int(x),
             "gender": lambda x: x.lower(),
             "marital_status": lambda x: x.lower(),
-            "location": lambda x: x.strip().title(),
+            "location": lambda x: x.strip(),
             "amount": lambda x: float(str(x).replace(",", "")),
             "tenure": lambda x: int(x)
         }
@@ -90,8 +77,8 @@ class ApplicationExtractor:
         return re.sub(r'\s+', ' ', text).strip()
 
     def _extract_with_patterns(self, field: str, text: str) -> Optional[str]:
-        for pattern in self.patterns[field]:
-            matches = re.search(pattern, text, re.IGNORECASE)
+        for pattern in self.compiled_patterns[field]:
+            matches = pattern.search(text)
             if matches:
                 return matches.group(1).strip()
         return None
@@ -140,56 +127,62 @@ class ApplicationExtractor:
                             return nearby.text
                         elif field == "marital_status" and nearby.text.lower() in ["single", "married", "divorced", "widowed"]:
                             return nearby.text
-                        elif field == "location" and nearby.text.lower() in ["abia", "adamawa", "akwa ibom", "anambra", "bauchi", "bayelsa", "benue", 
-                            "borno", "cross river", "delta", "ebonyi", "edo", "ekiti", "enugu", 
-                            "gombe", "imo", "jigawa", "kaduna", "kano", "katsina", "kebbi", "kogi", 
-                            "kwara", "lagos", "nasarawa", "niger", "ogun", "ondo", "osun", "oyo", 
-                            "plateau", "rivers", "sokoto", "taraba", "yobe", "zamfara", "fct"]:
+                        elif field == "location" and self.location_resolver.lookup(nearby.text):
                             return nearby.text
             if field == "location" and i > 0 and doc[i-1].text.lower() == "in" and token.pos_ == "PROPN":
                 return token.text
         return None
 
+    def _resolve_candidate(self, field: str, value: Optional[str]) -> Optional[Tuple[Any, float]]:
+        if not value:
+            return None
+        if field == "location":
+            return self.location_resolver.resolve_phrase(value)
+        return value, 1.0
+
     def extract_all_fields(self, text: str, fields_to_extract: Set[str], current_data: Dict[str, Any] = None) -> Dict[str, Tuple[Any, float]]:
+        with profiler.section("extraction"):
+            return self._extract_all_fields(text, fields_to_extract, current_data)
+
+    def _extract_all_fields(self, text: str, fields_to_extract: Set[str], current_data: Dict[str, Any] = None) -> Dict[str, Tuple[Any, float]]:
         if current_data is None:
             current_data = {}
         text = self._clean_text(text)
-        doc = self.nlp(text)
+        doc = None
+        numeric = None
         results = {}
         for field in fields_to_extract:
-            if field not in self.patterns:
+            if field not in self.validators:
                 continue
             value = None
             confidence = 0.0
-            pattern_value = self._extract_with_patterns(field, text)
-            if pattern_value:
-                value = pattern_value
-                confidence = 0.8
-            if not value:
-                nlp_value = self._extract_with_nlp(field, doc)
-                if nlp_value:
-                    value = nlp_value
-                    confidence = 0.7
-            if not value:
-                context_value = self._extract_with_context(field, doc)
-                if context_value:
-                    value = context_value
-                    confidence = 0.6
+            if field in NUMERIC_FIELDS:
+                if numeric is None:
+                    numeric = self.numeric_parser.assign(text)
+                if field in numeric:
+                    value, confidence = numeric[field]
+            else:
+                pattern_value = self._resolve_candidate(field, self._extract_with_patterns(field, text))
+                if pattern_value:
+                    value, similarity = pattern_value
+                    confidence = 0.8 * similarity
+                if not value:
+                    if doc is None:
+                        doc = self.nlp(text)
+                    nlp_value = self._resolve_candidate(field, self._extract_with_nlp(field, doc))
+                    if nlp_value:
+                        value, similarity = nlp_value
+                        confidence = 0.7 * similarity
+                if not value:
+                    context_value = self._resolve_candidate(field, self._extract_with_context(field, doc))
+                    if context_value:
+                        value, similarity = context_value
+                        confidence = 0.6 * similarity
             if value:
                 try:
-                    if field == "amount" and isinstance(value, str):
-                        value = value.replace("$", "").replace(",", "")
-                    if field in ["age", "amount", "tenure"] and isinstance(value, str):
-                        try:
-                            float(value)
-                        except ValueError:
-                            try:
-                                value = str(w2n.word_to_num(value))
-                            except:
-                                pass
                     normalized_value = self.normalizers[field](value)
                     if self.validators[field](normalized_value):
                         results[field] = (normalized_value, confidence)
                 except (ValueError, TypeError):
                     pass
-        return results
\ No newline at end of file
+        return results
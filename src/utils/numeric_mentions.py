@@ -0,0 +1,188 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(
+    r"(?P<currency>₦|NGN\b|N(?=\s?\d)|\$)"
+    r"|(?P<number>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)(?:(?P<suffix>k|mn|m|bn)(?![A-Za-z]))?"
+    r"|(?P<word>[A-Za-z]+(?:['’][A-Za-z]+)?)",
+    re.IGNORECASE
+)
+
+NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60,
+    "seventy": 70, "eighty": 80, "ninety": 90,
+}
+SCALE_WORDS = {"hundred": 100, "thousand": 1000, "million": 1000000, "billion": 1000000000}
+SUFFIX_SCALES = {"k": 1000, "m": 1000000, "mn": 1000000, "bn": 1000000000}
+
+MONEY_WORDS = {"naira", "ngn", "dollars", "dollar", "usd"}
+DURATION_UNITS = {
+    "day": 1, "days": 1,
+    "week": 7, "weeks": 7,
+    "month": 30, "months": 30, "mth": 30, "mths": 30,
+    "year": 365, "years": 365, "yr": 365, "yrs": 365,
+}
+
+AGE_KEYWORDS = {"age", "aged", "old"}
+# Same bounds as LoanApplicationValidator.age; "one" or "5 years old" is never the applicant's age.
+MIN_AGE, MAX_AGE = 18, 100
+SELF_KEYWORDS = {"i'm", "i’m", "im", "am"}
+AMOUNT_KEYWORDS = {"loan", "borrow", "amount", "need", "naira", "money", "credit", "request", "fund", "funds"}
+TENURE_KEYWORDS = {"tenure", "tenor", "term", "period", "duration", "repay", "repayment", "for", "over", "within"}
+
+KEYWORD_WINDOW = 4
+
+
+class NumericMention(NamedTuple):
+    value: float
+    unit: Optional[str]
+    start: int
+    end: int
+    before: Tuple[str, ...]
+    after: Tuple[str, ...]
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        return self.before + self.after
+
+
+class NumericMentionParser:
+    """Finds every numeric mention in a message with one tokenizer pass.
+
+    Digits (with thousands separators and k/m suffixes), Naira/dollar markers
+    and English number words are all recognised in the same scan, together
+    with the unit that follows and the words around the number. ``assign``
+    then decides which mention is the age, the amount and the tenure.
+    """
+
+    def tokenize(self, text: str) -> List[Tuple[str, str, int, int, Optional[str]]]:
+        tokens = []
+        for match in TOKEN_PATTERN.finditer(text):
+            if match.group("currency"):
+                tokens.append(("currency", match.group("currency"), match.start(), match.end(), None))
+            elif match.group("number"):
+                tokens.append(("number", match.group("number"), match.start(), match.end(), match.group("suffix")))
+            else:
+                tokens.append(("word", match.group("word").lower(), match.start(), match.end(), None))
+        return tokens
+
+    def parse(self, text: str) -> List[NumericMention]:
+        tokens = self.tokenize(text)
+        mentions = []
+        i = 0
+        while i < len(tokens):
+            kind, token_text, start, end, suffix = tokens[i]
+            value = None
+            first = i
+            if kind == "number":
+                value = float(token_text.replace(",", ""))
+                if suffix:
+                    value *= SUFFIX_SCALES[suffix.lower()]
+                i += 1
+                if i < len(tokens) and tokens[i][0] == "word" and tokens[i][1] in SCALE_WORDS:
+                    value *= SCALE_WORDS[tokens[i][1]]
+                    i += 1
+            elif kind == "word" and self._starts_number_words(tokens, i):
+                value, i = self._parse_number_words(tokens, i)
+            else:
+                i += 1
+                continue
+
+            unit = None
+            if first > 0 and tokens[first - 1][0] == "currency":
+                unit = "money"
+            if i < len(tokens) and tokens[i][0] == "word":
+                following = tokens[i][1]
+                after = tokens[i + 1][1] if i + 1 < len(tokens) and tokens[i + 1][0] == "word" else None
+                if following in MONEY_WORDS:
+                    unit = "money"
+                elif following in DURATION_UNITS:
+                    if following.startswith(("year", "yr")) and after in ("old", "of"):
+                        unit = "age"
+                    else:
+                        unit = following
+            before = tuple(token[1] for token in tokens[max(0, first - KEYWORD_WINDOW):first] if token[0] == "word")
+            after = tuple(token[1] for token in tokens[i:i + 2] if token[0] == "word")
+            mentions.append(NumericMention(value, unit, start, tokens[i - 1][3], before, after))
+        return mentions
+
+    def _starts_number_words(self, tokens, i: int) -> bool:
+        word = tokens[i][1]
+        if word in NUMBER_WORDS:
+            return True
+        # "a hundred", "a thousand" ...
+        return word == "a" and i + 1 < len(tokens) and tokens[i + 1][1] in SCALE_WORDS
+
+    def _parse_number_words(self, tokens, i: int) -> Tuple[float, int]:
+        total = 0
+        current = 0
+        while i < len(tokens) and tokens[i][0] == "word":
+            word = tokens[i][1]
+            if word in NUMBER_WORDS:
+                current += NUMBER_WORDS[word]
+            elif word in SCALE_WORDS:
+                scale = SCALE_WORDS[word]
+                current = max(current, 1)
+                if scale == 100:
+                    current *= scale
+                else:
+                    total += current * scale
+                    current = 0
+            elif word == "a" and i + 1 < len(tokens) and tokens[i + 1][1] in SCALE_WORDS:
+                current += 1
+            elif word == "and" and i + 1 < len(tokens) and tokens[i + 1][1] in NUMBER_WORDS:
+                pass
+            else:
+                break
+            i += 1
+        return float(total + current), i
+
+    def assign(self, text: str) -> Dict[str, Tuple[float, float]]:
+        mentions = self.parse(text)
+        taken = set()
+        results = {}
+
+        def take(field, index, value, confidence):
+            taken.add(index)
+            results[field] = (value, confidence)
+
+        free = lambda: [(i, m) for i, m in enumerate(mentions) if i not in taken]
+
+        plausible_age = lambda m: MIN_AGE < m.value < MAX_AGE
+        age = next(((i, m) for i, m in free() if m.unit == "age" and plausible_age(m)), None)
+        if age:
+            take("age", age[0], age[1].value, 0.8)
+        else:
+            age = next(((i, m) for i, m in free() if m.unit is None and plausible_age(m) and (
+                AGE_KEYWORDS.intersection(m.keywords) or (m.before and m.before[-1] in SELF_KEYWORDS)
+            )), None)
+            if age:
+                take("age", age[0], age[1].value, 0.7)
+
+        durations = [(i, m) for i, m in free() if m.unit in DURATION_UNITS]
+        if durations:
+            preferred = [(i, m) for i, m in durations if TENURE_KEYWORDS.intersection(m.before)]
+            i, m = (preferred or durations)[0]
+            take("tenure", i, m.value * DURATION_UNITS[m.unit], 0.8)
+        else:
+            tenure = next(((i, m) for i, m in free() if m.unit is None and
+                           TENURE_KEYWORDS.difference({"for", "over", "within"}).intersection(m.before)), None)
+            if tenure:
+                take("tenure", tenure[0], tenure[1].value, 0.7)
+
+        money = next(((i, m) for i, m in free() if m.unit == "money"), None)
+        if money:
+            take("amount", money[0], money[1].value, 0.8)
+        else:
+            amount = next(((i, m) for i, m in free() if m.unit is None and AMOUNT_KEYWORDS.intersection(m.before)), None)
+            if amount:
+                take("amount", amount[0], amount[1].value, 0.7)
+            else:
+                bare = [(i, m) for i, m in free() if m.unit is None and m.value >= 1000]
+                if bare:
+                    i, m = max(bare, key=lambda item: item[1].value)
+                    take("amount", i, m.value, 0.6)
+        return results
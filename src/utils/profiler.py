@@ -0,0 +1,169 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+_OFF = nullcontext()
+_LABELS: ContextVar[Tuple[str, ...]] = ContextVar("profiler_labels", default=())
+
+
+class SamplingProfiler:
+    """Opt-in stack sampler for the next N chat turns.
+
+    While armed, a daemon thread snapshots ``sys._current_frames()`` every
+    ``interval`` seconds for the threads currently inside a ``turn`` or
+    ``section`` and counts each stack, prefixed by its labels. When the last
+    armed turn finishes, the counts are written as collapsed stacks (one file
+    per top-level label) that flamegraph.pl or speedscope read directly.
+
+    When it is not armed, ``turn`` and ``section`` return a shared no-op context
+    manager after a single integer check.
+
+    Labels live in a context variable, so concurrent asyncio turns on the loop
+    thread (and ``asyncio.to_thread`` work they start) keep their own. A
+    sample taken on the loop thread is credited to the tracked task whose
+    coroutine frame is on the sampled stack, and dropped if none is.
+    """
+
+    def __init__(self, output_dir: str = "profiles", interval: float = 0.005):
+        self.output_dir = output_dir
+        self.interval = interval
+        self._remaining = 0
+        self._active = 0
+        self._labels: Dict[Tuple[int, Optional[asyncio.Task]], List[Tuple[str, ...]]] = {}
+        self._samples: Dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_files: List[str] = []
+
+    @property
+    def armed(self) -> bool:
+        return self._remaining > 0 or self._active > 0
+
+    def arm(self, turns: int, output_dir: Optional[str] = None):
+        with self._lock:
+            if output_dir:
+                self.output_dir = output_dir
+            self._remaining = max(0, int(turns))
+            if self._remaining and self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+                self._thread.start()
+
+    def turn(self, stage: str):
+        if not self._remaining:
+            return _OFF
+        return self._track(stage, counts_turn=True)
+
+    def section(self, name: str):
+        if not self._remaining and not self._active:
+            return _OFF
+        return self._track(name, counts_turn=False)
+
+    @contextmanager
+    def _track(self, label: str, counts_turn: bool):
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = (threading.get_ident(), task)
+        labels = _LABELS.get() + (label,)
+        token = _LABELS.set(labels)
+        with self._lock:
+            if counts_turn:
+                self._remaining -= 1
+                self._active += 1
+            self._labels.setdefault(key, []).append(labels)
+        try:
+            yield
+        finally:
+            _LABELS.reset(token)
+            with self._lock:
+                stack = self._labels[key]
+                stack.remove(labels)
+                if not stack:
+                    del self._labels[key]
+                finished = False
+                if counts_turn:
+                    self._active -= 1
+                    finished = self._remaining <= 0 and self._active == 0
+            if finished:
+                self.stop()
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                tracked = [(key, stack[-1]) for key, stack in self._labels.items() if key[0] != own]
+            by_thread: Dict[int, list] = defaultdict(list)
+            for (ident, task), labels in tracked:
+                by_thread[ident].append((task, labels))
+            for ident, entries in by_thread.items():
+                frame = frames.get(ident)
+                chain = []
+                while frame is not None:
+                    chain.append(frame)
+                    frame = frame.f_back
+                labels = self._attribute(chain, entries)
+                if not labels or not chain:
+                    continue
+                stack = [
+                    f"{f.f_code.co_name} ({os.path.basename(f.f_code.co_filename)}:{f.f_code.co_firstlineno})"
+                    for f in reversed(chain)
+                ]
+                self._samples[labels[0]][";".join(list(labels) + stack)] += 1
+
+    @staticmethod
+    def _attribute(chain: list, entries: list) -> Optional[Tuple[str, ...]]:
+        """Labels of the tracked task running in ``chain``, else of plain thread work."""
+        on_stack = {id(frame) for frame in chain}
+        fallback = None
+        for task, labels in entries:
+            if task is None:
+                fallback = labels
+                continue
+            coro = task.get_coro()
+            frame = getattr(coro, "cr_frame", None)
+            if frame is not None and id(frame) in on_stack:
+                return labels
+        return fallback
+
+    def stop(self) -> List[str]:
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._remaining = 0
+        if thread is None:
+            return []
+        self._stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+        self.last_files = self.flush()
+        return self.last_files
+
+    def flush(self) -> List[str]:
+        samples, self._samples = self._samples, defaultdict(Counter)
+        if not samples:
+            return []
+        files = []
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            for label, counts in samples.items():
+                path = os.path.join(self.output_dir, f"{label}-{stamp}.collapsed")
+                with open(path, "w", encoding="utf-8") as f:
+                    for stack, count in counts.most_common():
+                        f.write(f"{stack} {count}\n")
+                files.append(path)
+        except OSError as e:
+            print(f'Error writing profile: {str(e)}')
+        return files
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import re
+import time
+import httpx
+from typing import Any, Dict, Optional
+
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+DEFAULT_COMPLETION_TOKENS = 256
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parses rate-limit reset values such as '1s', '6m0s' or '20ms' into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def estimate_tokens(request: httpx.Request) -> int:
+    try:
+        body = json.loads(request.content or b"{}")
+    except (ValueError, httpx.RequestNotRead):
+        return DEFAULT_COMPLETION_TOKENS
+    if not isinstance(body, dict):
+        return DEFAULT_COMPLETION_TOKENS
+    # ~4 characters per token for the prompt, plus the completion budget.
+    prompt_chars = len(json.dumps(body.get("messages", body.get("input", ""))))
+    completion = body.get("max_completion_tokens") or body.get("max_tokens") or body.get("max_output_tokens")
+    return prompt_chars // 4 + int(completion or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """Per-minute budget refilled continuously; callers wait in FIFO order."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self.tokens -= amount
+        return waited
+
+    def sync(self, limit: Optional[float], remaining: Optional[float]):
+        self._refill()
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            # The provider's view wins when it has less headroom than we think.
+            self.tokens = min(self.tokens, float(remaining))
+
+
+class ProviderLimiter:
+    """Requests-per-minute and tokens-per-minute buckets plus an AIMD concurrency limit.
+
+    Each success raises the concurrency limit by ``1/limit``; a 429 halves it
+    and holds every new request back until the provider's retry-after has
+    passed. Rate-limit headers on every response resynchronise both buckets.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, max_concurrency: int = 32,
+                 min_concurrency: int = 1, initial_concurrency: Optional[int] = None):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(initial_concurrency or max(min_concurrency, max_concurrency // 4))
+        self.active = 0
+        self.waiting = 0
+        self.throttled = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, tokens: int):
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            await self.requests.acquire(1)
+            await self.tokens.acquire(tokens)
+            async with self._condition:
+                await self._condition.wait_for(lambda: self.active < int(self.concurrency))
+                self.active += 1
+        finally:
+            self.waiting -= 1
+            self.total_wait += time.monotonic() - started
+
+    async def release(self, status_code: Optional[int], headers: Optional[httpx.Headers] = None):
+        if headers is not None:
+            self.requests.sync(_number(headers.get("x-ratelimit-limit-requests")),
+                               _number(headers.get("x-ratelimit-remaining-requests")))
+            self.tokens.sync(_number(headers.get("x-ratelimit-limit-tokens")),
+                             _number(headers.get("x-ratelimit-remaining-tokens")))
+        if status_code == 429:
+            self.throttled += 1
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            retry_after = None
+            if headers is not None:
+                retry_after = _number(headers.get("retry-after-ms"))
+                retry_after = retry_after / 1000 if retry_after is not None else parse_duration(headers.get("retry-after"))
+            self._paused_until = max(self._paused_until, time.monotonic() + (retry_after or 1.0))
+        elif status_code is not None and status_code < 400:
+            self.completed += 1
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        self.requests._refill()
+        self.tokens._refill()
+        return {
+            "concurrency_limit": round(self.concurrency, 2),
+            "active": self.active,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "throttled": self.throttled,
+            "requests_available": round(self.requests.tokens, 1),
+            "tokens_available": round(self.tokens.tokens),
+            "avg_wait_ms": 1000 * self.total_wait / max(1, self.completed + self.throttled),
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that hands the concurrency slot back once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                await release()
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that admits each request through a ProviderLimiter.
+
+    The concurrency slot is held until the response body is closed, so a
+    streamed completion counts against the limit for as long as it is read.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: ProviderLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire(estimate_tokens(request))
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            await self.limiter.release(None)
+            raise
+        if response.is_closed:
+            # The body was read in full already (e.g. a buffered response); nothing is left to stream.
+            await self.limiter.release(response.status_code, response.headers)
+            return response
+        status_code, headers = response.status_code, response.headers
+        response.stream = _ReleasingStream(response.stream, lambda: self.limiter.release(status_code, headers))
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,67 @@
+from typing import Any, Dict, Optional
+from src.models.validation_models import LoanDecision, ReasonCode, RecommendationSchema
+
+DECISION_HEADLINES = {
+    LoanDecision.APPROVE: "Your loan application is recommended for approval.",
+    LoanDecision.REJECT: "Unfortunately, your loan application is not recommended for approval at this time.",
+    LoanDecision.CONDITIONAL: "Your loan application is recommended for conditional approval.",
+}
+
+REASON_TEXT = {
+    ReasonCode.HIGH_REPAYMENT_PROBABILITY: "Your profile shows a high probability of repayment.",
+    ReasonCode.MODERATE_REPAYMENT_PROBABILITY: "Your profile shows a moderate probability of repayment.",
+    ReasonCode.LOW_REPAYMENT_PROBABILITY: "Your profile shows a low probability of repayment.",
+    ReasonCode.AMOUNT_TOO_HIGH: "The requested amount is high relative to your risk profile.",
+    ReasonCode.TENURE_TOO_LONG: "The requested tenure is longer than we can offer for this profile.",
+    ReasonCode.TENURE_TOO_SHORT: "The requested tenure is too short to repay the amount comfortably.",
+    ReasonCode.AGE_RISK: "Your age band carries additional repayment risk.",
+    ReasonCode.STABLE_PROFILE: "Your personal profile indicates stability.",
+    ReasonCode.REDUCED_AMOUNT: "We can offer a reduced loan amount.",
+    ReasonCode.REDUCED_TENURE: "We can offer a shorter loan tenure.",
+}
+
+
+class RecommendationRenderer:
+    def render_prediction(self, prediction: Any) -> str:
+        if prediction is None:
+            return "Not required: decided by our lending policy."
+        score = getattr(prediction, "repaymentProbabilityScore", None)
+        if score is None:
+            return str(prediction)
+        return f"Repayment probability score: {score}/99 (risk level: {prediction.riskLevel})"
+
+    def _terms(self, recommendation: RecommendationSchema, application_data: Dict[str, Any]) -> str:
+        amount = recommendation.approvedAmount or application_data.get("amount")
+        tenure = recommendation.approvedTenure or application_data.get("tenure")
+        if recommendation.decision == LoanDecision.REJECT or amount is None:
+            return ""
+        return f"₦{amount:,.0f} over {tenure} days"
+
+    def _reasons(self, recommendation: RecommendationSchema):
+        return [REASON_TEXT.get(code, str(code)) for code in recommendation.reasonCodes]
+
+    def render_chat(self, recommendation: Any, application_data: Dict[str, Any], explanation: Optional[str] = None) -> str:
+        if not isinstance(recommendation, RecommendationSchema):
+            return str(recommendation)
+        lines = [DECISION_HEADLINES[recommendation.decision]]
+        if explanation:
+            lines.append(explanation)
+        terms = self._terms(recommendation, application_data)
+        if terms:
+            lines.append(f"Approved terms: {terms}")
+        lines.extend(f"- {reason}" for reason in self._reasons(recommendation))
+        return "\n".join(lines)
+
+    def render_email(self, recommendation: Any, application_data: Dict[str, Any], explanation: Optional[str] = None) -> str:
+        if not isinstance(recommendation, RecommendationSchema):
+            return str(recommendation)
+        sections = [f"**Decision**: {recommendation.decision.value.title()}", DECISION_HEADLINES[recommendation.decision]]
+        if explanation:
+            sections.append(explanation)
+        terms = self._terms(recommendation, application_data)
+        if terms:
+            sections.append(f"**Approved Terms**: {terms}")
+        reasons = self._reasons(recommendation)
+        if reasons:
+            sections.append("**Reasons**:\n" + "\n".join(f"- {reason}" for reason in reasons))
+        return "\n\n".join(sections)
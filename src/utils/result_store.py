@@ -0,0 +1,106 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT,
+    email_recipient TEXT,
+    email_status TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+EMAIL_PENDING = "pending"
+
+
+def _to_jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return value
+
+
+def idempotency_key(client_id: str, application) -> str:
+    """Same browser and same validated application give the same key, across page reloads."""
+    payload = {"client_id": client_id, "application": _to_jsonable(application)}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """Persisted per-application stage results, keyed by idempotency key.
+
+    The processing result is stored once; later confirms or retries for the
+    same key read it back instead of calling the models again. Email sends
+    are claimed atomically, so a second send attempt for the same key sees the
+    first one's status instead of sending again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self.hits = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, email_recipient, email_status FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        result, recipient, status = row
+        return {"result": json.loads(result) if result else None, "email_recipient": recipient, "email_status": status}
+
+    def get_result(self, key: str) -> Optional[Dict[str, Any]]:
+        stored = self.get(key)
+        if stored is None or stored["result"] is None:
+            return None
+        self.hits += 1
+        return stored["result"]
+
+    def put_result(self, key: str, prediction, recommendation, explanation: Optional[str] = None):
+        result = json.dumps({
+            "prediction": _to_jsonable(prediction),
+            "recommendation": _to_jsonable(recommendation),
+            "explanation": explanation,
+        }, default=str)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO results (key, result, created_at, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET result = excluded.result, updated_at = excluded.updated_at",
+                (key, result, now, now),
+            )
+
+    def claim_email(self, key: str, recipient: str) -> bool:
+        """Marks the email as pending; False if a send for this key was already claimed."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO results (key, created_at, updated_at) VALUES (?, ?, ?)", (key, now, now)
+            )
+            claimed = self._conn.execute(
+                "UPDATE results SET email_recipient = ?, email_status = ?, updated_at = ? "
+                "WHERE key = ? AND email_status IS NULL",
+                (recipient, EMAIL_PENDING, now, key),
+            ).rowcount
+        return claimed == 1
+
+    def finish_email(self, key: str, status: Optional[str]):
+        """Records the send outcome; ``None`` releases the claim so the send can be retried."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE results SET email_status = ?, email_recipient = CASE WHEN ? IS NULL THEN NULL ELSE email_recipient END, "
+                "updated_at = ? WHERE key = ?",
+                (status, status, time.time(), key),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
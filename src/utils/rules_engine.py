@@ -0,0 +1,166 @@
+import json
+import operator
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from src.models.validation_models import LoanApplicationValidator, LoanDecision, RecommendationSchema
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(__file__), "prescreen_rules.json")
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "in": lambda value, options: value in options,
+    "not in": lambda value, options: value not in options,
+}
+
+FEATURES: Dict[str, Callable[[Any], Any]] = {
+    "age": lambda app: app.age,
+    "gender": lambda app: app.gender,
+    "marital_status": lambda app: app.marital_status,
+    "location": lambda app: app.location.strip().lower(),
+    "amount": lambda app: app.amount,
+    "tenure": lambda app: app.tenure,
+    "amount_per_day": lambda app: app.amount / app.tenure,
+    "age_at_maturity": lambda app: app.age + app.tenure / 365,
+}
+
+
+# Used to render every message template once at load time, so a bad placeholder is rejected then.
+SAMPLE_APPLICATION = LoanApplicationValidator(
+    age=30, gender="male", marital_status="single", location="Lagos", amount=50000.0, tenure=30
+)
+
+
+def message_features(application) -> Dict[str, Any]:
+    features = {name: compute(application) for name, compute in FEATURES.items()}
+    features["location"] = application.location
+    return features
+
+
+class PrescreenOutcome(NamedTuple):
+    rule_id: str
+    recommendation: RecommendationSchema
+    message: str
+
+
+class CompiledRule(NamedTuple):
+    rule_id: str
+    priority: int
+    decision: LoanDecision
+    conditions: Tuple[Tuple[str, Callable[[Any, Any], bool], Any], ...]
+    message: str
+    reason_codes: Tuple[str, ...]
+
+
+class RulesEngine:
+    """Policy pre-screen that settles clear-cut applications without any model call.
+
+    Rules are declared in a JSON file and compiled into a priority-ordered table
+    of (feature, operator, value) conditions; the first rule whose conditions
+    all hold decides the application. The file is re-read when its mtime
+    changes, checked at most every ``reload_interval`` seconds.
+    """
+
+    def __init__(self, rules_file: str = DEFAULT_RULES_FILE, reload_interval: float = 5.0):
+        self.rules_file = rules_file
+        self.reload_interval = reload_interval
+        self.hits: Counter = Counter()
+        self.evaluations = 0
+        self._lock = threading.Lock()
+        self._rules: List[CompiledRule] = []
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self.reload()
+
+    @property
+    def rules(self) -> List[CompiledRule]:
+        return list(self._rules)
+
+    def compile(self, spec: Dict[str, Any]) -> List[CompiledRule]:
+        compiled = []
+        for rule in spec.get("rules", []):
+            if not rule.get("enabled", True):
+                continue
+            conditions = []
+            for condition in rule["when"]:
+                feature, op = condition["feature"], condition["op"]
+                if feature not in FEATURES:
+                    raise ValueError(f"Rule '{rule['id']}' uses unknown feature '{feature}'")
+                if op not in OPERATORS:
+                    raise ValueError(f"Rule '{rule['id']}' uses unknown operator '{op}'")
+                value = condition["value"]
+                if op in ("in", "not in"):
+                    value = frozenset(str(v).lower() for v in value)
+                conditions.append((feature, OPERATORS[op], value))
+            try:
+                rule["message"].format(**message_features(SAMPLE_APPLICATION))
+            except (KeyError, IndexError, ValueError, AttributeError) as e:
+                raise ValueError(f"Rule '{rule['id']}' has an invalid message template: {type(e).__name__}: {str(e)}")
+            compiled.append(CompiledRule(
+                rule_id=rule["id"],
+                priority=rule.get("priority", 100),
+                decision=LoanDecision(rule["decision"]),
+                conditions=tuple(conditions),
+                message=rule["message"],
+                reason_codes=tuple(rule.get("reason_codes", [])),
+            ))
+        return sorted(compiled, key=lambda r: r.priority)
+
+    def reload(self, force: bool = True):
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(self.rules_file)
+            except OSError as e:
+                print(f'Error reading prescreen rules: {str(e)}')
+                return
+            if not force and mtime == self._mtime:
+                return
+            try:
+                with open(self.rules_file) as f:
+                    self._rules = self.compile(json.load(f))
+                self._mtime = mtime
+            except (OSError, ValueError, KeyError) as e:
+                # Keep serving the last good table if an edit is malformed.
+                print(f'Error loading prescreen rules: {str(e)}')
+
+    def evaluate(self, application) -> Optional[PrescreenOutcome]:
+        self.reload(force=False)
+        self.evaluations += 1
+        features: Dict[str, Any] = {}
+        for rule in self._rules:
+            matched = True
+            for feature, op, value in rule.conditions:
+                if feature not in features:
+                    features[feature] = FEATURES[feature](application)
+                if not op(features[feature], value):
+                    matched = False
+                    break
+            if matched:
+                self.hits[rule.rule_id] += 1
+                recommendation = RecommendationSchema(
+                    decision=rule.decision,
+                    approvedAmount=application.amount if rule.decision == LoanDecision.APPROVE else None,
+                    approvedTenure=application.tenure if rule.decision == LoanDecision.APPROVE else None,
+                    reasonCodes=list(rule.reason_codes),
+                )
+                return PrescreenOutcome(rule.rule_id, recommendation, rule.message.format(**message_features(application)))
+        self.hits["__passthrough__"] += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit counts for every active rule (zero included) and for applications no rule decided."""
+        hits = {rule.rule_id: self.hits[rule.rule_id] for rule in self._rules}
+        hits.update(self.hits)
+        hits.setdefault("__passthrough__", 0)
+        return {"evaluations": self.evaluations, "hits": hits}
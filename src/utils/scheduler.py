@@ -0,0 +1,116 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+STAGE_PRIORITIES = {"processing": 0, "email": 1, "collection": 2}
+
+
+class SchedulerBusy(Exception):
+    pass
+
+
+class StageScheduler:
+    """Admission control for agent runs with global and per-stage concurrency limits.
+
+    When no slot is free, callers queue by stage priority (processing, then
+    email, then collection) and FIFO within a stage. A caller that waits longer
+    than ``max_queue_wait`` seconds is shed with SchedulerBusy.
+    """
+
+    def __init__(self, max_concurrency: int = 8, stage_limits: Optional[Dict[str, int]] = None,
+                 max_queue_wait: float = 10.0):
+        self.max_concurrency = max_concurrency
+        self.stage_limits = dict(stage_limits or {})
+        self.max_queue_wait = max_queue_wait
+        self._running: Counter = Counter()
+        self._waiters: List[Tuple[int, int, str, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self.admitted: Counter = Counter()
+        self.shed: Counter = Counter()
+        self.total_wait: Counter = Counter()
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    def _has_capacity(self, stage: str) -> bool:
+        if self.running >= self.max_concurrency:
+            return False
+        limit = self.stage_limits.get(stage)
+        return limit is None or self._running[stage] < limit
+
+    def _grant(self, stage: str):
+        self._running[stage] += 1
+        self.admitted[stage] += 1
+
+    def _dispatch(self):
+        blocked = []
+        while self._waiters and self.running < self.max_concurrency:
+            entry = heapq.heappop(self._waiters)
+            _, _, stage, future = entry
+            if future.done():
+                continue
+            if self._has_capacity(stage):
+                self._grant(stage)
+                future.set_result(None)
+            else:
+                # Stage is at its own limit; let lower-priority stages use the free slot.
+                blocked.append(entry)
+        for entry in blocked:
+            heapq.heappush(self._waiters, entry)
+
+    async def acquire(self, stage: str):
+        priority = STAGE_PRIORITIES.get(stage, len(STAGE_PRIORITIES))
+        # Waiters held back only by their own stage limit don't block other stages, as in _dispatch.
+        waiting_ahead = any(
+            p <= priority and not f.done() and self._has_capacity(s) for p, _, s, f in self._waiters
+        )
+        if not waiting_ahead and self._has_capacity(stage):
+            self._grant(stage)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), stage, future))
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, timeout=self.max_queue_wait)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return
+            self.shed[stage] += 1
+            raise SchedulerBusy(stage)
+        except asyncio.CancelledError:
+            # Cancelled (e.g. client disconnect) after _dispatch granted the slot: hand it back.
+            if future.done() and not future.cancelled():
+                self.release(stage)
+            raise
+        finally:
+            self.total_wait[stage] += time.monotonic() - started
+
+    def release(self, stage: str):
+        self._running[stage] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, stage: str):
+        await self.acquire(stage)
+        try:
+            yield
+        finally:
+            self.release(stage)
+
+    def stats(self) -> Dict[str, Any]:
+        waiting = Counter(stage for _, _, stage, future in self._waiters if not future.done())
+        return {
+            stage: {
+                "running": self._running[stage],
+                "waiting": waiting[stage],
+                "admitted": self.admitted[stage],
+                "shed": self.shed[stage],
+                "avg_wait_ms": 1000 * self.total_wait[stage] / max(1, self.admitted[stage] + self.shed[stage]),
+            }
+            for stage in STAGE_PRIORITIES
+        }
@@ -0,0 +1,115 @@
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate deep size in bytes of a session dict and what it references."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj), _seen)
+    return size
+
+
+class SessionManager:
+    """Server-side session states with idle expiry and a process-wide memory ceiling.
+
+    The Gradio state only carries a session id; the session dicts live here in
+    least-recently-used order. Sessions idle for longer than ``idle_ttl``
+    seconds are dropped, and while the estimated total exceeds ``max_bytes`` the
+    oldest sessions are dropped first. Chat history handed back to the UI is
+    capped at ``max_history`` turns.
+    """
+
+    def __init__(self, factory: Callable[[], Dict[str, Any]], idle_ttl: float = 1800.0,
+                 max_history: int = 50, max_bytes: int = 256 * 1024 * 1024):
+        self.factory = factory
+        self.idle_ttl = idle_ttl
+        self.max_history = max_history
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, Tuple[Dict[str, Any], float, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def checkout(self, session_id: Optional[str]) -> Tuple[str, Dict[str, Any], bool]:
+        """Returns (session_id, state, lost); ``lost`` is True when a known id had already been dropped."""
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._sessions.get(session_id) if session_id else None
+            if entry is not None:
+                self._sessions.move_to_end(session_id)
+                return session_id, entry[0], False
+            self.created += 1
+            return uuid.uuid4().hex, self.factory(), session_id is not None
+
+    def peek(self, session_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._sessions.get(session_id) if session_id else None
+            return entry[0] if entry else None
+
+    def save(self, session_id: str, state: Dict[str, Any]):
+        size = estimate_size(state)
+        with self._lock:
+            previous = self._sessions.pop(session_id, None)
+            if previous is not None:
+                self._total_bytes -= previous[2]
+            self._sessions[session_id] = (state, time.monotonic(), size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and len(self._sessions) > 1:
+                self._drop_oldest()
+                self.evicted += 1
+
+    def discard(self, session_id: Optional[str]):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None) if session_id else None
+            if entry is not None:
+                self._total_bytes -= entry[2]
+
+    def trim_history(self, history: List[Any]) -> List[Any]:
+        if self.max_history and len(history) > self.max_history:
+            return history[-self.max_history:]
+        return history
+
+    def _expire(self, now: float):
+        # Sessions are kept in last-used order, so expired ones are at the front.
+        while self._sessions:
+            _, last_used, _ = next(iter(self._sessions.values()))
+            if now - last_used <= self.idle_ttl:
+                break
+            self._drop_oldest()
+            self.expired += 1
+
+    def _drop_oldest(self):
+        _, (_, _, size) = self._sessions.popitem(last=False)
+        self._total_bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire(time.monotonic())
+            count = len(self._sessions)
+            return {
+                "sessions": count,
+                "total_bytes": self._total_bytes,
+                "bytes_per_session": self._total_bytes / count if count else 0.0,
+                "created": self.created,
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import numpy as np
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Set
+from agents import Runner
+from src.agents.repayment_predictor import RepaymentPredictorAgent
+
+
+class ShadowEvaluator:
+    """Runs candidate predictor models on a sample of live prompts, off the response path.
+
+    ``submit`` only schedules background tasks and returns immediately. Each
+    candidate's output is compared with the primary prediction and one JSON
+    line per comparison is appended to ``log_file``. When ``max_in_flight``
+    shadow calls are already running, new samples are dropped rather than
+    queued, so shadow traffic can never build up behind live traffic.
+    """
+
+    def __init__(self, models: Iterable[str], log_file: str, sample_rate: float = 0.1,
+                 max_in_flight: int = 4, runner=None, timeout: float = 60.0):
+        self.candidates = {model: RepaymentPredictorAgent(model) for model in models}
+        self.log_file = log_file
+        self.sample_rate = sample_rate
+        self.max_in_flight = max_in_flight
+        self.runner = runner or Runner
+        self.timeout = timeout
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.dropped = 0
+        self.errors: Counter = Counter()
+
+    def submit(self, prompt: str, primary_model: str, primary_output: Any, primary_ms: float):
+        if not self.candidates or random.random() >= self.sample_rate:
+            return
+        for model, candidate in self.candidates.items():
+            if len(self._tasks) >= self.max_in_flight:
+                self.dropped += 1
+                continue
+            self.submitted += 1
+            task = asyncio.create_task(self._shadow(model, candidate.agent, prompt, primary_model, primary_output, primary_ms))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _shadow(self, model, agent, prompt, primary_model, primary_output, primary_ms):
+        record = {
+            "timestamp": time.time(),
+            "primary_model": primary_model,
+            "candidate_model": model,
+            "primary_ms": primary_ms,
+            "primary_score": getattr(primary_output, "repaymentProbabilityScore", None),
+            "primary_risk": getattr(primary_output, "riskLevel", None),
+        }
+        started = time.perf_counter()
+        try:
+            run_result = await asyncio.wait_for(self.runner.run(agent, prompt), timeout=self.timeout)
+            output = run_result.final_output
+            record["candidate_score"] = getattr(output, "repaymentProbabilityScore", None)
+            record["candidate_risk"] = getattr(output, "riskLevel", None)
+        except Exception as e:
+            self.errors[model] += 1
+            record["error"] = f"{type(e).__name__}: {str(e)}"
+        record["candidate_ms"] = (time.perf_counter() - started) * 1000
+        await asyncio.to_thread(self._write, record)
+
+    def _write(self, record: Dict[str, Any]):
+        try:
+            with self._lock, open(self.log_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        except OSError as e:
+            print(f'Error writing shadow evaluation: {str(e)}')
+
+    async def drain(self):
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._tasks),
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "errors": dict(self.errors),
+        }
+
+
+def read_shadow_log(log_file: str) -> List[Dict[str, Any]]:
+    records = []
+    with open(log_file, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+    return records
+
+
+def compare(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    by_candidate: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for record in records:
+        by_candidate[record["candidate_model"]].append(record)
+
+    report = {}
+    for model, rows in sorted(by_candidate.items()):
+        ok = [r for r in rows if "error" not in r and r.get("candidate_score") is not None and r.get("primary_score") is not None]
+        score_diff = np.array([r["candidate_score"] - r["primary_score"] for r in ok], dtype=np.float64)
+        candidate_ms = np.array([r["candidate_ms"] for r in ok], dtype=np.float64)
+        primary_ms = np.array([r["primary_ms"] for r in ok], dtype=np.float64)
+        report[model] = {
+            "samples": len(rows),
+            "errors": len(rows) - len(ok),
+            "risk_agreement": float(np.mean([
+                str(r["candidate_risk"]).lower() == str(r["primary_risk"]).lower() for r in ok
+            ])) if ok else 0.0,
+            "mean_abs_score_diff": float(np.abs(score_diff).mean()) if ok else 0.0,
+            "mean_score_bias": float(score_diff.mean()) if ok else 0.0,
+            "candidate_p50_ms": float(np.percentile(candidate_ms, 50)) if ok else 0.0,
+            "candidate_p95_ms": float(np.percentile(candidate_ms, 95)) if ok else 0.0,
+            "primary_p50_ms": float(np.percentile(primary_ms, 50)) if ok else 0.0,
+            "primary_p95_ms": float(np.percentile(primary_ms, 95)) if ok else 0.0,
+        }
+    return report
+
+
+def format_comparison(report: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'candidate':<40}{'n':>6}{'err':>5}{'risk agree':>12}{'|Δscore|':>10}{'bias':>8}{'p50 ms':>16}{'p95 ms':>16}"]
+    for model, row in report.items():
+        lines.append(
+            f"{model:<40}{row['samples']:>6}{row['errors']:>5}{row['risk_agreement']:>12.1%}"
+            f"{row['mean_abs_score_diff']:>10.1f}{row['mean_score_bias']:>+8.1f}"
+            f"{row['candidate_p50_ms']:>7.0f} vs {row['primary_p50_ms']:<5.0f}"
+            f"{row['candidate_p95_ms']:>7.0f} vs {row['primary_p95_ms']:<5.0f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare shadow candidate predictors against the primary model")
+    parser.add_argument("log_file")
+    parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+    args = parser.parse_args()
+
+    report = compare(read_shadow_log(args.log_file))
+    print(json.dumps(report, indent=2) if args.json else format_comparison(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import asyncio
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict
+
+
+def request_key(agent, agent_input: Any) -> str:
+    payload = {"agent": agent.name, "model": str(agent.model), "input": agent_input}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Coalesces identical concurrent model calls into one in-flight call.
+
+    The first caller for a key starts the call; callers arriving while it is
+    still running await the same task and get the same result (or exception).
+    The task is shielded, so a caller that goes away does not cancel it for the
+    others. Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls: Counter = Counter()
+        self.coalesced: Counter = Counter()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], label: str = "default") -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls[label] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced[label] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved in case every awaiting caller has gone away.
+            task.exception()
+
+    async def run(self, agent, agent_input: Any, fn: Callable[[], Awaitable[Any]]) -> Any:
+        return await self.do(request_key(agent, agent_input), fn, label=agent.name)
+
+    def stats(self) -> Dict[str, Any]:
+        calls, coalesced = sum(self.calls.values()), sum(self.coalesced.values())
+        return {
+            "in_flight": len(self._inflight),
+            "calls": dict(self.calls),
+            "coalesced": dict(self.coalesced),
+            "coalesced_rate": coalesced / (calls + coalesced) if calls + coalesced else 0.0,
+        }
@@ -0,0 +1,147 @@
+import glob
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+from agents import TracingProcessor
+
+FILE_PATTERN = "traces-{:06d}.jsonl"
+
+
+class JsonlTraceExporter(TracingProcessor):
+    """Agents SDK trace processor that writes traces and spans to rotating local JSONL files.
+
+    Callbacks only enqueue the exported dict; a background thread writes in
+    batches, flushing at most every ``flush_interval`` seconds. Files roll
+    over at ``max_bytes`` and only the newest ``max_files`` are kept. When the
+    queue is full, records are dropped and counted rather than blocking a turn.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 16 * 1024 * 1024, max_files: int = 10,
+                 max_queue: int = 10000, flush_interval: float = 1.0, max_batch: int = 512):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        existing = sorted(glob.glob(os.path.join(directory, "traces-*.jsonl")))
+        self._file_index = int(os.path.basename(existing[-1])[7:13]) if existing else 1
+        self._file = self._open()
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def _open(self):
+        return open(os.path.join(self.directory, FILE_PATTERN.format(self._file_index)), "a", encoding="utf-8")
+
+    def _enqueue(self, record: Optional[Dict[str, Any]]):
+        if record is None:
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def on_trace_start(self, trace):
+        pass
+
+    def on_trace_end(self, trace):
+        self._enqueue(trace.export())
+
+    def on_span_start(self, span):
+        pass
+
+    def on_span_end(self, span):
+        self._enqueue(span.export())
+
+    def export_summary(self, record: Dict[str, Any]):
+        self._enqueue({"object": "turn_summary", **record})
+
+    def _run(self):
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+            try:
+                self._file.write("".join(json.dumps(r, default=str) + "\n" for r in batch if r is not None))
+                self._file.flush()
+                if self._file.tell() >= self.max_bytes:
+                    self._rotate()
+            except OSError as e:
+                print(f'Error writing traces: {str(e)}')
+            for _ in batch:
+                self._queue.task_done()
+        self._file.close()
+
+    def _rotate(self):
+        self._file.close()
+        self._file_index += 1
+        self._file = self._open()
+        files = sorted(glob.glob(os.path.join(self.directory, "traces-*.jsonl")))
+        for path in files[:-self.max_files]:
+            os.remove(path)
+
+    def force_flush(self):
+        self._queue.join()
+
+    def shutdown(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+class TraceSampler:
+    """Head-based sampling of chat turns, with a summary kept for every error or slow turn.
+
+    A sampled turn is traced in full. An unsampled turn runs under a disabled
+    trace, so the SDK creates only no-op spans for it. If that turn fails or
+    takes longer than ``slow_ms``, a one-line summary is still exported.
+    """
+
+    def __init__(self, sample_rate: float = 0.1, slow_ms: float = 10000.0, exporter: Optional[JsonlTraceExporter] = None):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.exporter = exporter
+        self.counts: Counter = Counter()
+
+    def sample(self) -> bool:
+        sampled = random.random() < self.sample_rate
+        self.counts["sampled" if sampled else "unsampled"] += 1
+        return sampled
+
+    def record(self, stage: str, sampled: bool, duration_ms: float, error: Optional[str] = None):
+        if sampled or (error is None and duration_ms < self.slow_ms):
+            return
+        self.counts["errors" if error else "slow"] += 1
+        if self.exporter:
+            self.exporter.export_summary({
+                "timestamp": time.time(),
+                "stage": stage,
+                "duration_ms": duration_ms,
+                "error": error,
+            })
+
+    def stats(self) -> Dict[str, Any]:
+        turns = self.counts["sampled"] + self.counts["unsampled"]
+        return {
+            "turns": turns,
+            "sampled": self.counts["sampled"],
+            "error_summaries": self.counts["errors"],
+            "slow_summaries": self.counts["slow"],
+            "dropped": self.exporter.dropped if self.exporter else 0,
+        }
@@ -0,0 +1,24 @@
+import json
+import pytest
+from src.models.validation_models import LoanApplicationValidator
+from src.utils.rules_engine import DEFAULT_RULES_FILE
+
+@pytest.fixture
+def enabled_rules_file(tmp_path):
+    """The shipped example pre-screen rules with every rule switched on."""
+    with open(DEFAULT_RULES_FILE) as f:
+        spec = json.load(f)
+    for rule in spec["rules"]:
+        rule["enabled"] = True
+    rules_file = tmp_path / "prescreen_rules.json"
+    rules_file.write_text(json.dumps(spec))
+    return str(rules_file)
+
+@pytest.fixture
+def make_application():
+    """Builds a valid application, overriding any of its fields."""
+    def make(**overrides):
+        data = {"age": 30, "gender": "male", "marital_status": "single", "location": "Lagos", "amount": 50000.0, "tenure": 60}
+        data.update(overrides)
+        return LoanApplicationValidator(**data)
+    return make
@@ -0,0 +1,59 @@
+import json
+import pytest
+from src.utils.audit_log import AuditLog, read_audit_log, verify_audit_log, _audit_files
+from src.models.validation_models import LoanApplicationValidator, RepaymentPredictorSchema
+
+@pytest.fixture
+def application():
+    return LoanApplicationValidator(age=30, gender="male", marital_status="single", location="Lagos", amount=50000, tenure=60)
+
+def test_audit_log_chains_rotates_and_resumes(tmp_path, application):
+    prediction = RepaymentPredictorSchema(repaymentProbabilityScore=80, riskLevel="acceptable")
+    log = AuditLog(str(tmp_path), max_bytes=600)
+    for _ in range(5):
+        log.record(application, prediction, "Approve")
+    log.close()
+    log = AuditLog(str(tmp_path), max_bytes=600)
+    log.record(application, prediction, "Approve")
+    log.close()
+
+    assert len(_audit_files(str(tmp_path))) > 1
+    assert [entry["seq"] for entry in read_audit_log(str(tmp_path))] == [1, 2, 3, 4, 5, 6]
+    assert verify_audit_log(str(tmp_path)) == (True, 6, None)
+
+def test_audit_log_detects_tampering(tmp_path, application):
+    log = AuditLog(str(tmp_path))
+    log.record(application, None, "Approve")
+    log.record(application, None, "Reject")
+    log.close()
+    path = _audit_files(str(tmp_path))[0]
+    lines = open(path).read().splitlines()
+    entry = json.loads(lines[1])
+    entry["payload"]["recommendation"] = "Approve"
+    lines[1] = json.dumps(entry)
+    open(path, "w").write("\n".join(lines) + "\n")
+    ok, count, error = verify_audit_log(str(tmp_path))
+    assert not ok
+    assert count == 1
+
+def test_record_drops_instead_of_blocking_when_writer_is_gone(tmp_path, application):
+    log = AuditLog(str(tmp_path), max_queue=1)
+    log.close()
+    log.record(application, None, "Approve")
+    assert log.dropped == 1
+    log.close()
+
+def test_resume_drops_a_torn_final_line(tmp_path, application):
+    log = AuditLog(str(tmp_path))
+    log.record(application, None, "Approve")
+    log.record(application, None, "Reject")
+    log.close()
+    path = _audit_files(str(tmp_path))[0]
+    with open(path, "a") as f:
+        f.write('{"seq": 3, "ts": 17600')
+
+    log = AuditLog(str(tmp_path))
+    log.record(application, None, "Approve")
+    log.close()
+    assert [entry["seq"] for entry in read_audit_log(str(tmp_path))] == [1, 2, 3]
+    assert verify_audit_log(str(tmp_path)) == (True, 3, None)
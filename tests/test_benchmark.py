@@ -0,0 +1,39 @@
+import spacy
+from src.utils.benchmark import BenchmarkRunner, BenchmarkStore, compare, format_diff, main
+
+def test_runner_records_every_repeat():
+    runner = BenchmarkRunner(nlp=spacy.blank("en"), repeats=2, applications=3, sessions=5)
+    results = runner.run(["extraction", "sessions", "pipeline"])
+    assert set(results) == {"extraction", "sessions", "pipeline"}
+    assert len(results["pipeline"]["p95_ms"]) == 2
+    assert results["sessions"]["throughput_per_s"][0] > 0
+    assert results["extraction"]["peak_rss_mb"][0] > 0
+
+def test_store_returns_latest_run_per_commit(tmp_path):
+    store = BenchmarkStore(str(tmp_path / "benchmarks.sqlite3"))
+    store.add("aaa111", False, {"sessions": {"p50_ms": [1.0]}})
+    store.add("bbb222", True, {"sessions": {"p50_ms": [2.0]}})
+    assert store.latest("aaa")["results"]["sessions"]["p50_ms"] == [1.0]
+    assert store.latest(exclude="aaa111")["commit"] == "bbb222"
+    assert store.latest(exclude="aaa111")["dirty"]
+
+def test_compare_flags_regressions_beyond_noise():
+    baseline = {"pipeline": {"p95_ms": [10.0, 10.2, 9.9], "throughput_per_s": [100.0, 101.0, 99.0]}}
+    current = {"pipeline": {"p95_ms": [13.0, 13.1, 12.8], "throughput_per_s": [104.0, 103.0, 105.0]}}
+    rows = {row["metric"]: row for row in compare(baseline, current)}
+    assert rows["p95_ms"]["status"] == "regression"
+    assert rows["throughput_per_s"]["status"] == "ok"
+
+    noisy = {"pipeline": {"p95_ms": [10.0, 6.0, 14.0]}}
+    assert compare(noisy, {"pipeline": {"p95_ms": [13.0, 13.0, 13.0]}})[0]["status"] == "ok"
+    assert "1 regression(s)" in format_diff(list(rows.values()), "a" * 40, "b" * 40)
+
+def test_compare_against_a_newer_baseline_commit(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "benchmarks.sqlite3")
+    store = BenchmarkStore(path)
+    store.add("aaa111", False, {"sessions": {"p50_ms": [1.0]}})
+    store.add("bbb222", False, {"sessions": {"p50_ms": [2.0]}})
+    store.close()
+    monkeypatch.setattr("sys.argv", ["benchmark", "compare", "--store", path, "--current", "aaa111", "--baseline", "bbb222"])
+    main()
+    assert "Baseline bbb222 -> current aaa111" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from src.models.bulk_validation import BulkLoanValidator
+from src.models.validation_models import LoanApplicationValidator
+
+@pytest.fixture
+def validator():
+    return BulkLoanValidator()
+
+def object_column(rng, values, n):
+    column = np.empty(n, dtype=object)
+    column[:] = [values[i] for i in rng.integers(len(values), size=n)]
+    return column
+
+def assert_matches_pydantic(validator, columns, n):
+    result = validator.validate(columns)
+    for row in range(n):
+        data = {field: getattr(columns[field][row], "item", lambda value=columns[field][row]: value)() for field in columns}
+        try:
+            LoanApplicationValidator(**data)
+            expected = []
+        except ValidationError as e:
+            expected = [(err["loc"], err["type"], err["msg"]) for err in e.errors()]
+        actual = [(err["loc"], err["type"], err["msg"]) for err in result.errors(row)]
+        assert sorted(actual) == sorted(expected), data
+        assert result.valid[row] == (not expected)
+
+def test_bulk_validation_matches_pydantic(validator):
+    rng = np.random.default_rng(7)
+    n = 500
+    columns = {
+        "age": rng.choice([15, 18, 19, 30, 30.5, 99, 100], n),
+        "gender": rng.choice(["male", "female", "other", "Male", "x"], n),
+        "marital_status": rng.choice(["single", "married", "divorced", "widowed", "unknown"], n),
+        "location": rng.choice(["Lagos", "L", "Akwa Ibom", "x" * 51], n),
+        "amount": rng.choice([-5.0, 0.0, 1.0, 50000.0, 1000000.0, 1000000.5, 2e6], n),
+        "tenure": rng.choice([5, 6, 7, 60, 180, 181, 30.5], n),
+    }
+    assert_matches_pydantic(validator, columns, n)
+
+    # CSV and historical rows arrive as strings; pydantic's lax mode coerces numeric ones.
+    columns["age"] = rng.choice(["30", " 30 ", "30.0", "1_9", "30.5", "3e1", "abc", "", "100", "٣٠"], n)
+    columns["amount"] = rng.choice(["50000", "50000.50", "1e6", "1_000", "nan", "inf", "-5", "x", "2e6"], n)
+    columns["tenure"] = rng.choice(["60", "7", "181", "60.00", "sixty"], n)
+    assert_matches_pydantic(validator, columns, n)
+
+    columns["age"] = object_column(rng, [30, "30", True, False, None, 30.5, 99.0, b"45", float("nan")], n)
+    columns["amount"] = object_column(rng, [50000, "50000", True, None, 1000000.5, "1e6", [1], float("inf")], n)
+    columns["tenure"] = object_column(rng, [60, "60", True, 30.5, "30.5", None, np.int64(90)], n)
+    assert_matches_pydantic(validator, columns, n)
+
+def test_bulk_validation_flags_missing_columns(validator):
+    result = validator.validate({"age": [30, 40]})
+    assert not result.valid.any()
+    assert ("gender", "missing") in result.error_counts()
+
+def test_unsupported_models_are_rejected_up_front():
+    from typing import List
+    from pydantic import BaseModel
+
+    class WithList(BaseModel):
+        tags: List[str]
+
+    with pytest.raises(TypeError, match="Unsupported field type for 'tags'"):
+        BulkLoanValidator(WithList)
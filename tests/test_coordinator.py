@@ -1,9 +1,12 @@
 import pytest
 import asyncio
+import spacy
 from src.agents.coordinator import CoordinatorAgent
 from src.agents.repayment_predictor import RepaymentPredictorAgent
 from src.agents.recommendation import RecommendationAgent
 from src.agents.emailer import EmailerAgent
+from src.utils.nl_extractor import ApplicationExtractor
+from src.utils.rules_engine import RulesEngine
 
 @pytest.fixture
 def coordinator():
@@ -20,4 +23,47 @@ async def test_coordinator_collects_data(coordinator):
     assert "age" in new_state["fields_collected"]
     assert "gender" in new_state["fields_collected"]
     assert "marital_status" in new_state["fields_collected"]
-    assert "location" in new_state["fields_collected"]
\ No newline at end of file
+    assert "location" in new_state["fields_collected"]
+
+@pytest.mark.asyncio
+async def test_prescreen_rejects_without_model_calls(enabled_rules_file):
+    extractor = ApplicationExtractor(nlp=spacy.blank("en"))
+    coordinator = CoordinatorAgent(
+        RepaymentPredictorAgent("mock-model"),
+        RecommendationAgent(),
+        EmailerAgent("mock-google-key", "mock-groq-key"),
+        extractor=extractor,
+        rules_engine=RulesEngine(enabled_rules_file)
+    )
+    session_state = coordinator.initialize_session_state()
+    session_state["application_data"] = {
+        "age": 30, "gender": "male", "marital_status": "single",
+        "location": "Lagos", "amount": 1000000.0, "tenure": 7
+    }
+    session_state["confirmation_stage"] = True
+    response, new_state = await coordinator.process("yes", session_state)
+    assert new_state["email_stage"]
+    assert new_state["recommendation_result"].decision == "reject"
+    assert "daily repayment limit" in response
+
+@pytest.mark.asyncio
+async def test_state_machine_calls_each_downstream_agent_once():
+    from src.utils.load_test import FakeRunner, LatencyModel
+    runner = FakeRunner(LatencyModel(default_median_ms=1))
+    coordinator = CoordinatorAgent(
+        RepaymentPredictorAgent("mock-model"),
+        RecommendationAgent(),
+        EmailerAgent("mock-google-key", "mock-groq-key"),
+        extractor=ApplicationExtractor(nlp=spacy.blank("en")),
+        runner=runner,
+        orchestration="state_machine"
+    )
+    assert coordinator.agent.tools == [] and coordinator.agent.handoffs == []
+
+    session_state = None
+    for message in ["I'm 30 years old, male, single", "I live in Lagos",
+                    "I need a loan of 50,000 for 30 days", "yes", "me@example.com"]:
+        _, session_state = await coordinator.process(message, session_state)
+    assert runner.calls["Repayment Probability Agent"] == 1
+    assert runner.calls["Loan Application Recommendation Agent"] == 1
+    assert runner.calls["Email Manager"] == 1
@@ -0,0 +1,26 @@
+import pytest
+from src.utils.decision_cache import DecisionCache
+from src.models.validation_models import RecommendationSchema
+
+@pytest.fixture
+def cache():
+    return DecisionCache(capacity=2)
+
+def test_reuses_near_identical_application(cache, make_application):
+    cache.store(make_application(), "acceptable", RecommendationSchema(decision="approve", approvedAmount=50000, approvedTenure=60))
+    reused = cache.lookup(make_application(amount=50500.0), "acceptable")
+    assert reused.decision == "approve"
+    assert reused.approvedAmount == 50500.0
+    assert cache.lookup(make_application(amount=50500.0), "medium") is None
+    assert cache.lookup(make_application(amount=90000.0), "acceptable") is None
+    assert cache.lookup(make_application(location="Kano"), "acceptable") is None
+    assert cache.stats()["hit_rate"] == 0.25
+
+def test_safety_switch_and_eviction(cache, make_application):
+    cache.store(make_application(), "medium", RecommendationSchema(decision="conditional", approvedAmount=30000))
+    assert cache.lookup(make_application(), "medium") is None
+    for age in (30, 40, 50):
+        cache.store(make_application(age=age), "high", RecommendationSchema(decision="reject"))
+    assert cache.stats()["evictions"] == 1
+    assert cache.lookup(make_application(age=30), "high") is None
+    assert cache.lookup(make_application(age=50), "high").decision == "reject"
@@ -0,0 +1,61 @@
+import pytest
+from src.utils.decision_store import DecisionStore, classify_decision
+from src.models.validation_models import LoanApplicationValidator, RepaymentPredictorSchema
+
+@pytest.fixture
+def store(tmp_path):
+    return DecisionStore(str(tmp_path), chunk_rows=2)
+
+def application(location, amount):
+    return LoanApplicationValidator(age=30, gender="male", marital_status="single", location=location, amount=amount, tenure=60)
+
+def test_classify_decision():
+    assert classify_decision("I recommend we conditionally approve this loan") == "conditional"
+    assert classify_decision("We must reject this application") == "reject"
+    assert classify_decision("Approve the loan") == "approve"
+
+def test_approval_rate_and_score_distribution(store):
+    day = 1760000000.0
+    store.record(application("Lagos", 50000), RepaymentPredictorSchema(repaymentProbabilityScore=80, riskLevel="acceptable"), "Approve", timestamp=day)
+    store.record(application("Lagos", 60000), RepaymentPredictorSchema(repaymentProbabilityScore=30, riskLevel="high"), "Reject", timestamp=day)
+    store.record(application("Kano", 700000), RepaymentPredictorSchema(repaymentProbabilityScore=55, riskLevel="medium"), "Approve", timestamp=day + 86400)
+    store.close()
+
+    assert store.count() == 3
+    assert len(store.partitions()) == 2
+    by_state = store.approval_rate(by="state")
+    assert by_state["Lagos"]["count"] == 2
+    assert by_state["Lagos"]["approval_rate"] == 0.5
+    assert by_state["Kano"]["approved"] == 1
+    by_amount = store.approval_rate(by="amount_band")
+    assert by_amount["50,000-99,999"]["count"] == 2
+    scores = store.score_distribution(by="state")
+    assert scores["Lagos"] == {"0-40": 1, "41-70": 0, "71-99": 1}
+
+def test_writers_sharing_a_root_agree_on_codes_and_rows(tmp_path):
+    day = 1760000000.0
+    prediction = RepaymentPredictorSchema(repaymentProbabilityScore=80, riskLevel="acceptable")
+    # Two stores on one root stand in for the web process and a job-queue worker.
+    web, worker = DecisionStore(str(tmp_path)), DecisionStore(str(tmp_path))
+    web.record(application("Lagos", 50000), prediction, "Approve", timestamp=day)
+    worker.record(application("Kano", 50000), prediction, "Reject", timestamp=day)
+    web.record(application("Kano", 50000), prediction, "Reject", timestamp=day)
+    worker.record(application("Lagos", 50000), prediction, "Approve", timestamp=day)
+    web.close()
+    worker.close()
+
+    by_state = DecisionStore(str(tmp_path)).approval_rate(by="state")
+    assert by_state["Lagos"] == {"count": 2, "approved": 2, "conditional": 0, "approval_rate": 1.0}
+    assert by_state["Kano"]["approved"] == 0 and by_state["Kano"]["count"] == 2
+
+def test_partial_row_is_dropped_before_the_next_append(tmp_path):
+    store = DecisionStore(str(tmp_path))
+    prediction = RepaymentPredictorSchema(repaymentProbabilityScore=80, riskLevel="acceptable")
+    store.record(application("Lagos", 50000), prediction, "Approve", timestamp=1760000000.0)
+    partition = tmp_path / store.partitions()[0]
+    with open(partition / "timestamp.bin", "ab") as f:
+        f.write(b"\0" * 8)
+    store.record(application("Lagos", 60000), prediction, "Reject", timestamp=1760000000.0)
+    store.close()
+    assert store.count() == 2
+    assert store.approval_rate(by="amount_band")["50,000-99,999"]["approved"] == 1
@@ -0,0 +1,32 @@
+import asyncio
+import time
+import pytest
+from src.utils.extraction_pool import ExtractionPool
+
+class SlowExtractor:
+    def extract_all_fields(self, text, fields, current_data=None):
+        time.sleep(0.05)
+        return {"gender": (text, 0.8)}
+
+@pytest.mark.asyncio
+async def test_extraction_runs_off_loop_with_backpressure():
+    pool = ExtractionPool(max_workers=1, max_queue=1, extractor=SlowExtractor())
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    results = await asyncio.gather(*(pool.extract(f"msg{i}", {"gender"}) for i in range(4)))
+    ticking.cancel()
+    pool.shutdown()
+
+    assert [r["gender"][0] for r in results] == ["msg0", "msg1", "msg2", "msg3"]
+    assert ticks >= 10
+    stats = pool.stats()
+    assert stats["completed"] == 4
+    assert stats["queue_wait"]["max_ms"] >= 100
+    assert stats["run_time"]["p50_ms"] >= 40
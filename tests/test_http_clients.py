@@ -0,0 +1,19 @@
+from src.utils.http_clients import ClientFactory
+
+def test_clients_for_one_provider_share_a_pool():
+    factory = ClientFactory(max_connections=10)
+    gemini = factory.get_openai_client(base_url="https://generativelanguage.googleapis.com/v1beta/openai/", api_key="a")
+    gemini_other_key = factory.get_openai_client(base_url="https://generativelanguage.googleapis.com/v1beta/openai/", api_key="b")
+    groq = factory.get_openai_client(base_url="https://api.groq.com/openai/v1", api_key="a")
+    assert gemini is not gemini_other_key
+    assert gemini._client is gemini_other_key._client
+    assert groq._client is not gemini._client
+    assert factory.get_http_client() is factory.get_http_client("https://api.openai.com/v1")
+
+def test_pool_stats_and_fresh_copy():
+    factory = ClientFactory(max_connections=10, http2=False)
+    factory.get_http_client("https://api.groq.com/openai/v1")
+    stats = factory.pool_stats()["https://api.groq.com"]
+    assert stats == {"connections": 0, "in_use": 0, "idle": 0, "requests": 0, "http2": False}
+    fresh = factory.fresh()
+    assert fresh.limits.max_connections == 10 and fresh.pool_stats() == {}
@@ -0,0 +1,103 @@
+import pytest
+import spacy
+from types import SimpleNamespace
+from src.agents.coordinator import CoordinatorAgent
+from src.agents.repayment_predictor import RepaymentPredictorAgent
+from src.agents.recommendation import RecommendationAgent
+from src.agents.emailer import EmailerAgent
+from src.agents.field_extractor import FieldExtractorAgent
+from src.models.validation_models import FieldExtractionSchema
+from src.utils.nl_extractor import ApplicationExtractor
+from src.utils.load_test import FakeRunner, LatencyModel
+from src.utils.hybrid_extractor import HybridExtractor
+
+class ExtractionRunner(FakeRunner):
+    def __init__(self, output):
+        super().__init__(LatencyModel(default_median_ms=1))
+        self.output = output
+        self.prompts = []
+
+    async def run(self, agent, agent_input):
+        if agent.name == "Application Field Extractor":
+            self.calls[agent.name] += 1
+            self.prompts.append(agent_input)
+            return SimpleNamespace(final_output=self.output)
+        return await super().run(agent, agent_input)
+
+def build(runner, threshold=0.75):
+    extractor = ApplicationExtractor(nlp=spacy.blank("en"))
+    hybrid = HybridExtractor(extractor, FieldExtractorAgent("mock-model").agent, threshold=threshold)
+    coordinator = CoordinatorAgent(
+        RepaymentPredictorAgent("mock-model"),
+        RecommendationAgent(),
+        EmailerAgent("mock-google-key", "mock-groq-key"),
+        extractor=extractor,
+        runner=runner,
+        orchestration="state_machine",
+        hybrid_extractor=hybrid
+    )
+    return coordinator, hybrid
+
+@pytest.mark.asyncio
+async def test_only_unresolved_fields_go_to_one_fallback_call():
+    runner = ExtractionRunner(FieldExtractionSchema(maritalStatus="married", tenure=60, gender="female"))
+    coordinator, hybrid = build(runner)
+    session_state = coordinator.initialize_session_state()
+    _, session_state = await coordinator.process("I'm 30 years old, my spouse and I need it for two months", session_state)
+
+    assert runner.calls["Application Field Extractor"] == 1
+    assert "maritalStatus" in runner.prompts[0] and "gender" not in runner.prompts[0]
+    assert session_state["application_data"]["age"] == 30
+    assert session_state["application_data"]["marital_status"] == "married"
+    assert "gender" not in session_state["application_data"]
+    assert session_state["field_sources"]["age"][0] == "local"
+    assert session_state["field_sources"]["marital_status"][0] == "model"
+
+@pytest.mark.asyncio
+async def test_no_fallback_when_message_has_nothing_to_extract():
+    runner = ExtractionRunner(FieldExtractionSchema())
+    coordinator, hybrid = build(runner)
+    await coordinator.process("Hello there", coordinator.initialize_session_state())
+    assert runner.calls["Application Field Extractor"] == 0
+    assert hybrid.stats()["fallback_rate"] == 0.0
+
+@pytest.mark.asyncio
+async def test_unresolved_fallback_keeps_local_value_and_scores_it():
+    runner = ExtractionRunner(None)
+    coordinator, hybrid = build(runner, threshold=0.95)
+    session_state = coordinator.initialize_session_state()
+    _, session_state = await coordinator.process("I'm 30 years old", session_state)
+    assert session_state["application_data"]["age"] == 30
+    assert session_state["field_sources"]["age"][0] == "local_low"
+
+    assert hybrid.stats()["fallback_rate"] == 1.0
+
+@pytest.mark.asyncio
+async def test_correction_before_confirming_is_scored_against_the_extraction():
+    runner = ExtractionRunner(FieldExtractionSchema())
+    coordinator, hybrid = build(runner)
+    session_state = coordinator.initialize_session_state()
+    _, session_state = await coordinator.process(
+        "I'm 30 years old, male, single, I live in Lagos and need 50000 naira for 60 days", session_state)
+    assert session_state["confirmation_stage"]
+
+    _, session_state = await coordinator.process("modify", session_state)
+    _, session_state = await coordinator.process("Sorry, I'm actually 35 years old", session_state)
+    assert session_state["application_data"]["age"] == 35 and session_state["confirmation_stage"]
+    _, session_state = await coordinator.process("yes", session_state)
+
+    accuracy = hybrid.stats()["accuracy"]
+    assert accuracy["age"]["local"] == {"confirmed": 1, "correct": 0, "accuracy": 0.0}
+    assert accuracy["location"]["local"]["accuracy"] == 1.0
+
+@pytest.mark.asyncio
+async def test_model_values_are_checked_against_application_constraints():
+    runner = ExtractionRunner(FieldExtractionSchema(tenure=150, amount=5000000.0))
+    coordinator, hybrid = build(runner)
+    assert hybrid.validate("tenure", 150) == 150
+    assert hybrid.validate("tenure", 181) is None
+    session_state = coordinator.initialize_session_state()
+    _, session_state = await coordinator.process("the repayment period is the usual one, amount is a lot", session_state)
+    assert session_state["application_data"]["tenure"] == 150
+    assert "amount" not in session_state["application_data"]
+    assert session_state["field_sources"]["tenure"][0] == "model"
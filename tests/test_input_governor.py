@@ -0,0 +1,45 @@
+import pytest
+import spacy
+from src.agents.coordinator import CoordinatorAgent
+from src.agents.repayment_predictor import RepaymentPredictorAgent
+from src.agents.recommendation import RecommendationAgent
+from src.agents.emailer import EmailerAgent
+from src.utils.nl_extractor import ApplicationExtractor
+from src.utils.load_test import FakeRunner, LatencyModel
+from src.utils.input_governor import InputGovernor
+
+def test_chunks_are_capped_and_cut_at_sentence_boundaries():
+    governor = InputGovernor(max_chars=100, chunk_chars=40)
+    text = "I am 30 years old. I live in Lagos. " * 10
+    chunks = governor.chunks(text)
+    assert "".join(chunks) == text[:100]
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert chunks[0].endswith(". ")
+    assert governor.stats()["capped"] == 1
+
+def test_forward_keeps_head_and_tail():
+    governor = InputGovernor(forward_chars=30)
+    assert governor.forward("short") == "short"
+    forwarded = governor.forward("a" * 20 + "b" * 100 + "c" * 10)
+    assert forwarded.startswith("a" * 20) and forwarded.endswith("c" * 10)
+    assert "[... 100 characters omitted ...]" in forwarded
+
+@pytest.mark.asyncio
+async def test_long_message_stops_extracting_once_fields_are_found():
+    governor = InputGovernor(max_chars=4000, chunk_chars=200, forward_chars=300)
+    coordinator = CoordinatorAgent(
+        RepaymentPredictorAgent("mock-model"),
+        RecommendationAgent(),
+        EmailerAgent("mock-google-key", "mock-groq-key"),
+        extractor=ApplicationExtractor(nlp=spacy.blank("en")),
+        runner=FakeRunner(LatencyModel(default_median_ms=1)),
+        input_governor=governor
+    )
+    session_state = coordinator.initialize_session_state()
+    session_state["required_fields"] = {"age"}
+    message = "I'm 30 years old. " + "Some unrelated rambling here. " * 5000
+    _, session_state = await coordinator.process(message, session_state)
+    assert session_state["application_data"]["age"] == 30
+    stats = governor.stats()
+    assert stats["chunks"] == 1 and stats["early_exits"] == 1
+    assert stats["capped"] == 1 and stats["truncated"] == 1
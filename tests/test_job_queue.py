@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+import spacy
+from src.agents.coordinator import CoordinatorAgent
+from src.agents.repayment_predictor import RepaymentPredictorAgent
+from src.agents.recommendation import RecommendationAgent
+from src.agents.emailer import EmailerAgent
+from src.utils.nl_extractor import ApplicationExtractor
+from src.utils.load_test import FakeRunner, LatencyModel
+from src.utils.job_queue import JobQueue, ProcessingWorker
+
+def test_claim_complete_and_retry(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+    job_id = queue.enqueue({"application_data": {"age": 30}})
+    claimed_id, payload = queue.claim()
+    assert claimed_id == job_id and payload == {"application_data": {"age": 30}}
+    assert queue.claim() is None
+
+    queue.fail(job_id, "timeout")
+    assert queue.get(job_id)["status"] == "queued"
+    queue.claim()
+    queue.fail(job_id, "timeout")
+    assert queue.get(job_id)["status"] == "failed"
+
+    other = queue.enqueue({})
+    queue.claim()
+    queue.complete(other, {"prediction": None})
+    assert queue.get(other) == {"status": "done", "result": {"prediction": None}, "error": None, "attempts": 1}
+
+def test_expired_lease_is_reclaimed_until_attempts_run_out(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=-1, max_attempts=2)
+    job_id = queue.enqueue({})
+    queue.claim()
+    assert queue.claim()[0] == job_id
+    assert queue.claim() is None
+    assert queue.get(job_id)["status"] == "failed"
+
+    queue.purge(older_than=-1)
+    assert queue.get(job_id) is None
+
+def test_failed_job_can_be_enqueued_again(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=1)
+    job_id = queue.enqueue({}, job_id="key")
+    queue.claim()
+    queue.fail(job_id, "timeout")
+    assert queue.get(job_id)["status"] == "failed"
+    assert queue.enqueue({}, job_id="key") == job_id
+    assert queue.get(job_id) == {"status": "queued", "result": None, "error": None, "attempts": 0}
+    assert queue.claim()[0] == job_id
+    # A job that is still live is left alone.
+    queue.enqueue({}, job_id="key")
+    assert queue.get(job_id)["status"] == "running"
+
+@pytest.mark.asyncio
+async def test_idle_worker_purges_finished_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.enqueue({})
+    queue.claim()
+    queue.complete(job_id, {})
+    worker = ProcessingWorker(None, queue, poll_interval=0.01, retention=-1)
+    task = asyncio.create_task(worker.run_forever())
+    await asyncio.sleep(0.05)
+    worker.stop()
+    await task
+    assert queue.stats() == {}
+
+@pytest.mark.asyncio
+async def test_processing_is_handed_to_a_worker(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    coordinator = CoordinatorAgent(
+        RepaymentPredictorAgent("mock-model"),
+        RecommendationAgent(),
+        EmailerAgent("mock-google-key", "mock-groq-key"),
+        extractor=ApplicationExtractor(nlp=spacy.blank("en")),
+        runner=FakeRunner(LatencyModel(default_median_ms=1)),
+        orchestration="state_machine",
+        job_queue=queue
+    )
+    session_state = coordinator.initialize_session_state()
+    session_state["application_data"] = {
+        "age": 30, "gender": "male", "marital_status": "single",
+        "location": "Lagos", "amount": 50000.0, "tenure": 30
+    }
+    session_state["confirmation_stage"] = True
+    response, session_state = await coordinator.process("yes", session_state)
+    assert response == coordinator.processing_message
+    assert await coordinator.poll_processing(session_state) is None
+
+    await ProcessingWorker(coordinator, queue).run(max_jobs=1)
+    response, session_state = await coordinator.poll_processing(session_state)
+    assert session_state["email_stage"] and session_state["processing_job"] is None
+    assert session_state["recommendation_result"].decision in ("approve", "reject", "conditional")
+    assert "Repayment probability score" in response
+
+@pytest.mark.asyncio
+async def test_confirming_again_retries_a_failed_job(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=1)
+    coordinator = CoordinatorAgent(
+        RepaymentPredictorAgent("mock-model"),
+        RecommendationAgent(),
+        EmailerAgent("mock-google-key", "mock-groq-key"),
+        extractor=ApplicationExtractor(nlp=spacy.blank("en")),
+        runner=FakeRunner(LatencyModel(default_median_ms=1)),
+        orchestration="state_machine",
+        job_queue=queue
+    )
+    session_state = coordinator.initialize_session_state()
+    session_state["application_data"] = {
+        "age": 30, "gender": "male", "marital_status": "single",
+        "location": "Lagos", "amount": 50000.0, "tenure": 30
+    }
+    session_state["confirmation_stage"] = True
+    _, session_state = await coordinator.process("yes", session_state)
+    job_id, _ = queue.claim()
+    queue.fail(job_id, "worker crashed")
+    response, session_state = await coordinator.process("status?", session_state)
+    assert "confirm again" in response
+
+    response, session_state = await coordinator.process("yes", session_state)
+    assert response == coordinator.processing_message
+    assert queue.get(job_id)["status"] == "queued"
+    await ProcessingWorker(coordinator, queue).run(max_jobs=1)
+    response, session_state = await coordinator.poll_processing(session_state)
+    assert session_state["email_stage"]
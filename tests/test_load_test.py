@@ -0,0 +1,31 @@
+import asyncio
+import random
+import pytest
+from src.utils.load_test import FakeRunner, LatencyModel, LoadTest, build_script
+from src.agents.repayment_predictor import RepaymentPredictorAgent
+from src.models.validation_models import RepaymentPredictorSchema
+
+def test_build_script_walks_every_stage():
+    script = build_script(random.Random(3))
+    stages = [stage for stage, _ in script]
+    assert stages[0] == "collection"
+    assert stages[-2:] == ["processing", "email"]
+    assert "@" in script[-1][1]
+
+@pytest.mark.asyncio
+async def test_fake_runner_returns_typed_output():
+    runner = FakeRunner(LatencyModel(default_median_ms=1))
+    result = await runner.run(RepaymentPredictorAgent("fake-model").agent, "prompt")
+    assert isinstance(result.final_output, RepaymentPredictorSchema)
+
+@pytest.mark.asyncio
+async def test_load_test_reports_stage_percentiles():
+    async def send(message, session):
+        await asyncio.sleep(0.001)
+        return session
+
+    report = await LoadTest(send, users=3, think_time=0, ramp_up=0, seed=1).run()
+    assert report["completed_applications"] == 3
+    assert report["error_rate"] == 0.0
+    assert set(report["stages"]) >= {"collection", "processing", "email"}
+    assert report["stages"]["email"]["turns"] == 3
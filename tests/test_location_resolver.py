@@ -0,0 +1,24 @@
+import pytest
+from src.utils.location_resolver import LocationResolver
+
+@pytest.fixture
+def resolver():
+    return LocationResolver()
+
+def test_resolve_states_cities_and_aliases(resolver):
+    assert resolver.resolve("Akwa-Ibom") == ("Akwa Ibom", 1.0)
+    assert resolver.resolve("Port Harcourt") == ("Rivers", 1.0)
+    assert resolver.resolve("abj") == ("FCT", 1.0)
+    state, score = resolver.resolve("Lagoss")
+    assert state == "Lagos"
+    assert 0.6 <= score < 1.0
+
+def test_resolve_phrase_ignores_surrounding_words(resolver):
+    assert resolver.resolve_phrase("Lagos and I need a loan") == ("Lagos", 1.0)
+    assert resolver.resolve_phrase("a loan") is None
+
+def test_country_name_is_not_resolved_to_niger(resolver):
+    assert resolver.resolve("Nigeria") is None
+    assert resolver.resolve_phrase("I am from Nigeria") is None
+    assert resolver.resolve_phrase("Lagos, Nigeria") == ("Lagos", 1.0)
+    assert resolver.resolve("Niger") == ("Niger", 1.0)
@@ -0,0 +1,16 @@
+import pytest
+from src.utils.model_registry import ModelRegistry
+
+@pytest.fixture
+def registry():
+    return ModelRegistry(spacy_model="blank:en")
+
+def test_extractor_is_shared(registry):
+    extractor = registry.get_extractor()
+    assert registry.get_extractor() is extractor
+    assert extractor.nlp is registry.get_nlp()
+
+def test_openai_clients_are_shared(registry):
+    client = registry.get_openai_client(base_url="https://example.com/v1", api_key="key")
+    assert registry.get_openai_client(base_url="https://example.com/v1", api_key="key") is client
+    assert registry.get_openai_client(base_url="https://example.com/v1", api_key="other") is not client
@@ -1,4 +1,5 @@
 import pytest
+import spacy
 from src.utils.nl_extractor import ApplicationExtractor
 
 @pytest.fixture
@@ -12,4 +13,32 @@ def test_extract_all_fields(extractor):
     assert "age" in result
     assert result["age"][0] == 30
     assert "gender" in result
-    assert result["gender"][0] == "male"
\ No newline at end of file
+    assert result["gender"][0] == "male"
+
+def test_extract_fuzzy_location():
+    extractor = ApplicationExtractor(nlp=spacy.blank("en"))
+    result = extractor.extract_all_fields("I live in Lagoss", {"location"})
+    assert result["location"][0] == "Lagos"
+    assert result["location"][1] < 0.8
+    result = extractor.extract_all_fields("I'm from Port Harcourt", {"location"})
+    assert result["location"] == ("Rivers", 0.8)
+
+
+def test_extract_numeric_fields_in_one_pass():
+    extractor = ApplicationExtractor(nlp=spacy.blank("en"))
+    text = "I'm 30 years old and need ₦50k for 2 months"
+    result = extractor.extract_all_fields(text, {"age", "amount", "tenure"})
+    assert result == {"age": (30, 0.8), "amount": (50000.0, 0.8), "tenure": (60, 0.8)}
+
+def test_tenure_in_months_weeks_and_words_up_to_validator_cap():
+    extractor = ApplicationExtractor(nlp=spacy.blank("en"))
+    result = extractor.extract_all_fields("I need a loan of N200,000 for 6 months", {"amount", "tenure"})
+    assert result == {"amount": (200000.0, 0.8), "tenure": (180, 0.8)}
+    assert extractor.extract_all_fields("repay over 8 weeks", {"tenure"}) == {"tenure": (56, 0.8)}
+    result = extractor.extract_all_fields("I'm twenty five years old, repayment in three months", {"age", "tenure"})
+    assert result == {"age": (25, 0.8), "tenure": (90, 0.8)}
+    assert extractor.extract_all_fields("for 7 months", {"tenure"}) == {}
+
+def test_nigeria_is_not_extracted_as_a_location():
+    extractor = ApplicationExtractor(nlp=spacy.blank("en"))
+    assert extractor.extract_all_fields("I am from Nigeria", {"location"}) == {}
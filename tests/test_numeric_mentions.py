@@ -0,0 +1,23 @@
+import pytest
+from src.utils.numeric_mentions import NumericMentionParser
+
+@pytest.fixture
+def parser():
+    return NumericMentionParser()
+
+def test_parse_units_and_suffixes(parser):
+    mentions = parser.parse("I need ₦50k, or 1.2m naira, for 3 months")
+    assert [(m.value, m.unit) for m in mentions] == [(50000.0, "money"), (1200000.0, "money"), (3.0, "months")]
+
+def test_assign_fields(parser):
+    result = parser.assign("I am thirty-five years old and want fifty thousand naira for 3 months")
+    assert result["age"] == (35.0, 0.8)
+    assert result["amount"] == (50000.0, 0.8)
+    assert result["tenure"] == (90.0, 0.8)
+    result = parser.assign("I'm 28. Please borrow me 75,000, tenure 45")
+    assert result == {"age": (28.0, 0.7), "amount": (75000.0, 0.7), "tenure": (45.0, 0.7)}
+
+def test_assign_ignores_implausible_ages(parser):
+    result = parser.assign("I'm one of the traders here, my business is 5 years old and I am 42 years old")
+    assert result["age"] == (42.0, 0.8)
+    assert "age" not in parser.assign("I am one person asking for help")
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+from src.utils.profiler import SamplingProfiler
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+def test_disarmed_profiler_is_a_no_op(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path))
+    assert profiler.turn("collection") is profiler.section("extraction")
+    with profiler.turn("collection"):
+        busy(0.01)
+    assert list(tmp_path.iterdir()) == []
+
+def test_armed_turns_write_collapsed_stacks_per_stage(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path), interval=0.001)
+    profiler.arm(2)
+    with profiler.turn("collection"):
+        with profiler.section("extraction"):
+            busy(0.05)
+    assert profiler.armed
+    with profiler.turn("processing"):
+        busy(0.05)
+    assert not profiler.armed
+    assert "sampling-profiler" not in [thread.name for thread in threading.enumerate()]
+
+    names = sorted(path.name.split("-")[0] for path in tmp_path.iterdir())
+    assert names == ["collection", "processing"]
+    line = next(tmp_path.glob("collection-*")).read_text().splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert stack.startswith("collection;extraction;") and "busy" in stack
+    assert int(count) > 0
+
+def test_concurrent_async_turns_keep_their_own_labels(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path), interval=0.001)
+
+    async def turn(stage, spin):
+        with profiler.turn(stage):
+            for _ in range(3):
+                spin(0.03)
+                await asyncio.sleep(0)
+
+    def collection_work(seconds):
+        busy(seconds)
+
+    def processing_work(seconds):
+        busy(seconds)
+
+    async def main():
+        await asyncio.gather(turn("collection", collection_work), turn("processing", processing_work))
+
+    profiler.arm(2)
+    asyncio.run(main())
+    collection = next(tmp_path.glob("collection-*")).read_text()
+    processing = next(tmp_path.glob("processing-*")).read_text()
+    assert "collection_work" in collection and "processing_work" not in collection
+    assert "processing_work" in processing and "collection_work" not in processing
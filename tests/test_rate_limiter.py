@@ -0,0 +1,82 @@
+import asyncio
+import time
+import httpx
+import pytest
+from src.utils.rate_limiter import ProviderLimiter, RateLimitedTransport, TokenBucket, estimate_tokens, parse_duration
+from src.utils.http_clients import ClientFactory
+
+def test_parse_duration():
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("20ms") == 0.02
+    assert parse_duration("2") == 2.0
+    assert parse_duration(None) is None
+
+def test_estimate_tokens_uses_prompt_and_completion_budget():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions",
+                            json={"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 120})
+    assert 200 < estimate_tokens(request) < 260
+
+@pytest.mark.asyncio
+async def test_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=600)
+    await bucket.acquire(600)
+    started = time.monotonic()
+    await bucket.acquire(2)
+    assert time.monotonic() - started >= 0.15
+
+@pytest.mark.asyncio
+async def test_429_halves_concurrency_and_pauses():
+    statuses = iter([200, 429, 200])
+
+    def handler(request):
+        return httpx.Response(next(statuses), headers={"retry-after-ms": "100", "x-ratelimit-remaining-tokens": "5000"})
+
+    limiter = ProviderLimiter(requests_per_minute=6000, tokens_per_minute=100000, initial_concurrency=4)
+    client = httpx.AsyncClient(transport=RateLimitedTransport(httpx.MockTransport(handler), limiter))
+    await client.get("https://api.openai.com/v1/models")
+    assert limiter.concurrency == 4.25
+    await client.get("https://api.openai.com/v1/models")
+    assert limiter.concurrency == 2.125 and limiter.throttled == 1
+    started = time.monotonic()
+    await client.get("https://api.openai.com/v1/models")
+    assert time.monotonic() - started >= 0.09
+    stats = limiter.stats()
+    assert stats["active"] == 0 and stats["tokens_available"] <= 5000
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_queues_instead_of_failing():
+    peak = 0
+
+    async def slow(request):
+        nonlocal peak
+        peak = max(peak, limiter.active)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200)
+
+    limiter = ProviderLimiter(requests_per_minute=6000, tokens_per_minute=1000000, max_concurrency=2, initial_concurrency=2)
+    client = httpx.AsyncClient(transport=RateLimitedTransport(httpx.MockTransport(slow), limiter))
+    responses = await asyncio.gather(*(client.get("https://api.groq.com/x") for _ in range(6)))
+    assert all(r.status_code == 200 for r in responses)
+    assert peak <= 2
+
+def test_factory_shares_one_limiter_per_provider():
+    factory = ClientFactory(rate_limits={"groq": (30, 6000)})
+    factory.get_http_client("https://api.groq.com/openai/v1")
+    factory.get_http_client("https://api.openai.com/v1")
+    stats = factory.pool_stats()
+    assert "rate_limit" in stats["https://api.groq.com"]
+    assert "rate_limit" not in stats["https://api.openai.com"]
+
+@pytest.mark.asyncio
+async def test_streamed_response_holds_its_slot_until_closed():
+    limiter = ProviderLimiter(requests_per_minute=6000, tokens_per_minute=1000000, initial_concurrency=2)
+
+    class Chunks(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"data: {}\n\n"
+
+    client = httpx.AsyncClient(transport=RateLimitedTransport(httpx.MockTransport(lambda request: httpx.Response(200, stream=Chunks())), limiter))
+    async with client.stream("POST", "https://api.openai.com/v1/chat/completions") as response:
+        assert limiter.active == 1
+        await response.aread()
+    assert limiter.active == 0 and limiter.completed == 1
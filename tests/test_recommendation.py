@@ -1,9 +1,15 @@
 import pytest
 from src.agents.recommendation import RecommendationAgent
+from src.models.validation_models import RecommendationSchema
 
 @pytest.fixture
 def recommendation():
     return RecommendationAgent()
 
 def test_recommendation_instruction(recommendation):
-    assert "loan recommendation specialist" in recommendation.instructions
\ No newline at end of file
+    assert "loan recommendation specialist" in recommendation.instructions
+
+def test_recommendation_output_is_structured_and_capped():
+    recommendation = RecommendationAgent(max_output_tokens=64)
+    assert recommendation.agent.output_type is RecommendationSchema
+    assert recommendation.agent.model_settings.max_tokens == 64
@@ -0,0 +1,26 @@
+import pytest
+from src.utils.recommendation_renderer import RecommendationRenderer
+from src.models.validation_models import RecommendationSchema, RepaymentPredictorSchema
+
+@pytest.fixture
+def renderer():
+    return RecommendationRenderer()
+
+def test_render_conditional_recommendation(renderer):
+    recommendation = RecommendationSchema(
+        decision="conditional",
+        approvedAmount=30000,
+        approvedTenure=60,
+        reasonCodes=["moderate_repayment_probability", "reduced_amount"]
+    )
+    chat = renderer.render_chat(recommendation, {"amount": 50000, "tenure": 60})
+    assert "conditional approval" in chat
+    assert "₦30,000 over 60 days" in chat
+    assert "reduced loan amount" in chat
+    email = renderer.render_email(recommendation, {"amount": 50000, "tenure": 60})
+    assert "**Decision**: Conditional" in email
+
+def test_render_prediction_and_plain_text(renderer):
+    prediction = RepaymentPredictorSchema(repaymentProbabilityScore=80, riskLevel="acceptable")
+    assert renderer.render_prediction(prediction) == "Repayment probability score: 80/99 (risk level: acceptable)"
+    assert renderer.render_chat("No recommendation available", {}) == "No recommendation available"
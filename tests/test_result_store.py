@@ -0,0 +1,60 @@
+import pytest
+import spacy
+from src.agents.coordinator import CoordinatorAgent
+from src.agents.repayment_predictor import RepaymentPredictorAgent
+from src.agents.recommendation import RecommendationAgent
+from src.agents.emailer import EmailerAgent
+from src.models.validation_models import RecommendationSchema
+from src.utils.nl_extractor import ApplicationExtractor
+from src.utils.load_test import FakeRunner, LatencyModel
+from src.utils.result_store import ResultStore
+
+def test_results_round_trip_and_email_is_claimed_once(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    store.put_result("key", None, RecommendationSchema(decision="reject"), "policy")
+    assert store.get_result("key")["recommendation"]["decision"] == "reject"
+    assert store.claim_email("key", "a@example.com")
+    assert not store.claim_email("key", "b@example.com")
+    store.finish_email("key", None)
+    assert store.claim_email("key", "b@example.com")
+    store.finish_email("key", "sent")
+    assert store.get("key")["email_status"] == "sent"
+
+def confirmed_session(coordinator, client_id):
+    # What a fresh page load holds once the applicant has re-entered the same details.
+    session_state = coordinator.initialize_session_state(client_id)
+    session_state["application_data"] = {
+        "age": 30, "gender": "male", "marital_status": "single",
+        "location": "Lagos", "amount": 50000.0, "tenure": 30
+    }
+    session_state["confirmation_stage"] = True
+    return session_state
+
+@pytest.mark.asyncio
+async def test_reload_and_second_confirm_do_not_repeat_model_calls_or_email(tmp_path):
+    runner = FakeRunner(LatencyModel(default_median_ms=1))
+    coordinator = CoordinatorAgent(
+        RepaymentPredictorAgent("mock-model"),
+        RecommendationAgent(),
+        EmailerAgent("mock-google-key", "mock-groq-key"),
+        extractor=ApplicationExtractor(nlp=spacy.blank("en")),
+        runner=runner,
+        orchestration="state_machine",
+        result_store=ResultStore(str(tmp_path / "results.sqlite3"))
+    )
+    session_state = confirmed_session(coordinator, "browser-1")
+    _, session_state = await coordinator.process("yes", session_state)
+    await coordinator.process("me@example.com", session_state)
+
+    reloaded = confirmed_session(coordinator, "browser-1")
+    _, reloaded = await coordinator.process("yes", reloaded)
+    assert runner.calls["Repayment Probability Agent"] == 1
+    assert runner.calls["Loan Application Recommendation Agent"] == 1
+    assert reloaded["recommendation_result"] == session_state["recommendation_result"]
+    response, _ = await coordinator.process("me@example.com", reloaded)
+    assert runner.calls["Email Manager"] == 1
+    assert "already been sent to me@example.com" in response
+
+    other_browser = confirmed_session(coordinator, "browser-2")
+    await coordinator.process("yes", other_browser)
+    assert runner.calls["Repayment Probability Agent"] == 2
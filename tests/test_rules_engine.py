@@ -0,0 +1,53 @@
+import json
+import os
+import pytest
+from src.utils.rules_engine import RulesEngine
+
+@pytest.fixture
+def engine(enabled_rules_file):
+    return RulesEngine(enabled_rules_file)
+
+def test_shipped_rules_are_disabled(make_application):
+    engine = RulesEngine()
+    assert engine.rules == []
+    assert engine.evaluate(make_application(amount=1000000.0, tenure=7)) is None
+
+def test_example_rules_decide_clear_cases(engine, make_application):
+    outcome = engine.evaluate(make_application(amount=1000000.0, tenure=7))
+    assert outcome.rule_id == "daily_repayment_limit"
+    assert outcome.recommendation.decision == "reject"
+    assert "₦142,857 per day" in outcome.message
+    assert engine.evaluate(make_application(amount=10000.0, tenure=14)).recommendation.decision == "approve"
+    assert engine.evaluate(make_application()) is None
+    assert engine.stats()["hits"] == {
+        "blocked_state": 0, "age_at_maturity_limit": 0, "daily_repayment_limit": 1,
+        "small_short_loan": 1, "__passthrough__": 1
+    }
+
+def test_rules_hot_reload(tmp_path, make_application):
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps({"rules": []}))
+    engine = RulesEngine(str(rules_file), reload_interval=0)
+    assert engine.evaluate(make_application()) is None
+    rules_file.write_text(json.dumps({"rules": [{
+        "id": "blocked", "decision": "reject", "message": "No loans in {location}.",
+        "when": [{"feature": "location", "op": "in", "value": ["Lagos"]}]
+    }]}))
+    mtime = os.path.getmtime(rules_file) + 10
+    os.utime(rules_file, (mtime, mtime))
+    assert engine.evaluate(make_application()).message == "No loans in Lagos."
+
+def test_bad_message_template_is_rejected_at_load(tmp_path, make_application):
+    rules_file = tmp_path / "rules.json"
+    good = {"id": "blocked", "decision": "reject", "message": "No loans in {location}.",
+            "when": [{"feature": "location", "op": "in", "value": ["Lagos"]}]}
+    rules_file.write_text(json.dumps({"rules": [good]}))
+    engine = RulesEngine(str(rules_file), reload_interval=0)
+    with pytest.raises(ValueError, match="invalid message template"):
+        engine.compile({"rules": [dict(good, message="No loans in {locaton}.")]})
+
+    rules_file.write_text(json.dumps({"rules": [dict(good, message="No loans in {locaton}.")]}))
+    mtime = os.path.getmtime(rules_file) + 10
+    os.utime(rules_file, (mtime, mtime))
+    # The malformed edit is refused and the last good table keeps serving.
+    assert engine.evaluate(make_application()).message == "No loans in Lagos."
@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from src.utils.scheduler import StageScheduler, SchedulerBusy
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_by_stage_priority():
+    scheduler = StageScheduler(max_concurrency=1)
+    order = []
+
+    async def job(stage, name):
+        async with scheduler.slot(stage):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await scheduler.acquire("collection")
+    tasks = [
+        asyncio.create_task(job("collection", "chat")),
+        asyncio.create_task(job("email", "email")),
+        asyncio.create_task(job("processing", "processing")),
+    ]
+    await asyncio.sleep(0)
+    scheduler.release("collection")
+    await asyncio.gather(*tasks)
+    assert order == ["processing", "email", "chat"]
+
+@pytest.mark.asyncio
+async def test_stage_limit_and_load_shedding():
+    scheduler = StageScheduler(max_concurrency=2, stage_limits={"collection": 1}, max_queue_wait=0.05)
+    await scheduler.acquire("collection")
+    with pytest.raises(SchedulerBusy):
+        await scheduler.acquire("collection")
+    await scheduler.acquire("processing")
+    assert scheduler.stats()["collection"]["shed"] == 1
+    assert scheduler.stats()["processing"]["running"] == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_returns_a_granted_slot():
+    scheduler = StageScheduler(max_concurrency=1)
+    await scheduler.acquire("collection")
+    waiter = asyncio.create_task(scheduler.acquire("collection"))
+    await asyncio.sleep(0)
+    scheduler.release("collection")
+    # The slot is granted to the waiter, which is cancelled before it resumes.
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.running == 0
+    await asyncio.wait_for(scheduler.acquire("collection"), timeout=0.1)
+
+@pytest.mark.asyncio
+async def test_stage_blocked_waiter_does_not_hold_back_other_stages():
+    scheduler = StageScheduler(max_concurrency=4, stage_limits={"processing": 1}, max_queue_wait=0.05)
+    await scheduler.acquire("processing")
+    waiter = asyncio.create_task(scheduler.acquire("processing"))
+    await asyncio.sleep(0)
+    await scheduler.acquire("collection")
+    assert scheduler.running == 2 and scheduler.stats()["collection"]["shed"] == 0
+    scheduler.release("processing")
+    await waiter
+    assert scheduler.stats()["processing"]["running"] == 1
@@ -0,0 +1,43 @@
+import time
+from src.utils.session_manager import SessionManager, estimate_size
+
+def new_state():
+    return {"application_data": {}, "fields_collected": set()}
+
+def test_checkout_resumes_known_sessions_and_flags_lost_ones():
+    sessions = SessionManager(new_state)
+    session_id, state, lost = sessions.checkout(None)
+    assert not lost
+    state["application_data"]["age"] = 30
+    sessions.save(session_id, state)
+    assert sessions.checkout(session_id)[1]["application_data"] == {"age": 30}
+
+    sessions.discard(session_id)
+    new_id, state, lost = sessions.checkout(session_id)
+    assert lost and new_id != session_id and state["application_data"] == {}
+
+def test_idle_sessions_expire():
+    sessions = SessionManager(new_state, idle_ttl=0.01)
+    session_id, state, _ = sessions.checkout(None)
+    sessions.save(session_id, state)
+    time.sleep(0.02)
+    assert sessions.stats()["sessions"] == 0
+    assert sessions.expired == 1
+
+def test_memory_ceiling_evicts_oldest_first():
+    per_session = estimate_size({"application_data": {"location": "x" * 1000}, "fields_collected": set()})
+    sessions = SessionManager(new_state, max_bytes=int(per_session * 2.5))
+    ids = []
+    for _ in range(3):
+        session_id, state, _ = sessions.checkout(None)
+        state["application_data"]["location"] = "x" * 1000
+        sessions.save(session_id, state)
+        ids.append(session_id)
+    assert sessions.evicted == 1
+    assert sessions.checkout(ids[0])[2]
+    assert not sessions.checkout(ids[2])[2]
+    assert sessions.stats()["bytes_per_session"] > 1000
+
+def test_history_is_capped():
+    sessions = SessionManager(new_state, max_history=2)
+    assert sessions.trim_history([1, 2, 3]) == [2, 3]
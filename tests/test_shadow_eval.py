@@ -0,0 +1,33 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from src.utils.shadow_eval import ShadowEvaluator, compare, read_shadow_log
+from src.models.validation_models import RepaymentPredictorSchema
+
+class CandidateRunner:
+    async def run(self, agent, prompt):
+        await asyncio.sleep(0.01)
+        if agent.model == "broken-model":
+            raise RuntimeError("quota exceeded")
+        return SimpleNamespace(final_output=RepaymentPredictorSchema(repaymentProbabilityScore=60, riskLevel="medium"))
+
+@pytest.mark.asyncio
+async def test_shadow_runs_off_the_response_path_and_reports_agreement(tmp_path):
+    log_file = str(tmp_path / "shadow.jsonl")
+    shadow = ShadowEvaluator(["candidate-model", "broken-model"], log_file, sample_rate=1.0, runner=CandidateRunner())
+    primary = RepaymentPredictorSchema(repaymentProbabilityScore=70, riskLevel="Medium")
+
+    shadow.submit("prompt", "primary-model", primary, 500.0)
+    assert shadow.stats()["in_flight"] == 2
+    await shadow.drain()
+
+    report = compare(read_shadow_log(log_file))
+    assert report["candidate-model"]["risk_agreement"] == 1.0
+    assert report["candidate-model"]["mean_score_bias"] == -10.0
+    assert report["candidate-model"]["primary_p50_ms"] == 500.0
+    assert report["broken-model"]["errors"] == 1
+
+def test_unsampled_submissions_are_skipped(tmp_path):
+    shadow = ShadowEvaluator(["candidate-model"], str(tmp_path / "shadow.jsonl"), sample_rate=0.0)
+    shadow.submit("prompt", "primary-model", None, 1.0)
+    assert shadow.stats()["submitted"] == 0
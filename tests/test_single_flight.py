@@ -0,0 +1,38 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from src.utils.single_flight import SingleFlight, request_key
+
+AGENT = SimpleNamespace(name="Repayment Probability Agent", model="ft:model")
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_result():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*(single_flight.run(AGENT, "same prompt", call) for _ in range(3)))
+    assert len(calls) == 1
+    assert results[0] is results[1] is results[2]
+    assert single_flight.stats()["coalesced"] == {"Repayment Probability Agent": 2}
+
+    await single_flight.run(AGENT, "same prompt", call)
+    assert len(calls) == 2
+    assert single_flight.stats()["in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_keys_differ_by_model():
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("rate limited")
+
+    results = await asyncio.gather(*(single_flight.run(AGENT, "p", fail) for _ in range(2)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    other_model = SimpleNamespace(name=AGENT.name, model="gpt-4o-mini")
+    assert request_key(AGENT, "p") != request_key(other_model, "p")
@@ -0,0 +1,30 @@
+import json
+from types import SimpleNamespace
+from src.utils.tracing import JsonlTraceExporter, TraceSampler
+
+def read_records(directory):
+    return [json.loads(line) for path in sorted(directory.glob("traces-*.jsonl")) for line in path.read_text().splitlines()]
+
+def test_exporter_batches_spans_and_rotates(tmp_path):
+    exporter = JsonlTraceExporter(str(tmp_path), max_bytes=200, max_files=2, flush_interval=0.01)
+    for i in range(20):
+        exporter.on_span_end(SimpleNamespace(export=lambda i=i: {"object": "trace.span", "id": f"span_{i}", "pad": "x" * 40}))
+    exporter.on_trace_end(SimpleNamespace(export=lambda: None))
+    exporter.force_flush()
+    exporter.shutdown()
+    files = list(tmp_path.glob("traces-*.jsonl"))
+    assert len(files) <= 2
+    assert read_records(tmp_path)[-1]["id"] == "span_19"
+
+def test_unsampled_turns_only_export_errors_and_slow_summaries(tmp_path):
+    exporter = JsonlTraceExporter(str(tmp_path), flush_interval=0.01)
+    sampler = TraceSampler(sample_rate=0.0, slow_ms=1000, exporter=exporter)
+    assert not sampler.sample()
+    sampler.record("collection", False, 50.0)
+    sampler.record("processing", False, 2500.0)
+    sampler.record("email", False, 20.0, error="RuntimeError: boom")
+    sampler.record("processing", True, 5000.0)
+    exporter.force_flush()
+    exporter.shutdown()
+    assert [r["stage"] for r in read_records(tmp_path)] == ["processing", "email"]
+    assert sampler.stats()["slow_summaries"] == 1 and sampler.stats()["error_summaries"] == 1